@@ -0,0 +1,151 @@
+import collections
+import threading
+from typing import Any, Callable, Dict, Generic, Hashable, Optional, Tuple, TypeVar
+
+__all__ = ["LRUCache"]
+
+
+V = TypeVar("V")
+
+
+class LRUCache(Generic[V]):
+    """Thread-safe least-recently-used cache with hit/miss counters.
+
+    Parameters
+    ----------
+    maxsize
+        Maximum number of entries. If :obj:`None`, the cache is unbounded.
+    max_bytes
+        Maximum total size of the entries, as measured by ``sizeof``. If :obj:`None`, the size is unbounded.
+    sizeof
+        Function returning the size of an entry in bytes. Only used when ``max_bytes`` is specified.
+
+    Notes
+    -----
+    The entries are not pickled, an unpickled cache is empty.
+    """
+
+    def __init__(
+        self,
+        maxsize: Optional[int] = 128,
+        max_bytes: Optional[int] = None,
+        sizeof: Optional[Callable[[V], int]] = None,
+    ):
+        if max_bytes is not None and sizeof is None:
+            raise ValueError("If `max_bytes` is specified, `sizeof` must also be specified.")
+        self._data: "collections.OrderedDict[Hashable, V]" = collections.OrderedDict()
+        self._sizes: Dict[Hashable, int] = {}
+        self._lock = threading.RLock()
+        self._maxsize = maxsize
+        self._max_bytes = max_bytes
+        self._sizeof = sizeof
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Optional[V]:
+        """Get the value for ``key`` and mark it as most recently used.
+
+        Parameters
+        ----------
+        key
+            Key to look up.
+        default
+            Value to return if the ``key`` is not present.
+
+        Returns
+        -------
+        The cached value or ``default``.
+        """
+        with self._lock:
+            try:
+                value = self._data[key]
+            except KeyError:
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: Hashable, value: V) -> None:
+        """Store ``value`` under ``key``, evicting the least recently used entries if needed.
+
+        Values larger than ``max_bytes`` are not stored.
+
+        Parameters
+        ----------
+        key
+            Key of the entry.
+        value
+            Value to store.
+
+        Returns
+        -------
+        Nothing, just updates the cache.
+        """
+        size = 0 if self._max_bytes is None else self._sizeof(value)  # type: ignore[misc]
+        with self._lock:
+            self.pop(key)
+            if self._max_bytes is not None and size > self._max_bytes:
+                return
+            self._data[key] = value
+            self._sizes[key] = size
+            self._evict()
+
+    def pop(self, key: Hashable, default: Any = None) -> Optional[V]:
+        """Remove ``key`` from the cache and return its value, or ``default`` if not present."""
+        with self._lock:
+            self._sizes.pop(key, None)
+            return self._data.pop(key, default)
+
+    def clear(self) -> None:
+        """Remove all entries and reset the counters."""
+        with self._lock:
+            self._data.clear()
+            self._sizes.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def _evict(self) -> None:
+        while (self._maxsize is not None and len(self._data) > self._maxsize) or (
+            self._max_bytes is not None and self.nbytes > self._max_bytes
+        ):
+            key, _ = self._data.popitem(last=False)
+            self._sizes.pop(key, None)
+
+    @property
+    def maxsize(self) -> Optional[int]:
+        """Maximum number of entries."""
+        return self._maxsize
+
+    @maxsize.setter
+    def maxsize(self, maxsize: Optional[int]) -> None:
+        if maxsize is not None and maxsize < 0:
+            raise ValueError(f"Expected `maxsize` to be non-negative, found `{maxsize}`.")
+        with self._lock:
+            self._maxsize = maxsize
+            self._evict()
+
+    @property
+    def nbytes(self) -> int:
+        """Total size of the stored entries in bytes, :math:`0` if ``max_bytes`` is not specified."""
+        return sum(self._sizes.values())
+
+    @property
+    def info(self) -> Tuple[int, int, int]:
+        """Number of hits, misses and currently stored entries."""
+        return self.hits, self.misses, len(self)
+
+    def __getstate__(self) -> Dict[str, Any]:
+        return {"maxsize": self._maxsize, "max_bytes": self._max_bytes, "sizeof": self._sizeof}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__init__(**state)  # type: ignore[misc]
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._data
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}[hits={self.hits}, misses={self.misses}, size={len(self)}]"
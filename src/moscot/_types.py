@@ -26,6 +26,7 @@ QuadInitializer_t = Optional[LRInitializer_t]
 Initializer_t = Union[SinkhornInitializer_t, LRInitializer_t]
 ProblemStage_t = Literal["prepared", "solved"]
 Device_t = Union[Literal["cpu", "gpu", "tpu"], str]
+Precision_t = Literal["float32"]  # reduced precision of the geometries
 
 # TODO(michalk8): autogenerate from the enums
 ScaleCost_t = Union[float, Literal["mean", "max_cost", "max_bound", "max_norm", "median"]]
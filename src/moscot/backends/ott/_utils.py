@@ -1,16 +1,27 @@
-from typing import Any, Literal, Optional, Tuple, Union
+import itertools
+from typing import Any, Hashable, List, Literal, Mapping, Optional, Sequence, Tuple, Union
 
 import jax
 import jax.experimental.sparse as jesp
 import jax.numpy as jnp
+import numpy as np
 import scipy.sparse as sp
-from ott.geometry import epsilon_scheduler, geodesic, geometry, pointcloud
+from ott.geometry import costs, epsilon_scheduler, geodesic, geometry, pointcloud
+from ott.math import utils as mu
 from ott.tools import sinkhorn_divergence as sdiv
 
 from moscot._logging import logger
-from moscot._types import ArrayLike, ScaleCost_t
+from moscot._types import ArrayLike, Precision_t, ScaleCost_t
 
 Scale_t = Union[float, Literal["mean", "median", "max_cost", "max_norm", "max_bound"]]
+Bucket_t = Literal["pow2", "geometric"]
+
+_MIN_GEOMETRIC_BUCKET = 16
+_GEOMETRIC_BUCKET_RATIO = 1.25
+_DEFAULT_BATCH_SIZE = 1024
+_PRECISION_DTYPES = {"float32": jnp.float32}
+# costs which only depend on the norms and inner products of the points, see `sparse_cost_matrix`
+_SPARSE_COSTS = (costs.SqEuclidean, costs.Euclidean, costs.Cosine)
 
 
 __all__ = ["sinkhorn_divergence"]
@@ -87,6 +98,32 @@ def densify(arr: ArrayLike) -> jax.Array:
     return jnp.asarray(arr)
 
 
+def with_precision(
+    arr: Union[ArrayLike, jesp.BCOO], precision: Optional[Precision_t]
+) -> Union[jax.Array, jesp.BCOO]:
+    """Cast the input to the floating point type of ``precision``.
+
+    Parameters
+    ----------
+    arr
+        Array to cast.
+    precision
+        Floating point precision. If :obj:`None`, return the array unchanged.
+
+    Returns
+    -------
+    The cast array.
+    """
+    if precision is None:
+        return arr
+    if precision not in _PRECISION_DTYPES:
+        raise ValueError(f"Expected `precision` to be one of `{sorted(_PRECISION_DTYPES)}`, found `{precision!r}`.")
+    dtype = _PRECISION_DTYPES[precision]
+    if isinstance(arr, jesp.BCOO):
+        return arr.astype(dtype)
+    return jnp.asarray(arr, dtype=dtype)
+
+
 def ensure_2d(arr: ArrayLike, *, reshape: bool = False) -> jax.Array:
     """Ensure that an array is 2-dimensional.
 
@@ -116,7 +153,7 @@ def convert_scipy_sparse(arr: Union[sp.spmatrix, jesp.BCOO]) -> jesp.BCOO:
 
 
 def _instantiate_geodesic_cost(
-    arr: jax.Array,
+    arr: Union[jax.Array, jesp.BCOO],
     problem_shape: Tuple[int, int],
     t: Optional[float],
     is_linear_term: bool,
@@ -124,12 +161,219 @@ def _instantiate_geodesic_cost(
     relative_epsilon: Optional[bool] = None,
     scale_cost: Scale_t = 1.0,
     directed: bool = True,
+    batch_size: Optional[int] = None,
     **kwargs: Any,
 ) -> geometry.Geometry:
     n_src, n_tgt = problem_shape
     if is_linear_term and n_src + n_tgt != arr.shape[0]:
         raise ValueError(f"Expected `x` to have `{n_src + n_tgt}` points, found `{arr.shape[0]}`.")
     t = epsilon / 4.0 if t is None else t
-    cm_full = geodesic.Geodesic.from_graph(arr, t=t, directed=directed, **kwargs).cost_matrix
-    cm = cm_full[:n_src, n_src:] if is_linear_term else cm_full
+    geom = geodesic.Geodesic.from_graph(arr, t=t, directed=directed, **kwargs)
+    batch_size = _DEFAULT_BATCH_SIZE if batch_size is None else batch_size
+    if is_linear_term:
+        cm = _geodesic_cost_matrix(geom, n_rows=n_src, cols=(n_src, n_src + n_tgt), batch_size=batch_size)
+    else:
+        cm = _geodesic_cost_matrix(geom, n_rows=arr.shape[0], cols=(0, arr.shape[0]), batch_size=batch_size)
     return geometry.Geometry(cm, epsilon=epsilon, relative_epsilon=relative_epsilon, scale_cost=scale_cost)
+
+
+def _geodesic_cost_matrix(
+    geom: geodesic.Geodesic, *, n_rows: int, cols: Tuple[int, int], batch_size: int
+) -> jax.Array:
+    # the heat kernel is symmetric, its columns `[start, stop)` are obtained by applying it to the indicator
+    # vectors of these points, tile by tile, which never materializes the full `[n + m, n + m]` kernel
+    n, (start, stop) = geom.shape[0], cols
+    apply_kernel = jax.jit(lambda vec: geom.apply_kernel(vec)[:n_rows])
+    tiles = []
+    for offset in range(start, stop, batch_size):
+        size = min(batch_size, stop - offset)
+        # always use tiles of the same shape to compile only once
+        vec = jnp.zeros((n, batch_size), dtype=geom.dtype)
+        vec = vec.at[offset + jnp.arange(size), jnp.arange(size)].set(1.0)
+        tiles.append(apply_kernel(vec)[:, :size])
+    kernel = jnp.concatenate(tiles, axis=1)
+    return -4.0 * geom.t * mu.safe_log(kernel)
+
+
+def is_sparse(arr: Any) -> bool:
+    """Whether the input is a :mod:`scipy` or :mod:`jax` sparse array."""
+    return sp.issparse(arr) or isinstance(arr, jesp.BCOO)
+
+
+def supports_sparse_point_cloud(cost_fn: costs.CostFn, scale_cost: Scale_t) -> bool:
+    """Whether the cost of a sparse point cloud can be computed without densifying it.
+
+    Parameters
+    ----------
+    cost_fn
+        Cost function.
+    scale_cost
+        How to scale the cost, the ones which are specific to :class:`~ott.geometry.pointcloud.PointCloud`
+        are not supported.
+
+    Returns
+    -------
+    :obj:`True` if the cost only depends on the norms of the points and their inner products.
+    """
+    return type(cost_fn) in _SPARSE_COSTS and scale_cost not in ("max_norm", "max_bound")
+
+
+def sparse_cost_matrix(
+    x: Union[sp.spmatrix, jesp.BCOO],
+    y: Optional[Union[sp.spmatrix, jesp.BCOO]],
+    cost_fn: costs.CostFn,
+    *,
+    batch_size: Optional[int] = None,
+) -> jax.Array:
+    """Compute the cost matrix between sparse point clouds.
+
+    The inner products are computed in tiles of ``batch_size`` source points as sparse-dense products,
+    i.e., the point clouds are never densified.
+
+    Parameters
+    ----------
+    x
+        Source point cloud of shape ``[n, d]``.
+    y
+        Target point cloud of shape ``[m, d]``. If :obj:`None`, use ``x``.
+    cost_fn
+        Cost function, see :func:`supports_sparse_point_cloud`.
+    batch_size
+        Number of source points processed at once.
+
+    Returns
+    -------
+    The cost matrix of shape ``[n, m]``.
+    """
+    x = convert_scipy_sparse(x)
+    y = x if y is None else convert_scipy_sparse(y)
+    if x.shape[1] != y.shape[1]:
+        raise ValueError(f"Expected `x/y` to have the same number of dimensions, found `{x.shape[1]}/{y.shape[1]}`.")
+    (n, d), batch_size = x.shape, (_DEFAULT_BATCH_SIZE if batch_size is None else batch_size)
+    norm_x, norm_y = ((arr * arr).sum(1).todense() for arr in (x, y))
+
+    tiles = []
+    for start in range(0, n, batch_size):
+        stop = min(start + batch_size, n)
+        tile = jesp.bcoo_slice(x, start_indices=(start, 0), limit_indices=(stop, d)).todense()
+        dot = (y @ tile.T).T  # `[batch_size, m]`
+        tiles.append(_cost_from_dot(cost_fn, dot, norm_x[start:stop, None], norm_y[None, :]))
+    return jnp.concatenate(tiles, axis=0)
+
+
+def _cost_from_dot(cost_fn: costs.CostFn, dot: jax.Array, norm_x: jax.Array, norm_y: jax.Array) -> jax.Array:
+    # `norm_x` and `norm_y` are the squared Euclidean norms
+    if isinstance(cost_fn, costs.Cosine):
+        return 1.0 - dot / (jnp.sqrt(norm_x) * jnp.sqrt(norm_y) + cost_fn._ridge)
+    sq_dist = norm_x + norm_y - 2.0 * dot
+    if isinstance(cost_fn, costs.Euclidean):
+        return jnp.sqrt(jnp.maximum(sq_dist, 0.0))
+    return sq_dist
+
+
+def _freeze(obj: Any) -> Hashable:
+    """Convert (nested) mappings and sequences to a hashable representation.
+
+    Raises :class:`TypeError` if any of the values is not hashable.
+    """
+    if isinstance(obj, Mapping):
+        return tuple(sorted((k, _freeze(v)) for k, v in obj.items()))
+    if isinstance(obj, (list, tuple)):
+        return type(obj).__name__, tuple(_freeze(v) for v in obj)
+    hash(obj)
+    return obj
+
+
+def _abstract_signature(tree: Any) -> Hashable:
+    """Structure, shapes and dtypes of a :mod:`jax` pytree, i.e., what determines its compilation."""
+    leaves, treedef = jax.tree_util.tree_flatten(tree)
+    signature = tuple(
+        (
+            np.shape(leaf),
+            str(jnp.result_type(leaf)),
+            getattr(leaf, "weak_type", isinstance(leaf, (bool, int, float, complex))),
+        )
+        for leaf in leaves
+    )
+    return str(treedef), signature
+
+
+def bucket_size(n: int, mode: Union[bool, Bucket_t]) -> int:
+    """Get the smallest bucket size which can hold ``n`` points.
+
+    Parameters
+    ----------
+    n
+        Number of points.
+    mode
+        How to choose the buckets. Valid options are:
+
+        - ``'pow2'`` or :obj:`True` - the next power of 2.
+        - ``'geometric'`` - the next size in a geometric ladder with ratio ``1.25``.
+
+    Returns
+    -------
+    The bucket size.
+    """
+    if mode is True or mode == "pow2":
+        return 1 << max(0, n - 1).bit_length()
+    if mode == "geometric":
+        size = _MIN_GEOMETRIC_BUCKET
+        while size < n:
+            size = int(np.ceil(size * _GEOMETRIC_BUCKET_RATIO))
+        return size
+    raise ValueError(f"Expected `pad_to_bucket` to be `'pow2'` or `'geometric'`, found `{mode!r}`.")
+
+
+def pad_zeros(arr: jax.Array, shape: Tuple[Optional[int], ...]) -> jax.Array:
+    """Pad an array with zeros at the end of each axis to ``shape``, :obj:`None` leaves the axis untouched."""
+    pad_width = [(0, 0 if size is None else size - dim) for dim, size in zip(arr.shape, shape)]
+    return jnp.pad(arr, pad_width)
+
+
+def padding_mask(n: int, size: int) -> Optional[jax.Array]:
+    """Mask of the valid (non-padded) points, :obj:`None` if there is no padding."""
+    return None if n == size else jnp.arange(size) < n
+
+
+def epsilon_factors(schedule: Union[Sequence[float], epsilon_scheduler.Epsilon]) -> Tuple[float, ...]:
+    """Get the factors by which the target :term:`entropic regularization` is multiplied in the annealing stages.
+
+    Parameters
+    ----------
+    schedule
+        Either the factors themselves or a :class:`~ott.geometry.epsilon_scheduler.Epsilon` whose ``init`` and
+        ``decay`` define a geometric decay towards the target.
+
+    Returns
+    -------
+    The factors of the stages preceding the one with the target regularization.
+    """
+    if isinstance(schedule, epsilon_scheduler.Epsilon):
+        factors: List[float] = []
+        for iteration in itertools.count():
+            factor = float(schedule.at(iteration) / schedule.target)
+            if np.isclose(factor, 1.0):
+                return tuple(factors)
+            if factors and factor >= factors[-1]:
+                raise ValueError("Expected the `epsilon_schedule` to decay, use `decay < 1`.")
+            factors.append(factor)
+
+    factors = [float(factor) for factor in schedule]
+    if any(factor <= 1.0 for factor in factors):
+        raise ValueError(f"Expected all `epsilon_schedule` factors to be larger than `1`, found `{factors}`.")
+    return tuple(factors)
+
+
+def with_epsilon(geom: geometry.Geometry, epsilon: float) -> geometry.Geometry:
+    """Copy the geometry with a different, absolute, :term:`entropic regularization`."""
+    children, aux_data = geom.tree_flatten()
+    children = [
+        epsilon_scheduler.Epsilon(target=epsilon, scale_epsilon=1.0)
+        if isinstance(child, epsilon_scheduler.Epsilon)
+        else child
+        for child in children
+    ]
+    if "relative_epsilon" in aux_data:
+        aux_data["relative_epsilon"] = False
+    return type(geom).tree_unflatten(aux_data, children)
@@ -1,20 +1,37 @@
-from typing import Any, Optional, Tuple, Union
+import functools
+from typing import Any, Callable, Iterable, Iterator, NamedTuple, Optional, Sequence, Tuple, Union
 
 import jaxlib.xla_extension as xla_ext
 
 import jax
 import jax.numpy as jnp
 import numpy as np
+from ott.geometry import geodesic, geometry
 from ott.solvers.linear import sinkhorn, sinkhorn_lr
 from ott.solvers.quadratic import gromov_wasserstein, gromov_wasserstein_lr
+from scipy.sparse.linalg import LinearOperator
 
 import matplotlib as mpl
 import matplotlib.pyplot as plt
 
 from moscot._types import ArrayLike, Device_t
+from moscot.backends.ott._utils import with_epsilon
 from moscot.base.output import BaseSolverOutput
 
-__all__ = ["OTTOutput", "GraphOTTOutput"]
+__all__ = ["OTTOutput", "GraphOTTOutput", "EpsilonStage"]
+
+
+class EpsilonStage(NamedTuple):
+    """Statistics of one stage of an :term:`entropic regularization` annealing schedule."""
+
+    #: Absolute entropic regularization of the stage.
+    epsilon: float
+    #: Number of :term:`Sinkhorn` iterations of the stage.
+    n_iters: int
+    #: Wall-clock time of the stage, in seconds.
+    time: float
+    #: Whether the stage converged.
+    converged: bool
 
 
 class OTTOutput(BaseSolverOutput):
@@ -24,6 +41,11 @@ class OTTOutput(BaseSolverOutput):
     ----------
     output
         Output of the :mod:`ott` backend.
+    shape
+        Shape of the problem without the zero-mass padding added by the solver's ``pad_to_bucket``.
+        If :obj:`None`, the ``output`` is not padded.
+    stages
+        Statistics of the stages of the solver's ``epsilon_schedule``, the last one being the ``output``.
     """
 
     _NOT_COMPUTED = -1.0  # sentinel value used in `ott`
@@ -36,9 +58,13 @@ class OTTOutput(BaseSolverOutput):
             gromov_wasserstein.GWOutput,
             gromov_wasserstein_lr.LRGWOutput,
         ],
+        shape: Optional[Tuple[int, int]] = None,
+        stages: Optional[Sequence[EpsilonStage]] = None,
     ):
         super().__init__()
         self._output = output
+        self._unpadded_shape = shape
+        self._stages = None if stages is None else tuple(stages)
         self._costs = None if isinstance(output, sinkhorn.SinkhornOutput) else output.costs
         self._errors = output.errors
 
@@ -172,6 +198,13 @@ class OTTOutput(BaseSolverOutput):
         ax.xaxis.set_major_locator(mpl.ticker.MaxNLocator(integer=True))
 
     def _apply(self, x: ArrayLike, *, forward: bool) -> ArrayLike:
+        if self._unpadded_shape is not None:
+            (n, m), (n_padded, m_padded) = self._unpadded_shape, self._padded_shape
+            x = jnp.pad(x, [(0, n_padded - n if forward else m_padded - m)] + [(0, 0)] * (x.ndim - 1))
+            return self._apply_padded(x, forward=forward)[: m if forward else n]
+        return self._apply_padded(x, forward=forward)
+
+    def _apply_padded(self, x: ArrayLike, *, forward: bool) -> ArrayLike:
         if x.ndim == 1:
             return self._output.apply(x, axis=1 - forward)
         return self._output.apply(
@@ -179,14 +212,97 @@ class OTTOutput(BaseSolverOutput):
             axis=1 - forward,
         ).T  # convert to batch first
 
+    def _transport_blocks(self, batch_size: int, *, forward: bool) -> Iterator[Tuple[int, ArrayLike]]:
+        output = self._output
+        factors = self._low_rank_factors
+        if factors is not None:
+            # rows of `q * (1 / g)` times `r.T`, i.e., never more than `[batch_size, m]` at once
+            q, r, inv_g = factors
+            u, v = (q, r) if forward else (r, q)
+            block_fn: Callable[[jax.Array], jax.Array] = functools.partial(_low_rank_block, u, v, inv_g)
+        elif isinstance(output, sinkhorn.SinkhornOutput) and not isinstance(output.geom, geodesic.Geodesic):
+            # evaluate the blocks directly from the potentials, with the statistics of the full geometry
+            geom = output.geom
+            (n, m), (n_padded, m_padded) = self.shape, self._padded_shape
+            other, other_padded = (m, m_padded) if forward else (n, n_padded)
+            block_fn = functools.partial(
+                _transport_block,
+                geom,
+                output.f,
+                output.g,
+                other_ixs=None if other == other_padded else jnp.arange(other),
+                scale_cost=1.0 / float(geom.inv_scale_cost),
+                epsilon=float(geom.epsilon),
+                forward=forward,
+            )
+        else:
+            yield from super()._transport_blocks(batch_size, forward=forward)
+            return
+
+        k = self.shape[0] if forward else self.shape[1]
+        batch_size = min(batch_size, k)
+        for start in range(0, k, batch_size):
+            # the last block is shifted back to overlap the previous one, so that all blocks have the same shape
+            offset = min(start, k - batch_size)
+            block = block_fn(offset + jnp.arange(batch_size))
+            yield start, block[start - offset :]
+
+    def chain(  # noqa: D102
+        self, outputs: Iterable[BaseSolverOutput], scale_by_marginals: bool = False
+    ) -> LinearOperator:
+        outputs = list(outputs)
+        chain = [self, *outputs]
+        if not all(isinstance(out, OTTOutput) and out._low_rank_factors is not None for out in chain):
+            return super().chain(outputs, scale_by_marginals=scale_by_marginals)
+
+        # fuse the low-rank factors into `left @ core @ right.T`, the cores are only `[rank, rank]`
+        factors = [out._low_rank_factors for out in chain]  # type: ignore[union-attr]
+        eps = 1e-12  # same as in `_scale_by_marginals`
+        if scale_by_marginals:
+            pull_scales = [1.0 / (out.b[:, None] + eps) for out in chain]
+            push_scales = [1.0 / (out.a[:, None] + eps) for out in chain]
+        else:
+            pull_scales = push_scales = [1.0] * len(chain)
+        # pull: T_1 D_1 T_2 D_2 ... T_k D_k; push: T_k^T D_k ... T_1^T D_1
+        pull = _fuse_low_rank([(q, r, inv_g) for q, r, inv_g in factors], pull_scales)
+        push = _fuse_low_rank([(r, q, inv_g) for q, r, inv_g in factors[::-1]], push_scales[::-1])
+
+        op = LinearOperator(
+            shape=(chain[0].shape[0], chain[-1].shape[1]),
+            dtype=self.dtype,
+            matvec=pull,
+            matmat=pull,
+            rmatvec=push,
+            rmatmat=push,
+        )
+        # size of the precomputed composite, used when caching it
+        op.nbytes = sum(arr.nbytes for fun in (pull, push) for arr in fun.args)
+        return op
+
     @property
-    def shape(self) -> Tuple[int, int]:  # noqa: D102
+    def _low_rank_factors(self) -> Optional[Tuple[jax.Array, jax.Array, jax.Array]]:
+        """Factors :math:`Q`, :math:`R` and :math:`1 / g` of the coupling :math:`Q diag(1 / g) R^T`."""
+        if isinstance(self._output, (sinkhorn_lr.LRSinkhornOutput, gromov_wasserstein_lr.LRGWOutput)):
+            return self._output.q, self._output.r, 1.0 / self._output.g
+        return None
+
+    @property
+    def _padded_shape(self) -> Tuple[int, int]:
         if isinstance(self._output, sinkhorn.SinkhornOutput):
             return self._output.f.shape[0], self._output.g.shape[0]
         return self._output.geom.shape
 
+    @property
+    def shape(self) -> Tuple[int, int]:  # noqa: D102
+        if self._unpadded_shape is not None:
+            return self._unpadded_shape
+        return self._padded_shape
+
     @property
     def transport_matrix(self) -> ArrayLike:  # noqa: D102
+        if self._unpadded_shape is not None:
+            n, m = self._unpadded_shape
+            return self._output.matrix[:n, :m]
         return self._output.matrix
 
     @property
@@ -195,7 +311,9 @@ class OTTOutput(BaseSolverOutput):
 
     def to(self, device: Optional[Device_t] = None) -> "OTTOutput":  # noqa: D102
         if device is None:
-            return OTTOutput(jax.device_put(self._output, device=device))
+            return OTTOutput(
+                jax.device_put(self._output, device=device), shape=self._unpadded_shape, stages=self._stages
+            )
 
         if isinstance(device, str) and ":" in device:
             device, ix = device.split(":")
@@ -209,7 +327,7 @@ class OTTOutput(BaseSolverOutput):
             except IndexError:
                 raise IndexError(f"Unable to fetch the device with `id={idx}`.") from None
 
-        return OTTOutput(jax.device_put(self._output, device))
+        return OTTOutput(jax.device_put(self._output, device), shape=self._unpadded_shape, stages=self._stages)
 
     @property
     def cost(self) -> float:  # noqa: D102
@@ -222,9 +340,20 @@ class OTTOutput(BaseSolverOutput):
     @property
     def potentials(self) -> Optional[Tuple[ArrayLike, ArrayLike]]:  # noqa: D102
         if isinstance(self._output, sinkhorn.SinkhornOutput):
+            if self._unpadded_shape is not None:
+                n, m = self._unpadded_shape
+                return self._output.f[:n], self._output.g[:m]
             return self._output.f, self._output.g
         return None
 
+    @property
+    def stages(self) -> Optional[Tuple[EpsilonStage, ...]]:
+        """Statistics of the :term:`entropic regularization` annealing stages.
+
+        :obj:`None` if the problem was solved without an ``epsilon_schedule``.
+        """
+        return self._stages
+
     @property
     def rank(self) -> int:  # noqa: D102
         output = self._output.linear_state if isinstance(self._output, gromov_wasserstein.GWOutput) else self._output
@@ -296,3 +425,45 @@ class GraphOTTOutput(OTTOutput):
                 raise IndexError(f"Unable to fetch the device with `id={idx}`.") from None
 
         return GraphOTTOutput(jax.device_put(self._output, device), shape=self.shape)
+
+
+@functools.partial(jax.jit, static_argnames=["forward"])
+def _transport_block(
+    geom: geometry.Geometry,
+    f: jax.Array,
+    g: jax.Array,
+    ixs: jax.Array,
+    *,
+    other_ixs: Optional[jax.Array],
+    scale_cost: float,
+    epsilon: float,
+    forward: bool,
+) -> jax.Array:
+    src_ixs, tgt_ixs = (ixs, other_ixs) if forward else (other_ixs, ixs)
+    f = f if src_ixs is None else f[src_ixs]
+    g = g if tgt_ixs is None else g[tgt_ixs]
+    geom = with_epsilon(geom.subset(src_ixs, tgt_ixs, scale_cost=scale_cost), epsilon)
+    block = geom.transport_from_potentials(f, g)
+    return block if forward else block.T
+
+
+@jax.jit
+def _low_rank_block(u: jax.Array, v: jax.Array, inv_g: jax.Array, ixs: jax.Array) -> jax.Array:
+    return (u[ixs] * inv_g[None, :]) @ v.T
+
+
+def _fuse_low_rank(
+    factors: Sequence[Tuple[jax.Array, jax.Array, jax.Array]], scales: Sequence[Union[float, jax.Array]]
+) -> "functools.partial[jax.Array]":
+    # product of `U_i diag(inv_g_i) V_i^T D_i` is `U_1 C (D_k V_k)^T`,
+    # where `C = diag(inv_g_1) V_1^T D_1 U_2 diag(inv_g_2) ... diag(inv_g_k)`
+    (left, _, core), *_ = factors
+    core = jnp.diag(core)
+    for (_, v, _), scale, (u_next, _, inv_g_next) in zip(factors, scales, factors[1:]):
+        core = (core @ ((v * scale).T @ u_next)) * inv_g_next[None, :]
+    right = factors[-1][1] * scales[-1]
+    return functools.partial(_apply_fused, left, core, right)
+
+
+def _apply_fused(left: jax.Array, core: jax.Array, right: jax.Array, x: ArrayLike) -> jax.Array:
+    return left @ (core @ (right.T @ jnp.asarray(x)))
@@ -1,32 +1,63 @@
 import abc
 import inspect
+import time
 import types
-from typing import Any, Literal, Mapping, Optional, Set, Tuple, Union
+from typing import (
+    Any,
+    Callable,
+    ContextManager,
+    Dict,
+    Hashable,
+    List,
+    Literal,
+    Mapping,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Union,
+)
 
 import jax
 import jax.numpy as jnp
 from ott.geometry import costs, epsilon_scheduler, geodesic, geometry, pointcloud
+from ott.initializers.quadratic import initializers as quad_initializers
 from ott.problems.linear import linear_problem
 from ott.problems.quadratic import quadratic_problem
 from ott.solvers.linear import sinkhorn, sinkhorn_lr
 from ott.solvers.quadratic import gromov_wasserstein, gromov_wasserstein_lr
 
-from moscot._types import ProblemKind_t, QuadInitializer_t, SinkhornInitializer_t
+from moscot._cache import LRUCache
+from moscot._logging import logger
+from moscot._types import Precision_t, ProblemKind_t, QuadInitializer_t, SinkhornInitializer_t
 from moscot.backends.ott._utils import (
+    _abstract_signature,
+    _freeze,
+    Bucket_t,
     _instantiate_geodesic_cost,
     alpha_to_fused_penalty,
+    bucket_size,
     check_shapes,
     convert_scipy_sparse,
     densify,
     ensure_2d,
+    epsilon_factors,
+    is_sparse,
+    pad_zeros,
+    padding_mask,
+    sparse_cost_matrix,
+    supports_sparse_point_cloud,
+    with_epsilon,
+    with_precision,
 )
-from moscot.backends.ott.output import GraphOTTOutput, OTTOutput
+from moscot.backends.ott.output import EpsilonStage, GraphOTTOutput, OTTOutput
+from moscot.base.output import BaseSolverOutput
 from moscot.base.problems._utils import TimeScalesHeatKernel
 from moscot.base.solver import OTSolver
 from moscot.costs import get_cost
-from moscot.utils.tagged_array import TaggedArray
+from moscot.utils.tagged_array import Tag, TaggedArray
 
-__all__ = ["SinkhornSolver", "GWSolver"]
+__all__ = ["SinkhornSolver", "GWSolver", "compilation_cache"]
 
 OTTSolver_t = Union[
     sinkhorn.Sinkhorn,
@@ -37,6 +68,21 @@ OTTSolver_t = Union[
 OTTProblem_t = Union[linear_problem.LinearProblem, quadratic_problem.QuadraticProblem]
 Scale_t = Union[float, Literal["mean", "median", "max_cost", "max_norm", "max_bound"]]
 
+#: Process-wide cache of compiled :mod:`ott` solvers, shared by all :class:`OTTJaxSolver` instances.
+#: Keyed by the solver's configuration and the structure, shapes and dtypes of the problem.
+compilation_cache: LRUCache[Callable[..., Any]] = LRUCache(maxsize=128)
+
+
+def _geometries(prob: OTTProblem_t) -> Tuple[Optional[geometry.Geometry], ...]:
+    if isinstance(prob, linear_problem.LinearProblem):
+        return (prob.geom,)
+    return prob.geom_xx, prob.geom_yy, prob.geom_xy
+
+
+def _marginals_precision(arr: jnp.ndarray, precision: Optional[Precision_t]) -> jnp.ndarray:
+    # `ott` requires the marginals and the geometries to have the same precision
+    return with_precision(arr, precision)
+
 
 class OTTJaxSolver(OTSolver[OTTOutput], abc.ABC):
     """Base class for :mod:`ott` solvers :cite:`cuturi2022optimal`.
@@ -44,7 +90,8 @@ class OTTJaxSolver(OTSolver[OTTOutput], abc.ABC):
     Parameters
     ----------
     jit
-        Whether to :func:`~jax.jit` the :attr:`solver`.
+        Whether to :func:`~jax.jit` the :attr:`solver`. Compiled solvers are shared through
+        ``moscot.backends.ott.compilation_cache``.
     """
 
     def __init__(self, jit: bool = True):
@@ -52,8 +99,18 @@ class OTTJaxSolver(OTSolver[OTTOutput], abc.ABC):
         self._solver: Optional[OTTSolver_t] = None
         self._problem: Optional[OTTProblem_t] = None
         self._jit = jit
+        self._config: Optional[Hashable] = None
         self._a: Optional[jnp.ndarray] = None
         self._b: Optional[jnp.ndarray] = None
+        self._pad_to: Optional[Tuple[int, int]] = None
+        self._init: Optional[Any] = None
+
+    def _set_config(self, **kwargs: Any) -> None:
+        # arguments which fully determine the `ott` solver; unhashable ones disable the `compilation_cache`
+        try:
+            self._config = type(self).__name__, _freeze(kwargs)
+        except TypeError:
+            self._config = None
 
     def _create_geometry(
         self,
@@ -67,8 +124,13 @@ class OTTJaxSolver(OTSolver[OTTOutput], abc.ABC):
         problem_shape: Optional[Tuple[int, int]] = None,
         t: Optional[float] = None,
         directed: bool = True,
+        pad_to: Optional[Tuple[int, int]] = None,
+        precision: Optional[Precision_t] = None,
         **kwargs: Any,
     ) -> geometry.Geometry:
+        if pad_to is not None and not (x.is_point_cloud or x.is_cost_matrix):
+            raise NotImplementedError(f"Padding is not yet implemented for `tag={x.tag!r}`.")
+
         if x.is_point_cloud:
             cost_fn = x.cost
             if cost_fn is None:
@@ -78,12 +140,37 @@ class OTTJaxSolver(OTSolver[OTTOutput], abc.ABC):
             if not isinstance(cost_fn, costs.CostFn):
                 raise TypeError(f"Expected `cost_fn` to be `ott.geometry.costs.CostFn`, found `{type(cost_fn)}`.")
 
+            if is_sparse(x.data_src) and (x.data_tgt is None or is_sparse(x.data_tgt)):
+                if supports_sparse_point_cloud(cost_fn, scale_cost):
+                    cost_matrix = sparse_cost_matrix(
+                        ensure_2d(x.data_src), x.data_tgt, cost_fn=cost_fn, batch_size=batch_size
+                    )
+                    return self._create_geometry(
+                        TaggedArray(data_src=cost_matrix, tag=Tag.COST_MATRIX),
+                        is_linear_term=is_linear_term,
+                        epsilon=epsilon,
+                        relative_epsilon=relative_epsilon,
+                        scale_cost=scale_cost,
+                        pad_to=pad_to,
+                        precision=precision,
+                    )
+                logger.warning(f"Densifying the point cloud, `{type(cost_fn).__name__}` requires dense data.")
+
             y = None if x.data_tgt is None else densify(ensure_2d(x.data_tgt, reshape=True))
             x = densify(ensure_2d(x.data_src, reshape=True))
+            x, y = with_precision(x, precision), (None if y is None else with_precision(y, precision))
             if y is not None and x.shape[1] != y.shape[1]:
                 raise ValueError(
                     f"Expected `x/y` to have the same number of dimensions, found `{x.shape[1]}/{y.shape[1]}`."
                 )
+            masks: Dict[str, Optional[jax.Array]] = {}
+            if pad_to is not None:
+                y = x if y is None else y
+                masks = {
+                    "src_mask": padding_mask(len(x), pad_to[0]),
+                    "tgt_mask": padding_mask(len(y), pad_to[1]),
+                }
+                x, y = pad_zeros(x, (pad_to[0], None)), pad_zeros(y, (pad_to[1], None))
 
             return pointcloud.PointCloud(
                 x,
@@ -93,14 +180,24 @@ class OTTJaxSolver(OTSolver[OTTOutput], abc.ABC):
                 relative_epsilon=relative_epsilon,
                 scale_cost=scale_cost,
                 batch_size=batch_size,
+                **masks,
             )
 
         arr = ensure_2d(x.data_src, reshape=False)
-        arr = densify(arr) if x.is_graph else convert_scipy_sparse(arr)
+        arr = convert_scipy_sparse(arr)  # the heat kernel of a graph only needs sparse matrix products
+        arr = with_precision(arr, precision)
 
         if x.is_cost_matrix:
+            masks = {}
+            if pad_to is not None:
+                arr = densify(arr)
+                masks = {
+                    "src_mask": padding_mask(arr.shape[0], pad_to[0]),
+                    "tgt_mask": padding_mask(arr.shape[1], pad_to[1]),
+                }
+                arr = pad_zeros(arr, pad_to)
             return geometry.Geometry(
-                cost_matrix=arr, epsilon=epsilon, relative_epsilon=relative_epsilon, scale_cost=scale_cost
+                cost_matrix=arr, epsilon=epsilon, relative_epsilon=relative_epsilon, scale_cost=scale_cost, **masks
             )
         if x.is_kernel:
             return geometry.Geometry(
@@ -117,6 +214,7 @@ class OTTJaxSolver(OTSolver[OTTOutput], abc.ABC):
                 relative_epsilon=relative_epsilon,
                 scale_cost=scale_cost,
                 directed=directed,
+                batch_size=batch_size,
                 **kwargs,
             )
         raise NotImplementedError(f"Creating geometry from `tag={x.tag!r}` is not yet implemented.")
@@ -126,11 +224,127 @@ class OTTJaxSolver(OTSolver[OTTOutput], abc.ABC):
         prob: OTTProblem_t,
         **kwargs: Any,
     ) -> Union[OTTOutput, GraphOTTOutput]:
-        solver = jax.jit(self.solver) if self._jit else self.solver
-        out = solver(prob, **kwargs)
+        if self._init is not None:
+            kwargs.setdefault("init", self._init)
+        return self._to_output(prob, self._run(prob, **kwargs))
+
+    def _run(self, prob: OTTProblem_t, **kwargs: Any) -> Any:
+        solver = self._compile(prob, **kwargs) if self._jit else self.solver
+        return solver(prob, **kwargs)
+
+    def _batch_key(self, data: OTTProblem_t) -> Optional[Hashable]:
+        if self._config is None or self.is_low_rank or self._init is not None:
+            return None
+        if any(isinstance(geom, geodesic.Geodesic) for geom in _geometries(data)):
+            return None
+        return self._cache_key(data)
+
+    @classmethod
+    def _solve_batch(  # type: ignore[override]
+        cls, solvers: Sequence["OTTJaxSolver"], data: Sequence[OTTProblem_t]
+    ) -> List[Union[OTTOutput, GraphOTTOutput]]:
+        if len(solvers) == 1:
+            return [solvers[0]._solve(data[0])]
+
+        solver = solvers[0]
+        prob = jax.tree_util.tree_map(lambda *arrs: jnp.stack(arrs), *data)
+        fn = solver._compile(prob, batched=True) if solver._jit else jax.vmap(solver.solver)
+        out = fn(prob)
+        return [
+            s._to_output(p, jax.tree_util.tree_map(lambda arr: arr[i], out))  # noqa: B023
+            for i, (s, p) in enumerate(zip(solvers, data))
+        ]
+
+    @classmethod
+    def _placement(cls, ix: int) -> ContextManager[Any]:
+        # round-robin, e.g., over the CPU devices created by `--xla_force_host_platform_device_count`
+        devices = jax.local_devices()
+        return jax.default_device(devices[ix % len(devices)])
+
+    def _to_output(
+        self, prob: OTTProblem_t, out: Any, stages: Optional[Sequence[EpsilonStage]] = None
+    ) -> Union[OTTOutput, GraphOTTOutput]:
         if isinstance(prob, linear_problem.LinearProblem) and isinstance(prob.geom, geodesic.Geodesic):
             return GraphOTTOutput(out, shape=(len(self._a), len(self._b)))  # type: ignore[arg-type]
-        return OTTOutput(out)
+        return OTTOutput(out, shape=None if self._pad_to is None else (len(self._a), len(self._b)), stages=stages)
+
+    def _dual_init(self, geom: geometry.Geometry, f: jax.Array, g: jax.Array) -> Tuple[jax.Array, jax.Array]:
+        # potentials of points with zero mass are `-inf`; the initializer masks them again
+        f, g = (jnp.where(jnp.isfinite(pot), pot, 0.0) for pot in (f, g))
+        if not self.solver.lse_mode:
+            f, g = geom.scaling_from_potential(f), geom.scaling_from_potential(g)
+        return f, g
+
+    def _warm_start(self, prob: OTTProblem_t, init: Optional[BaseSolverOutput]) -> Optional[Any]:
+        if init is None:
+            return None
+        n, m = prob.geom.shape if isinstance(prob, linear_problem.LinearProblem) else (len(prob.a), len(prob.b))
+
+        if self.is_low_rank:
+            output = getattr(init, "_output", None)
+            if not isinstance(output, (sinkhorn_lr.LRSinkhornOutput, gromov_wasserstein_lr.LRGWOutput)):
+                logger.warning(f"Unable to warm-start a low-rank solver from `{type(init).__name__}`.")
+                return None
+            if output.q.shape != (n, self.rank) or output.r.shape != (m, self.rank):
+                logger.warning("Unable to warm-start, the previous solution has a different shape or rank.")
+                return None
+            return output.q, output.r, output.g
+
+        if isinstance(prob, linear_problem.LinearProblem):
+            if init.potentials is None:
+                logger.warning(f"Unable to warm-start from `{type(init).__name__}` without dual potentials.")
+                return None
+            f, g = map(jnp.asarray, init.potentials)
+            if self._pad_to is not None:
+                f, g = pad_zeros(f, self._pad_to[:1]), pad_zeros(g, self._pad_to[1:])
+            if f.shape != (n,) or g.shape != (m,):
+                logger.warning("Unable to warm-start, the previous solution has a different shape.")
+                return None
+            return self._dual_init(prob.geom, f, g)
+
+        coupling = jnp.asarray(init.transport_matrix)
+        if self._pad_to is not None:
+            coupling = pad_zeros(coupling, self._pad_to)
+        if coupling.shape != (n, m):
+            logger.warning("Unable to warm-start, the previous solution has a different shape.")
+            return None
+        return quad_initializers.QuadraticInitializer(init_coupling=coupling)(
+            prob, epsilon=self.solver.epsilon, relative_epsilon=self.solver.relative_epsilon
+        )
+
+    def _padded_shape(
+        self, pad_to_bucket: Union[bool, Bucket_t], cost_matrix_rank: Optional[int]
+    ) -> Optional[Tuple[int, int]]:
+        if not pad_to_bucket:
+            return None
+        if self.is_low_rank:
+            raise NotImplementedError("Padding is not yet implemented for low-rank solvers.")
+        if cost_matrix_rank is not None:
+            raise NotImplementedError("Padding is not yet implemented for low-rank cost matrices.")
+        return bucket_size(len(self._a), pad_to_bucket), bucket_size(len(self._b), pad_to_bucket)
+
+    def _cache_key(self, prob: OTTProblem_t, *, batched: bool = False, **kwargs: Any) -> Hashable:
+        return (
+            self._config,
+            self.problem_kind,
+            batched,
+            tuple(type(geom).__name__ for geom in _geometries(prob)),
+            str(jax.config.jax_default_device),
+            _abstract_signature((prob, kwargs)),
+        )
+
+    def _compile(self, prob: OTTProblem_t, *, batched: bool = False, **kwargs: Any) -> Callable[..., Any]:
+        fn = jax.vmap(self.solver) if batched else self.solver
+        if self._config is None:
+            return jax.jit(fn)
+
+        key = self._cache_key(prob, batched=batched, **kwargs)
+        compiled = compilation_cache.get(key)
+        if compiled is None:
+            logger.debug(f"Compiling `{type(self.solver).__name__}` with `batched={batched}`.")
+            compiled = jax.jit(fn).lower(prob, **kwargs).compile()
+            compilation_cache.put(key, compiled)
+        return compiled
 
     def _create_graph_geometry(
         self,
@@ -143,6 +357,7 @@ class OTTJaxSolver(OTSolver[OTTOutput], abc.ABC):
         relative_epsilon: Optional[bool] = None,
         scale_cost: Scale_t = 1.0,
         directed: bool = True,
+        batch_size: Optional[int] = None,
         **kwargs: Any,
     ) -> geometry.Geometry:
         if x.cost == "geodesic":
@@ -161,6 +376,7 @@ class OTTJaxSolver(OTSolver[OTTOutput], abc.ABC):
                     relative_epsilon=relative_epsilon,
                     scale_cost=scale_cost,
                     directed=directed,
+                    batch_size=batch_size,
                     **kwargs,
                 )
             if self.problem_kind == "quadratic":
@@ -174,6 +390,7 @@ class OTTJaxSolver(OTSolver[OTTOutput], abc.ABC):
                     relative_epsilon=relative_epsilon,
                     scale_cost=scale_cost,
                     directed=directed,
+                    batch_size=batch_size,
                     **kwargs,
                 )
 
@@ -233,6 +450,10 @@ class SinkhornSolver(OTTJaxSolver):
         **kwargs: Any,
     ):
         super().__init__(jit=jit)
+        self._epsilon_factors: Tuple[float, ...] = ()
+        self._set_config(
+            rank=rank, epsilon=epsilon, initializer=initializer, initializer_kwargs=initializer_kwargs, **kwargs
+        )
         if rank > -1:
             kwargs.setdefault("gamma", 10)
             kwargs.setdefault("gamma_rescale", True)
@@ -259,6 +480,10 @@ class SinkhornSolver(OTTJaxSolver):
         cost_kwargs: Mapping[str, Any] = types.MappingProxyType({}),
         cost_matrix_rank: Optional[int] = None,
         time_scales_heat_kernel: Optional[TimeScalesHeatKernel] = None,
+        pad_to_bucket: Union[bool, Bucket_t] = False,
+        init: Optional[BaseSolverOutput] = None,
+        epsilon_schedule: Optional[Union[Sequence[float], epsilon_scheduler.Epsilon]] = None,
+        precision: Optional[Precision_t] = None,
         # problem
         **kwargs: Any,
     ) -> linear_problem.LinearProblem:
@@ -268,8 +493,9 @@ class SinkhornSolver(OTTJaxSolver):
         )
         if xy is None:
             raise ValueError(f"Unable to create geometry from `xy={xy}`.")
-        self._a = a
-        self._b = b
+        self._a = a = _marginals_precision(a, precision)
+        self._b = b = _marginals_precision(b, precision)
+        self._pad_to = self._padded_shape(pad_to_bucket, cost_matrix_rank)
         geom = self._create_geometry(
             xy,
             is_linear_term=True,
@@ -279,6 +505,8 @@ class SinkhornSolver(OTTJaxSolver):
             problem_shape=(len(self._a), len(self._b)),
             scale_cost=scale_cost,
             t=time_scales_heat_kernel.xy,
+            pad_to=self._pad_to,
+            precision=precision,
             **cost_kwargs,
         )
         if cost_matrix_rank is not None:
@@ -286,9 +514,48 @@ class SinkhornSolver(OTTJaxSolver):
         if isinstance(geom, geodesic.Geodesic):
             a = jnp.concatenate((a, jnp.zeros_like(self._b)), axis=0)
             b = jnp.concatenate((jnp.zeros_like(self._a), b), axis=0)
+        if self._pad_to is not None:
+            a, b = pad_zeros(a, self._pad_to[:1]), pad_zeros(b, self._pad_to[1:])
+        self._epsilon_factors = () if epsilon_schedule is None else epsilon_factors(epsilon_schedule)
+        if self._epsilon_factors and (self.is_low_rank or isinstance(geom, geodesic.Geodesic)):
+            raise NotImplementedError("Epsilon scheduling is only implemented for full-rank non-graph problems.")
         self._problem = linear_problem.LinearProblem(geom, a=a, b=b, **kwargs)
+        self._init = self._warm_start(self._problem, init)
         return self._problem
 
+    def _solve(  # type: ignore[override]
+        self,
+        prob: linear_problem.LinearProblem,
+        **kwargs: Any,
+    ) -> Union[OTTOutput, GraphOTTOutput]:
+        if not self._epsilon_factors:
+            return super()._solve(prob, **kwargs)
+
+        # anneal the regularization, each stage is initialized from the previous stage's potentials
+        target = float(prob.geom.epsilon)
+        stages: List[EpsilonStage] = []
+        init, out = kwargs.pop("init", self._init), None
+        for factor in self._epsilon_factors + (1.0,):
+            geom = with_epsilon(prob.geom, factor * target)
+            stage_prob = linear_problem.LinearProblem(geom, a=prob.a, b=prob.b, tau_a=prob.tau_a, tau_b=prob.tau_b)
+            if out is not None:
+                init = self._dual_init(geom, out.f, out.g)
+            start = time.perf_counter()
+            out = jax.block_until_ready(self._run(stage_prob, **kwargs, **({} if init is None else {"init": init})))
+            stages.append(
+                EpsilonStage(
+                    epsilon=factor * target,
+                    n_iters=int(out.n_iters),
+                    time=time.perf_counter() - start,
+                    converged=bool(out.converged),
+                )
+            )
+            logger.debug(f"Solved the stage with `epsilon={factor * target}` in `{stages[-1].n_iters}` iterations.")
+        return self._to_output(prob, out, stages=stages)
+
+    def _batch_key(self, data: linear_problem.LinearProblem) -> Optional[Hashable]:
+        return None if self._epsilon_factors else super()._batch_key(data)
+
     @property
     def xy(self) -> Optional[geometry.Geometry]:
         """Geometry defining the linear term."""
@@ -308,6 +575,9 @@ class SinkhornSolver(OTTJaxSolver):
             "cost_kwargs",
             "cost_matrix_rank",
             "t",
+            "pad_to_bucket",
+            "epsilon_schedule",
+            "precision",
         }
         problem_kwargs = set(inspect.signature(linear_problem.LinearProblem).parameters.keys())
         problem_kwargs -= {"geom"}
@@ -349,6 +619,13 @@ class GWSolver(OTTJaxSolver):
         **kwargs: Any,
     ):
         super().__init__(jit=jit)
+        self._set_config(
+            rank=rank,
+            initializer=initializer,
+            initializer_kwargs=initializer_kwargs,
+            linear_solver_kwargs=linear_solver_kwargs,
+            **kwargs,
+        )
         if rank > -1:
             kwargs.setdefault("gamma", 10)
             kwargs.setdefault("gamma_rescale", True)
@@ -385,12 +662,15 @@ class GWSolver(OTTJaxSolver):
         cost_kwargs: Mapping[str, Any] = types.MappingProxyType({}),
         cost_matrix_rank: Optional[int] = None,
         time_scales_heat_kernel: Optional[TimeScalesHeatKernel] = None,
+        pad_to_bucket: Union[bool, Bucket_t] = False,
+        init: Optional[BaseSolverOutput] = None,
+        precision: Optional[Precision_t] = None,
         # problem
         alpha: float = 0.5,
         **kwargs: Any,
     ) -> quadratic_problem.QuadraticProblem:
-        self._a = a
-        self._b = b
+        self._a = _marginals_precision(a, precision)
+        self._b = _marginals_precision(b, precision)
         time_scales_heat_kernel = (
             TimeScalesHeatKernel(None, None, None) if time_scales_heat_kernel is None else time_scales_heat_kernel
         )
@@ -401,12 +681,26 @@ class GWSolver(OTTJaxSolver):
             "relative_epsilon": relative_epsilon,
             "batch_size": batch_size,
             "scale_cost": scale_cost,
+            "precision": precision,
             **cost_kwargs,
         }
         if cost_matrix_rank is not None:
             geom_kwargs["cost_matrix_rank"] = cost_matrix_rank
-        geom_xx = self._create_geometry(x, t=time_scales_heat_kernel.x, is_linear_term=False, **geom_kwargs)
-        geom_yy = self._create_geometry(y, t=time_scales_heat_kernel.y, is_linear_term=False, **geom_kwargs)
+        self._pad_to = pad_to = self._padded_shape(pad_to_bucket, cost_matrix_rank)
+        geom_xx = self._create_geometry(
+            x,
+            t=time_scales_heat_kernel.x,
+            is_linear_term=False,
+            pad_to=None if pad_to is None else (pad_to[0], pad_to[0]),
+            **geom_kwargs,
+        )
+        geom_yy = self._create_geometry(
+            y,
+            t=time_scales_heat_kernel.y,
+            is_linear_term=False,
+            pad_to=None if pad_to is None else (pad_to[1], pad_to[1]),
+            **geom_kwargs,
+        )
         if alpha == 1.0 or xy is None:  # GW
             # arbitrary fused penalty; must be positive
             geom_xy, fused_penalty = None, 1.0
@@ -417,13 +711,18 @@ class GWSolver(OTTJaxSolver):
                 t=time_scales_heat_kernel.xy,
                 problem_shape=(x.shape[0], y.shape[0]),
                 is_linear_term=True,
+                pad_to=pad_to,
                 **geom_kwargs,
             )
             check_shapes(geom_xx, geom_yy, geom_xy)
 
+        a, b = self._a, self._b
+        if pad_to is not None:
+            a, b = pad_zeros(a, pad_to[:1]), pad_zeros(b, pad_to[1:])
         self._problem = quadratic_problem.QuadraticProblem(
-            geom_xx, geom_yy, geom_xy, fused_penalty=fused_penalty, a=self._a, b=self._b, **kwargs
+            geom_xx, geom_yy, geom_xy, fused_penalty=fused_penalty, a=a, b=b, **kwargs
         )
+        self._init = self._warm_start(self._problem, init)
         return self._problem
 
     @property
@@ -452,7 +751,16 @@ class GWSolver(OTTJaxSolver):
 
     @classmethod
     def _call_kwargs(cls) -> Tuple[Set[str], Set[str]]:
-        geom_kwargs = {"epsilon", "relative_epsilon", "batch_size", "scale_cost", "cost_kwargs", "cost_matrix_rank"}
+        geom_kwargs = {
+            "epsilon",
+            "relative_epsilon",
+            "batch_size",
+            "scale_cost",
+            "cost_kwargs",
+            "cost_matrix_rank",
+            "pad_to_bucket",
+            "precision",
+        }
         problem_kwargs = set(inspect.signature(quadratic_problem.QuadraticProblem).parameters.keys())
         problem_kwargs -= {"geom_xx", "geom_yy", "geom_xy", "fused_penalty"}
         problem_kwargs |= {"alpha"}
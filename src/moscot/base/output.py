@@ -1,16 +1,18 @@
 import abc
 import copy
 import functools
-from typing import Any, Callable, Iterable, List, Literal, Optional, Tuple, Union
+import os
+from typing import Any, Callable, Iterable, Iterator, Literal, Optional, Tuple, Union
 
 import numpy as np
 import scipy.sparse as sp
+from scipy import special
 from scipy.sparse.linalg import LinearOperator
 
 from moscot._logging import logger
-from moscot._types import ArrayLike, Device_t, DTypeLike  # type: ignore[attr-defined]
+from moscot._types import ArrayLike, Device_t, DTypeLike, PathLike  # type: ignore[attr-defined]
 
-__all__ = ["BaseSolverOutput", "MatrixSolverOutput"]
+__all__ = ["BaseSolverOutput", "MatrixSolverOutput", "TopKSolverOutput"]
 
 
 class BaseSolverOutput(abc.ABC):
@@ -174,12 +176,14 @@ class BaseSolverOutput(abc.ABC):
         batch_size: int = 1024,
         n_samples: Optional[int] = None,
         seed: Optional[int] = None,
+        spill_dir: Optional[PathLike] = None,
     ) -> "MatrixSolverOutput":
         """Sparsify the :attr:`transport_matrix`.
 
         This function sets all entries of the transport matrix below a certain threshold to :math:`0` and
         returns a :class:`~moscot.base.output.MatrixSolverOutput` with sparsified transport matrix stored
-        as a :class:`~scipy.sparse.csr_matrix`.
+        as a :class:`~scipy.sparse.csr_matrix`. The :attr:`transport_matrix` is streamed in blocks of ``batch_size``
+        rows or columns and only the retained entries are kept in memory.
 
         .. warning::
             This function only serves for interfacing software which has to instantiate the transport matrix,
@@ -197,13 +201,16 @@ class BaseSolverOutput(abc.ABC):
         value
             Value to use for sparsification.
         batch_size
-            How many rows to materialize when sparsifying the :attr:`transport_matrix`.
+            How many rows or columns to materialize at once when sparsifying the :attr:`transport_matrix`.
         n_samples
             If ``mode = 'percentile'``, determine the number of samples based on which the percentile is computed
             stochastically. Note this means that a matrix of shape `[n_samples, min(transport_matrix.shape)]`
             has to be instantiated. If `None`, ``n_samples`` is set to ``batch_size``.
         seed
             Random seed needed for sampling if ``mode = 'percentile'``.
+        spill_dir
+            Directory where to store the retained entries as memory-mapped :mod:`numpy` arrays.
+            If :obj:`None`, keep them in memory.
 
         Returns
         -------
@@ -226,27 +233,147 @@ class BaseSolverOutput(abc.ABC):
             res = self.pull(x, scale_by_marginals=False)  # tmap @ indicator_vectors
             thr = np.percentile(res, value)
         elif mode == "min_row":
-            thr = np.inf
-            for batch in range(0, m, batch_size):
-                x = np.eye(m, min(batch_size, m - batch), -(min(batch, m)))
-                res = self.pull(x, scale_by_marginals=False)  # tmap @ indicator_vectors
-                thr = min(thr, float(res.max(axis=1).min()))
+            row_max = np.full((n,), -np.inf)
+            for start, block in self._transport_blocks(batch_size, forward=n < m):
+                if n < m:
+                    row_max[start : start + len(block)] = np.asarray(block.max(axis=1))
+                else:
+                    row_max = np.maximum(row_max, np.asarray(block.max(axis=0)))
+            thr = float(row_max.min())
         else:
             raise NotImplementedError(f"Mode `{mode}` is not yet implemented.")
 
-        k, func, fn_stack = (n, self.push, sp.vstack) if n < m else (m, self.pull, sp.hstack)
-        tmaps_sparse: List[sp.csr_matrix] = []
-
-        for batch in range(0, k, batch_size):
-            x = np.eye(k, min(batch_size, k - batch), -(min(batch, k)), dtype=float)
-            res = np.array(func(x, scale_by_marginals=False))
-            res[res < thr] = 0.0
-            tmaps_sparse.append(sp.csr_matrix(res.T if n < m else res))
+        # stream over the smaller dimension; in the backward case, the blocks are rows of the transposed matrix
+        builder = _CompressedBuilder(n_rows=min(n, m), spill_dir=spill_dir)
+        for start, block in self._transport_blocks(batch_size, forward=n < m):
+            builder.append(start, block, threshold=thr)
+        tmap = builder.build(n_cols=max(n, m))
 
         return MatrixSolverOutput(
-            transport_matrix=fn_stack(tmaps_sparse), cost=self.cost, converged=self.converged, is_linear=self.is_linear
+            transport_matrix=tmap if n < m else tmap.T.tocsr(),
+            cost=self.cost,
+            converged=self.converged,
+            is_linear=self.is_linear,
+        )
+
+    def top_k(self, k: int, batch_size: int = 1024) -> "TopKSolverOutput":
+        """Keep only the ``k`` largest entries in each row of the :attr:`transport_matrix`.
+
+        The :attr:`transport_matrix` is streamed in blocks of ``batch_size`` rows, the memory needed is
+        :math:`O(n k)` instead of :math:`O(n m)`.
+
+        Parameters
+        ----------
+        k
+            Number of entries to keep in each row, e.g., the most likely descendants of each cell.
+        batch_size
+            How many rows to materialize at once.
+
+        Returns
+        -------
+        Output with the truncated transport matrix.
+        """
+        n, m = self.shape
+        if k <= 0:
+            raise ValueError(f"Expected `k` to be positive, found `{k}`.")
+        k = min(k, m)
+
+        indices = np.empty((n, k), dtype=np.int32)
+        weights = np.empty((n, k), dtype=np.float32)
+        for start, block in self._transport_blocks(batch_size, forward=True):
+            ixs, vals = _top_k(block, k)
+            indices[start : start + len(ixs)] = ixs
+            weights[start : start + len(ixs)] = vals
+
+        return TopKSolverOutput(
+            indices, weights, n_cols=m, cost=self.cost, converged=self.converged, is_linear=self.is_linear
         )
 
+    def argmax(self, forward: bool = True, batch_size: int = 1024) -> ArrayLike:
+        """Get the index of the largest entry in each row or column of the :attr:`transport_matrix`.
+
+        The :attr:`transport_matrix` is streamed in blocks of ``batch_size`` rows or columns and the maxima
+        are computed on the device of the blocks, only the indices are transferred.
+
+        Parameters
+        ----------
+        forward
+            If :obj:`True`, find the largest entry in each row, e.g., the most likely descendant of each cell.
+            Otherwise, find the largest entry in each column.
+        batch_size
+            How many rows or columns to materialize at once.
+
+        Returns
+        -------
+        Array of shape ``[n,]`` if ``forward = True``, otherwise ``[m,]``.
+        """
+        out = np.empty((self.shape[0] if forward else self.shape[1],), dtype=np.int64)
+        for start, block in self._transport_blocks(batch_size, forward=forward):
+            out[start : start + len(block)] = np.asarray(block.argmax(axis=1)).reshape(-1)
+        return out
+
+    def entropy(
+        self,
+        forward: bool = True,
+        batch_size: int = 1024,
+        c: float = 0.0,
+        base: Optional[float] = None,
+        return_statistics: bool = False,
+    ) -> Union[ArrayLike, Tuple[ArrayLike, ArrayLike, ArrayLike]]:
+        """Compute the entropy of each row or column of the :attr:`transport_matrix`.
+
+        The :attr:`transport_matrix` is streamed in blocks of ``batch_size`` rows or columns, which are normalized
+        and reduced on the device of the blocks.
+
+        Parameters
+        ----------
+        forward
+            If :obj:`True`, compute the entropy of each row, i.e., of the conditional distribution of each source cell.
+            Otherwise, compute the entropy of each column.
+        batch_size
+            How many rows or columns to materialize at once.
+        c
+            Constant added to each entry before normalizing, e.g., to avoid numerical instability.
+        base
+            Base of the logarithm. If :obj:`None`, use the natural logarithm.
+        return_statistics
+            Whether to also return the perplexity and the effective support size, i.e., the inverse
+            `Simpson index <https://en.wikipedia.org/wiki/Diversity_index#Inverse_Simpson_index>`_,
+            of each distribution.
+
+        Returns
+        -------
+        Array of shape ``[n,]`` if ``forward = True``, otherwise ``[m,]``. If ``return_statistics = True``,
+        also the perplexity and the effective support size, each of the same shape.
+        """
+        k = self.shape[0] if forward else self.shape[1]
+        entropy, perplexity, support = np.empty((k,)), np.empty((k,)), np.empty((k,))
+        for start, block in self._transport_blocks(batch_size, forward=forward):
+            stop = start + len(block)
+            entropy[start:stop], perplexity[start:stop], support[start:stop] = _entropy(block, c=c, base=base)
+        return (entropy, perplexity, support) if return_statistics else entropy
+
+    def _transport_blocks(self, batch_size: int, *, forward: bool) -> Iterator[Tuple[int, ArrayLike]]:
+        """Iterate over consecutive blocks of the :attr:`transport_matrix`.
+
+        Parameters
+        ----------
+        batch_size
+            Number of rows or columns in each block.
+        forward
+            If :obj:`True`, iterate over blocks of rows of shape ``[batch_size, m]``, otherwise over blocks
+            of columns, returned transposed as an array of shape ``[batch_size, n]``.
+
+        Returns
+        -------
+        The index of the first row or column and the block.
+        """
+        k = self.shape[0] if forward else self.shape[1]
+        func = self.push if forward else self.pull
+        for start in range(0, k, batch_size):
+            x = np.eye(k, min(batch_size, k - start), -start, dtype=float)
+            yield start, func(x, scale_by_marginals=False).T  # transport_matrix.T @ indicator_vectors
+
     @property
     def a(self) -> ArrayLike:
         """:term:`Marginals` of the source distribution.
@@ -367,3 +494,251 @@ class MatrixSolverOutput(BaseSolverOutput):
         import jax.numpy as jnp
 
         return jnp.ones((n,), dtype=self.transport_matrix.dtype)
+
+
+class TopKSolverOutput(BaseSolverOutput):
+    """:term:`OT` solution which keeps only the ``k`` largest entries in each row of the transport matrix.
+
+    Usually created by :meth:`~moscot.base.output.BaseSolverOutput.top_k`.
+
+    Parameters
+    ----------
+    indices
+        Column indices of the retained entries, array of shape ``[n, k]``.
+    weights
+        Values of the retained entries, array of shape ``[n, k]``.
+    n_cols
+        Number of columns of the transport matrix.
+    cost
+        Cost of an :term:`OT` problem.
+    converged
+        Whether the solution converged.
+    is_linear
+        Whether this is a solution to a :term:`linear problem`.
+    """
+
+    def __init__(
+        self,
+        indices: ArrayLike,
+        weights: ArrayLike,
+        *,
+        n_cols: int,
+        cost: float = np.nan,
+        converged: bool = True,
+        is_linear: bool = True,
+    ):
+        super().__init__()
+        indices, weights = np.asarray(indices, dtype=np.int32), np.asarray(weights, dtype=np.float32)
+        if indices.ndim != 2 or indices.shape != weights.shape:
+            raise ValueError(
+                f"Expected `indices` and `weights` to be 2D arrays of the same shape, "
+                f"found `{indices.shape}` and `{weights.shape}`."
+            )
+        n, k = indices.shape
+        self._transport_matrix = sp.csr_matrix(
+            (weights.ravel(), indices.ravel(), np.arange(0, n * k + 1, k)), shape=(n, n_cols)
+        )
+        self._cost = cost
+        self._converged = converged
+        self._is_linear = is_linear
+
+    def _apply(self, x: ArrayLike, *, forward: bool) -> ArrayLike:
+        x = np.asarray(x)
+        if forward:
+            return self.transport_matrix.T @ x
+        return self.transport_matrix @ x
+
+    def chain(  # noqa: D102
+        self, outputs: Iterable[BaseSolverOutput], scale_by_marginals: bool = False
+    ) -> LinearOperator:
+        outputs = list(outputs)
+        chain = [self, *outputs]
+        if not all(isinstance(out, TopKSolverOutput) for out in chain):
+            return super().chain(outputs, scale_by_marginals=scale_by_marginals)
+
+        # materialize the sparse products, pull: T_1 D_1 ... T_k D_k, push: (D_1 T_1 ... D_k T_k)^T
+        eps = 1e-12  # same as in `_scale_by_marginals`
+        pull, push = None, None
+        for out in chain:
+            tmap = out.transport_matrix
+            if scale_by_marginals:
+                right, left = tmap @ sp.diags(1.0 / (out.b + eps)), sp.diags(1.0 / (out.a + eps)) @ tmap
+            else:
+                right = left = tmap
+            pull = right if pull is None else pull @ right
+            push = left if push is None else push @ left
+        pull, push = pull.tocsr(), push.T.tocsr()  # type: ignore[union-attr]
+
+        op = LinearOperator(
+            shape=pull.shape, dtype=self.dtype, matvec=pull.dot, matmat=pull.dot, rmatvec=push.dot, rmatmat=push.dot
+        )
+        # size of the precomputed composite, used when caching it
+        op.nbytes = sum(mat.data.nbytes + mat.indices.nbytes + mat.indptr.nbytes for mat in (pull, push))
+        return op
+
+    @property
+    def indices(self) -> ArrayLike:
+        """Column indices of the retained entries, array of shape ``[n, k]``."""
+        return self._transport_matrix.indices.reshape(self.shape[0], -1)
+
+    @property
+    def weights(self) -> ArrayLike:
+        """Values of the retained entries, array of shape ``[n, k]``."""
+        return self._transport_matrix.data.reshape(self.shape[0], -1)
+
+    @property
+    def k(self) -> int:
+        """Number of retained entries in each row."""
+        return self.indices.shape[1]
+
+    @property
+    def transport_matrix(self) -> sp.csr_matrix:  # noqa: D102
+        return self._transport_matrix
+
+    @property
+    def shape(self) -> Tuple[int, int]:  # noqa: D102
+        return self._transport_matrix.shape  # type: ignore[return-value]
+
+    def to(self, device: Optional[Device_t] = None) -> "TopKSolverOutput":  # noqa: D102
+        if device is not None:
+            logger.warning(f"`{self!r}` does not support the `device` argument, ignoring.")
+        return self
+
+    @property
+    def cost(self) -> float:  # noqa: D102
+        return self._cost
+
+    @property
+    def converged(self) -> bool:  # noqa: D102
+        return self._converged
+
+    @property
+    def potentials(self) -> Optional[Tuple[ArrayLike, ArrayLike]]:  # noqa: D102
+        return None
+
+    @property
+    def is_linear(self) -> bool:  # noqa: D102
+        return self._is_linear
+
+    def _ones(self, n: int) -> ArrayLike:
+        return np.ones((n,), dtype=np.float32)
+
+
+def _top_k(block: ArrayLike, k: int) -> Tuple[ArrayLike, ArrayLike]:
+    """Get the column indices and values of the ``k`` largest entries in each row, on the ``block``'s device."""
+    if isinstance(block, np.ndarray):
+        ixs = np.argpartition(block, -k, axis=1)[:, -k:]
+        return ixs, np.take_along_axis(block, ixs, axis=1)
+
+    import jax
+
+    vals, ixs = jax.lax.top_k(block, k)
+    return np.asarray(ixs), np.asarray(vals)
+
+
+def _entropy(block: ArrayLike, *, c: float, base: Optional[float] = None) -> Tuple[ArrayLike, ArrayLike, ArrayLike]:
+    """Get the entropy, perplexity and effective support size of each row, on the ``block``'s device."""
+    if isinstance(block, np.ndarray):
+        xp, entr = np, special.entr
+    else:
+        import jax.numpy as xp
+        from jax.scipy.special import entr
+
+    p = block + c
+    p = p / p.sum(axis=1, keepdims=True)
+    entropy = entr(p).sum(axis=1)
+    # the perplexity doesn't depend on the base of the logarithm
+    perplexity = xp.exp(entropy)
+    support = 1.0 / (p**2).sum(axis=1)
+    if base is not None:
+        entropy = entropy / np.log(base)
+    return np.asarray(entropy), np.asarray(perplexity), np.asarray(support)
+
+
+class _CompressedBuilder:
+    """Incrementally build a :class:`~scipy.sparse.csr_matrix` from consecutive blocks of rows.
+
+    The retained entries are appended to buffers which grow geometrically and are optionally memory-mapped.
+
+    Parameters
+    ----------
+    n_rows
+        Number of rows of the matrix.
+    spill_dir
+        Directory where to memory-map the buffers. If :obj:`None`, keep them in memory.
+    """
+
+    def __init__(self, n_rows: int, spill_dir: Optional[PathLike] = None):
+        self._spill_dir = spill_dir
+        self._indptr = np.zeros((n_rows + 1,), dtype=np.int64)
+        self._indices = self._alloc("indices", 0, dtype=np.int64)
+        self._data: Optional[np.ndarray] = None
+        self._nnz = 0
+
+    def append(self, start: int, block: ArrayLike, *, threshold: float) -> None:
+        """Append the entries of ``block`` which are non-zero and at least ``threshold``.
+
+        The mask is computed where the ``block`` lives, only the retained entries are transferred to the host.
+
+        Parameters
+        ----------
+        start
+            Index of the first row of the ``block``.
+        block
+            Dense array of shape ``[batch_size, n_cols]``.
+        threshold
+            Entries below this value are discarded.
+
+        Returns
+        -------
+        Nothing, just updates the buffers.
+        """
+        rows, cols = np.nonzero(np.asarray((block >= threshold) & (block != 0)))
+        values = np.asarray(block[rows, cols])
+        if self._data is None:
+            self._data = self._alloc("data", 0, dtype=values.dtype)
+
+        nnz = self._nnz + len(values)
+        self._reserve(nnz)
+        self._indices[self._nnz : nnz] = cols
+        self._data[self._nnz : nnz] = values
+        counts = np.bincount(rows, minlength=len(block))
+        self._indptr[start + 1 : start + 1 + len(block)] = self._nnz + np.cumsum(counts)
+        self._nnz = nnz
+
+    def build(self, n_cols: int) -> sp.csr_matrix:
+        """Build the matrix.
+
+        Parameters
+        ----------
+        n_cols
+            Number of columns of the matrix.
+
+        Returns
+        -------
+        The sparse matrix.
+        """
+        data = np.zeros((0,)) if self._data is None else self._data[: self._nnz]
+        shape = (len(self._indptr) - 1, n_cols)
+        return sp.csr_matrix((data, self._indices[: self._nnz], self._indptr), shape=shape)
+
+    def _reserve(self, size: int) -> None:
+        capacity = len(self._indices)
+        if size <= capacity:
+            return
+        capacity = max(size, 2 * capacity)
+        self._indices = self._grow("indices", self._indices, capacity)
+        self._data = self._grow("data", self._data, capacity)  # type: ignore[arg-type]
+
+    def _grow(self, name: str, arr: np.ndarray, capacity: int) -> np.ndarray:
+        new = self._alloc(name, capacity, dtype=arr.dtype)
+        new[: self._nnz] = arr[: self._nnz]
+        if isinstance(arr, np.memmap):
+            os.remove(arr.filename)  # type: ignore[arg-type]
+        return new
+
+    def _alloc(self, name: str, capacity: int, *, dtype: DTypeLike) -> np.ndarray:
+        if self._spill_dir is None or not capacity:
+            return np.empty((capacity,), dtype=dtype)
+        path = os.path.join(self._spill_dir, f"{name}_{capacity}.npy")
+        return np.lib.format.open_memmap(path, mode="w+", dtype=dtype, shape=(capacity,))
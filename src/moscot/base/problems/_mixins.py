@@ -23,11 +23,12 @@ from anndata import AnnData
 
 from moscot import _constants
 from moscot._types import ArrayLike, Numeric_t, Str_Dict_t
-from moscot.base.output import BaseSolverOutput
+from moscot.base.output import BaseSolverOutput, _entropy
 from moscot.base.problems._utils import (
     _check_argument_compatibility_cell_transition,
     _correlation_test,
     _get_df_cell_transition,
+    _one_hot,
     _order_transition_matrix,
     _validate_annotations,
     _validate_args_cell_transition,
@@ -221,8 +222,6 @@ class AnalysisMixin(Generic[K, B]):
         )
 
         if aggregation_mode == "annotation":
-            df_target["distribution"] = 0
-            df_source["distribution"] = 0
             tm = pd.DataFrame(
                 np.zeros((len(source_annotations_verified), len(target_annotations_verified))),
                 index=source_annotations_verified,
@@ -232,10 +231,12 @@ class AnalysisMixin(Generic[K, B]):
                 tm = self._annotation_aggregation_transition(  # type: ignore[attr-defined]
                     source=source,
                     target=target,
-                    annotation_key=source_annotation_key,
+                    annotation_key_1=source_annotation_key,
+                    annotation_key_2=target_annotation_key,
                     annotations_1=source_annotations_verified,
                     annotations_2=target_annotations_verified,
-                    df=df_target,
+                    df_1=df_source,
+                    df_2=df_target,
                     tm=tm,
                     forward=True,
                 )
@@ -243,25 +244,24 @@ class AnalysisMixin(Generic[K, B]):
                 tm = self._annotation_aggregation_transition(  # type: ignore[attr-defined]
                     source=source,
                     target=target,
-                    annotation_key=target_annotation_key,
+                    annotation_key_1=target_annotation_key,
+                    annotation_key_2=source_annotation_key,
                     annotations_1=target_annotations_verified,
                     annotations_2=source_annotations_verified,
-                    df=df_source,
+                    df_1=df_target,
+                    df_2=df_source,
                     tm=tm,
                     forward=False,
                 )
         elif aggregation_mode == "cell":
-            tm = pd.DataFrame(columns=target_annotations_verified if forward else source_annotations_verified)
             if forward:
                 tm = self._cell_aggregation_transition(  # type: ignore[attr-defined]
                     source=source,
                     target=target,
                     annotation_key=target_annotation_key,
-                    annotations_1=source_annotations_verified,
-                    annotations_2=target_annotations_verified,
+                    annotations=target_annotations_verified,
                     df_1=df_target,
                     df_2=df_source,
-                    tm=tm,
                     batch_size=batch_size,
                     forward=True,
                 )
@@ -270,11 +270,9 @@ class AnalysisMixin(Generic[K, B]):
                     source=source,
                     target=target,
                     annotation_key=source_annotation_key,
-                    annotations_1=target_annotations_verified,
-                    annotations_2=source_annotations_verified,
+                    annotations=source_annotations_verified,
                     df_1=df_source,
                     df_2=df_target,
-                    tm=tm,
                     batch_size=batch_size,
                     forward=False,
                 )
@@ -325,56 +323,29 @@ class AnalysisMixin(Generic[K, B]):
             out: pd.DataFrame = self._cell_transition(**cell_transition_kwargs)
             return out.idxmax(axis=axis).to_frame(name=annotation_label)
         if mapping_mode == "max":
-            out = []
             if forward:
-                source_df = _get_df_cell_transition(
+                df = _get_df_cell_transition(
                     self.adata,
                     annotation_keys=[annotation_label],
                     filter_key=key,
                     filter_value=source,
                 )
-                out_len = self.solutions[(source, target)].shape[1]
-                batch_size = batch_size if batch_size is not None else out_len
-                for batch in range(0, out_len, batch_size):
-                    tm_batch: ArrayLike = self.pull(
-                        source=source,
-                        target=target,
-                        data=None,
-                        subset=(batch, batch_size),
-                        normalize=True,
-                        return_all=False,
-                        scale_by_marginals=scale_by_marginals,
-                        split_mass=True,
-                        key_added=None,
-                    )
-                    v = np.array(tm_batch.argmax(0))
-                    out.extend(source_df[annotation_label][v[i]] for i in range(len(v)))
-
             else:
-                target_df = _get_df_cell_transition(
+                df = _get_df_cell_transition(
                     self.adata if other_adata is None else other_adata,
                     annotation_keys=[annotation_label],
                     filter_key=key,
                     filter_value=target,
                 )
-                out_len = self.solutions[(source, target)].shape[0]
-                batch_size = batch_size if batch_size is not None else out_len
-                for batch in range(0, out_len, batch_size):
-                    tm_batch: ArrayLike = self.push(  # type: ignore[no-redef]
-                        source=source,
-                        target=target,
-                        data=None,
-                        subset=(batch, batch_size),
-                        normalize=True,
-                        return_all=False,
-                        scale_by_marginals=scale_by_marginals,
-                        split_mass=True,
-                        key_added=None,
-                    )
-                    v = np.array(tm_batch.argmax(0))
-                    out.extend(target_df[annotation_label][v[i]] for i in range(len(v)))
-            categories = pd.Categorical(out)
-            return pd.DataFrame(categories, columns=[annotation_label])
+            solution = self.solutions[source, target]
+            out_len = solution.shape[1] if forward else solution.shape[0]
+            batch_size = batch_size if batch_size is not None else out_len
+            # most likely source cell of each target cell if `forward`, else the most likely target cell;
+            # the marginals only scale the columns (rows), they don't change the maxima
+            ixs = solution.argmax(forward=not forward, batch_size=batch_size)
+            labels = pd.Categorical(df[annotation_label])
+            categories = pd.Categorical.from_codes(labels.codes[ixs], categories=labels.categories)
+            return pd.DataFrame(categories.remove_unused_categories(), columns=[annotation_label])
         raise NotImplementedError(f"Mapping mode `{mapping_mode!r}` is not yet implemented.")
 
     def _sample_from_tmap(
@@ -480,35 +451,40 @@ class AnalysisMixin(Generic[K, B]):
         self: AnalysisMixinProtocol[K, B],
         source: K,
         target: K,
-        annotation_key: str,
+        annotation_key_1: str,
+        annotation_key_2: str,
         annotations_1: list[Any],
         annotations_2: list[Any],
-        df: pd.DataFrame,
+        df_1: pd.DataFrame,
+        df_2: pd.DataFrame,
         tm: pd.DataFrame,
         forward: bool,
     ) -> pd.DataFrame:
+        # computes `G_1^T P G_2` using sparse indicators of the annotations, i.e., all annotations in `annotations_1`
+        # are pushed (or pulled) at once and the resulting distributions are aggregated over `annotations_2`
         if not forward:
             tm = tm.T
         func = self.push if forward else self.pull
-        for subset in annotations_1:
+        indicator_1 = _one_hot(df_1[annotation_key_1], annotations_1)
+        indicator_2 = _one_hot(df_2[annotation_key_2], annotations_2)
+        # empty annotations can't be normalized, their transitions are undefined
+        (nonempty,) = np.nonzero(indicator_1.getnnz(axis=0))
+        dist = np.full((len(annotations_1), len(annotations_2)), np.nan)
+        if len(nonempty):
             result = func(  # TODO(@MUCDK) check how to make compatible with all policies
                 source=source,
                 target=target,
-                data=annotation_key,
-                subset=subset,
+                data=indicator_1[:, nonempty].toarray(),
                 normalize=True,
                 return_all=False,
                 scale_by_marginals=False,
                 split_mass=False,
                 key_added=None,
             )
-            df["distribution"] = result
-            cell_dist = df[df[annotation_key].isin(annotations_2)].groupby(annotation_key).sum(numeric_only=True)
-            cell_dist /= cell_dist.sum()
-            tm.loc[subset, :] = [
-                cell_dist.loc[annotation, "distribution"] if annotation in cell_dist.distribution.index else 0
-                for annotation in annotations_2
-            ]
+            cell_dist = np.asarray(indicator_2.T @ np.asarray(result)).T
+            with np.errstate(divide="ignore", invalid="ignore"):
+                dist[nonempty] = cell_dist / cell_dist.sum(axis=1, keepdims=True)
+        tm.loc[annotations_1, annotations_2] = dist
         return tm
 
     def _cell_aggregation_transition(
@@ -516,18 +492,18 @@ class AnalysisMixin(Generic[K, B]):
         source: str,
         target: str,
         annotation_key: str,
-        # TODO(MUCDK): unused variables, del below
-        annotations_1: list[Any],
-        annotations_2: list[Any],
+        annotations: list[Any],
         df_1: pd.DataFrame,
         df_2: pd.DataFrame,
-        tm: pd.DataFrame,
         batch_size: Optional[int],
         forward: bool,
     ) -> pd.DataFrame:
+        # the cells in `df_2` are pushed (or pulled) in batches, the distributions are aggregated over `annotations`
         func = self.push if forward else self.pull
         if batch_size is None:
             batch_size = len(df_2)
+        indicator = _one_hot(df_1[annotation_key], annotations)
+        tm = np.zeros((len(df_2), len(annotations)))
         for batch in range(0, len(df_2), batch_size):
             result = func(  # TODO(@MUCDK) check how to make compatible with all policies
                 source=source,
@@ -540,12 +516,8 @@ class AnalysisMixin(Generic[K, B]):
                 split_mass=True,
                 key_added=None,
             )
-            current_cells = df_2.iloc[range(batch, min(batch + batch_size, len(df_2)))].index.tolist()
-            df_1.loc[:, current_cells] = result
-            to_app = df_1[df_1[annotation_key].isin(annotations_2)].groupby(annotation_key).sum().transpose()
-            tm = pd.concat([tm, to_app], verify_integrity=True, axis=0)
-            df_1 = df_1.drop(current_cells, axis=1)
-        return tm
+            tm[batch : batch + batch_size] = np.asarray(indicator.T @ np.asarray(result)).T
+        return pd.DataFrame(tm, index=df_2.index, columns=annotations)
 
     # adapted from:
     # https://github.com/theislab/cellrank/blob/master/cellrank/_utils/_utils.py#L392
@@ -560,6 +532,7 @@ class AnalysisMixin(Generic[K, B]):
         confidence_level: float = 0.95,
         n_perms: int = 1000,
         seed: Optional[int] = None,
+        batch_size: Optional[int] = 1024,
         **kwargs: Any,
     ) -> pd.DataFrame:
         """Compute correlation of push-forward or pull-back distribution with features.
@@ -605,6 +578,10 @@ class AnalysisMixin(Generic[K, B]):
             Number of permutations to use when ``method = 'perm_test'``.
         seed
             Random seed when ``method = 'perm_test'``.
+        batch_size
+            Number of features for which to compute the correlation at once. Sparse expression is read directly
+            from :attr:`~anndata.AnnData.X` or the ``layer``, only the current batch of features is densified.
+            If :obj:`None`, compute the correlation of all features at once.
         kwargs
             Keyword arguments for parallelization, e.g., ``n_jobs``.
 
@@ -646,8 +623,16 @@ class AnalysisMixin(Generic[K, B]):
         elif features is None:
             features = list(self.adata.var_names)
 
+        if pd.Index(features).isin(adata.var_names).all():
+            X = adata.X if layer is None else adata.layers[layer]
+            if not adata.var_names.equals(pd.Index(features)):
+                X = X[:, adata.var_names.get_indexer(features)]
+        else:
+            # also features from `adata.obs`
+            X = sc.get.obs_df(adata, keys=features, layer=layer).values
+
         return _correlation_test(
-            X=sc.get.obs_df(adata, keys=features, layer=layer).values,
+            X=X,
             Y=distribution,
             feature_names=features,
             corr_method=corr_method,
@@ -655,6 +640,7 @@ class AnalysisMixin(Generic[K, B]):
             confidence_level=confidence_level,
             n_perms=n_perms,
             seed=seed,
+            batch_size=batch_size,
             **kwargs,
         )
 
@@ -666,6 +652,7 @@ class AnalysisMixin(Generic[K, B]):
         key_added: Optional[str] = "conditional_entropy",
         batch_size: Optional[int] = None,
         c: float = 1e-10,
+        statistics: bool = False,
         **kwargs: Any,
     ) -> Optional[pd.DataFrame]:
         """Compute the conditional entropy per cell.
@@ -687,36 +674,52 @@ class AnalysisMixin(Generic[K, B]):
             Batch size for the computation of the entropy. If :obj:`None`, the entire dataset is used.
         c
             Constant added to each row of the transport matrix to avoid numerical instability.
+        statistics
+            Whether to also compute the perplexity and the effective support size of the conditional distribution
+            of each cell, stored with the ``'_perplexity'`` and ``'_support'`` suffixes.
         kwargs
-            Kwargs for :func:`~scipy.stats.entropy`.
+            Keyword arguments for :meth:`~moscot.base.output.BaseSolverOutput.entropy`, e.g., ``base``.
 
         Returns
         -------
         :obj:`None` if ``key_added`` is not None. Otherwise, returns a data frame of shape ``(n_cells, 1)`` containing
-        the conditional entropy per cell.
+        the conditional entropy per cell, or of shape ``(n_cells, 3)`` if ``statistics = True``.
         """
-        from scipy import stats
-
         filter_value = source if forward else target
-        df = pd.DataFrame(
-            index=self.adata[self.adata.obs[self._policy.key] == filter_value, :].obs_names,
-            columns=[key_added] if key_added is not None else ["entropy"],
-        )
-        batch_size = batch_size if batch_size is not None else len(df)
-        func = self.push if forward else self.pull
-        for batch in range(0, len(df), batch_size):
-            cond_dists = func(
-                source=source,
-                target=target,
-                data=None,
-                subset=(batch, batch_size),
-                normalize=True,
-                return_all=False,
-                scale_by_marginals=False,
-                split_mass=True,
-                key_added=None,
+        name = key_added if key_added is not None else "entropy"
+        index = self.adata[self.adata.obs[self._policy.key] == filter_value, :].obs_names
+        batch_size = batch_size if batch_size is not None else len(index)
+        if (source, target) in self.solutions:
+            # the blocks are computed and reduced directly by the solution, e.g., from the potentials
+            entropy, perplexity, support = self.solutions[source, target].entropy(
+                forward=forward, batch_size=batch_size, c=c, return_statistics=True, **kwargs
             )
-            df.iloc[range(batch, min(batch + batch_size, len(df))), 0] = stats.entropy(cond_dists + c, **kwargs)  # type: ignore[operator]
+        else:
+            func = self.push if forward else self.pull
+            entropy, perplexity, support = np.empty((3, len(index)))
+            for batch in range(0, len(index), batch_size):
+                cond_dists = func(
+                    source=source,
+                    target=target,
+                    data=None,
+                    subset=(batch, batch_size),
+                    normalize=True,
+                    return_all=False,
+                    scale_by_marginals=False,
+                    split_mass=True,
+                    key_added=None,
+                )
+                stop = min(batch + batch_size, len(index))
+                entropy[batch:stop], perplexity[batch:stop], support[batch:stop] = _entropy(
+                    np.asarray(cond_dists).T, c=c, **kwargs
+                )
+
+        data = {name: entropy}
+        if statistics:
+            data[f"{name}_perplexity"] = perplexity
+            data[f"{name}_support"] = support
+        df = pd.DataFrame(data, index=index)
         if key_added is not None:
-            self.adata.obs[key_added] = df
+            for col in df.columns:
+                self.adata.obs[col] = df[col]
         return df if key_added is None else None
@@ -0,0 +1,136 @@
+from typing import Any, Iterator, Mapping, Optional, Union
+
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+
+from anndata import AnnData
+
+from moscot._types import ArrayLike
+
+__all__ = ["AnnDataSubset"]
+
+
+class AnnDataSubset:
+    """Lightweight subset of the observations of :class:`~anndata.AnnData`.
+
+    Unlike :class:`~anndata.AnnData` views, the subset only stores the integer indices of the observations and
+    always reads the data from the parent object, i.e., it reflects any changes made to it.
+    Contiguous subsets are accessed via slices which, for :mod:`numpy` arrays, don't copy the data.
+
+    Parameters
+    ----------
+    adata
+        Annotated data object.
+    obs_mask
+        Boolean mask or integer indices of the observations. If :obj:`None`, use all observations.
+    var_mask
+        Boolean mask or integer indices of the variables used by :attr:`X`. If :obj:`None`, use all variables.
+    """
+
+    def __init__(
+        self, adata: AnnData, obs_mask: Optional[ArrayLike] = None, var_mask: Optional[ArrayLike] = None
+    ):
+        self._adata = adata
+        self._index = _to_index(obs_mask, adata.n_obs)
+        self._var_index = _to_index(var_mask, adata.n_vars)
+
+    def take(self, arr: Any) -> Any:
+        """Select the rows of an array aligned with the observations of :attr:`adata`.
+
+        Parameters
+        ----------
+        arr
+            Array, sparse matrix or a :mod:`pandas` object.
+
+        Returns
+        -------
+        The rows corresponding to the observations in the subset.
+        """
+        if isinstance(arr, (pd.Series, pd.DataFrame, pd.Index)):
+            return arr[self._index] if isinstance(arr, pd.Index) else arr.iloc[self._index]
+        if sp.issparse(arr) and arr.format not in ("csr", "csc"):
+            arr = arr.tocsr()
+        return arr[self._index]
+
+    def to_adata(self) -> AnnData:
+        """Create a :class:`~anndata.AnnData` view of the subset."""
+        adata = self._adata if _is_full(self._index, self._adata.n_obs) else self._adata[self._index]
+        return adata if _is_full(self._var_index, self._adata.n_vars) else adata[:, self._var_index]
+
+    @property
+    def adata(self) -> AnnData:
+        """Parent annotated data object."""
+        return self._adata
+
+    @property
+    def n_obs(self) -> int:
+        """Number of observations."""
+        if isinstance(self._index, slice):
+            return len(range(self._adata.n_obs)[self._index])
+        return len(self._index)
+
+    @property
+    def obs_names(self) -> pd.Index:
+        """Names of the observations."""
+        return self.take(self._adata.obs_names)
+
+    @property
+    def obs(self) -> Mapping[str, pd.Series]:
+        """Columns of :attr:`~anndata.AnnData.obs`, selected when accessed."""
+        return _Columns(self, self._adata.obs)
+
+    @property
+    def obsm(self) -> Mapping[str, Any]:
+        """Arrays in :attr:`~anndata.AnnData.obsm`, selected when accessed."""
+        return _Columns(self, self._adata.obsm)
+
+    @property
+    def X(self) -> Optional[Union[ArrayLike, sp.spmatrix]]:
+        """Rows of :attr:`~anndata.AnnData.X`."""
+        if self._adata.X is None:
+            return None
+        X = self.take(self._adata.X)
+        return X if _is_full(self._var_index, self._adata.n_vars) else X[:, self._var_index]
+
+    def __len__(self) -> int:
+        return self.n_obs
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}[n_obs={self.n_obs}]"
+
+
+class _Columns(Mapping[str, Any]):
+    def __init__(self, subset: AnnDataSubset, data: Mapping[str, Any]):
+        self._subset = subset
+        self._data = data
+
+    def __getitem__(self, key: str) -> Any:
+        return self._subset.take(self._data[key])
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._data
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._data.keys())
+
+    def __len__(self) -> int:
+        return len(self._data.keys())
+
+
+def _to_index(mask: Optional[ArrayLike], n: int) -> Union[slice, ArrayLike]:
+    if mask is None:
+        return slice(0, n)
+    mask = np.asarray(mask)
+    ixs = np.flatnonzero(mask) if mask.dtype == bool else mask.astype(np.intp, copy=False)
+    if not len(ixs):
+        return ixs
+    start, stop = int(ixs[0]), int(ixs[-1]) + 1
+    # contiguous and increasing indices are accessed via a slice to avoid copies
+    if stop - start == len(ixs) and np.all(np.diff(ixs) == 1):
+        return slice(start, stop)
+    return ixs
+
+
+def _is_full(index: Union[slice, ArrayLike], n: int) -> bool:
+    return isinstance(index, slice) and index == slice(0, n)
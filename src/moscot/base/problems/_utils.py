@@ -1,13 +1,19 @@
+import concurrent.futures
+import contextlib
 import functools
 import multiprocessing
 import threading
+import time
 import types
 import warnings
 from typing import (
     TYPE_CHECKING,
     Any,
     Callable,
+    ContextManager,
     Dict,
+    Hashable,
+    Iterator,
     List,
     Literal,
     Mapping,
@@ -133,6 +139,14 @@ def _get_df_cell_transition(
     return adata.obs[list({ak for ak in annotation_keys if ak is not None})].copy()
 
 
+def _one_hot(values: pd.Series, categories: Sequence[Any]) -> sp.csr_matrix:
+    # sparse indicator of shape `[len(values), len(categories)]`, values not in `categories` have empty rows
+    codes = pd.Categorical(values, categories=categories).codes
+    (rows,) = np.nonzero(codes >= 0)
+    data = np.ones((len(rows),), dtype=float)
+    return sp.csr_matrix((data, (rows, codes[rows])), shape=(len(values), len(categories)))
+
+
 def _validate_args_cell_transition(
     adata: AnnData,
     arg: Str_Dict_t,
@@ -261,12 +275,14 @@ def _correlation_test(
     confidence_level: float = 0.95,
     n_perms: Optional[int] = None,
     seed: Optional[int] = None,
+    batch_size: Optional[int] = None,
     **kwargs: Any,
 ) -> pd.DataFrame:
     """
     Perform a statistical test for correlation between X and .
 
-    Return NaN for genes which don't vary across cells.
+    Return NaN for genes which don't vary across cells. The features are processed in batches of ``batch_size``,
+    sparse ``X`` is never densified, except for the current batch when ``corr_method = 'spearman'``.
 
     Parameters
     ----------
@@ -286,6 +302,8 @@ def _correlation_test(
         Number of permutations if ``method = 'perm_test'``.
     seed
         Random seed if ``method = 'perm_test'``.
+    batch_size
+        Number of features to process at once. If :obj:`None`, process all features at once.
     kwargs
         Keyword arguments for parallelization, e.g., `n_jobs`.
 
@@ -298,16 +316,24 @@ def _correlation_test(
         - ``ci_low`` - lower bound of the ``confidence_level`` correlation confidence interval.
         - ``ci_high`` - upper bound of the ``confidence_level`` correlation confidence interval.
     """
-    corr, pvals, ci_low, ci_high = _correlation_test_helper(
-        X.T,
-        Y.values,
-        corr_method=corr_method,
-        significance_method=significance_method,
-        n_perms=n_perms,
-        seed=seed,
-        confidence_level=confidence_level,
-        **kwargs,
-    )
+    n_features = X.shape[1]
+    batch_size = n_features if batch_size is None else batch_size
+    if sp.issparse(X):
+        X = sp.csc_matrix(X)  # efficient slicing of the features, the transposed batches are in CSR format
+
+    corr, pvals, ci_low, ci_high = (np.empty((n_features, Y.shape[1])) for _ in range(4))
+    for start in range(0, n_features, batch_size):
+        stop = min(start + batch_size, n_features)
+        corr[start:stop], pvals[start:stop], ci_low[start:stop], ci_high[start:stop] = _correlation_test_helper(
+            X[:, start:stop].T,
+            Y.values,
+            corr_method=corr_method,
+            significance_method=significance_method,
+            n_perms=n_perms,
+            seed=seed,
+            confidence_level=confidence_level,
+            **kwargs,
+        )
     invalid = (corr < -1) | (corr > 1)
     if np.any(invalid):
         logger.warning(
@@ -399,7 +425,9 @@ def _correlation_test_helper(
         X = sp.csr_matrix(X)
 
     if corr_method == "spearman":
-        X, Y = st.rankdata(X, method="average", axis=0), st.rankdata(Y, method="average", axis=0)
+        # rank each feature across the cells
+        X = X.toarray() if sp.issparse(X) else X
+        X, Y = st.rankdata(X, method="average", axis=1), st.rankdata(Y, method="average", axis=0)
     corr = _pearson_mat_mat_corr_sparse(X, Y) if sp.issparse(X) else _pearson_mat_mat_corr_dense(X, Y)
 
     if significance_method == "fisher":
@@ -706,6 +734,88 @@ def parallelize(
     return wrapper
 
 
+def _timed_call(
+    func: Callable[..., Any],
+    args: Tuple[Any, ...],
+    placement: Optional[Callable[[int], ContextManager[Any]]],
+    ix: int,
+) -> Tuple[Any, float]:
+    start = time.perf_counter()
+    with contextlib.nullcontext() if placement is None else placement(ix):
+        res = func(*args)
+    return res, time.perf_counter() - start
+
+
+def run_subproblems(
+    func: Callable[..., Any],
+    tasks: Mapping[Hashable, Tuple[Any, ...]],
+    n_jobs: Optional[int] = None,
+    executor: Optional[concurrent.futures.Executor] = None,
+    placement: Optional[Callable[[int], ContextManager[Any]]] = None,
+    unit: str = "problem",
+    show_progress_bar: bool = True,
+) -> Dict[Hashable, Any]:
+    """Run a function for each subproblem in a pool of workers.
+
+    Parameters
+    ----------
+    func
+        Function to run. For process-based executors, it must be picklable.
+    tasks
+        Positional arguments for ``func``, for each subproblem.
+    n_jobs
+        Number of threads to use if ``executor = None``. If :obj:`None`, use :math:`1` thread.
+        If negative, use all available cores plus ``1 + n_jobs``.
+    executor
+        Executor to which to submit the tasks. If :obj:`None`, use :class:`~concurrent.futures.ThreadPoolExecutor`.
+    placement
+        Function which returns a context manager in which the :math:`i`-th task is run, e.g.,
+        to distribute the tasks across multiple devices.
+    unit
+        Unit of the progress bar.
+    show_progress_bar
+        Whether to show a progress bar.
+
+    Returns
+    -------
+    The results, in the same order as the ``tasks``.
+    """
+    tqdm = None
+    if show_progress_bar:
+        try:
+            from tqdm.auto import tqdm
+        except ImportError:
+            try:
+                from tqdm.std import tqdm
+            except ImportError:
+                tqdm = None
+
+    pool = (
+        concurrent.futures.ThreadPoolExecutor(max_workers=_get_n_cores(n_jobs, len(tasks)))
+        if executor is None
+        else executor
+    )
+    pbar = None if tqdm is None else tqdm(total=len(tasks), unit=unit, mininterval=0.125)
+    res: Dict[Hashable, Any] = {}
+    try:
+        futures = {
+            pool.submit(_timed_call, func, args, placement, ix): key for ix, (key, args) in enumerate(tasks.items())
+        }
+        for future in concurrent.futures.as_completed(futures):
+            key = futures[future]
+            res[key], elapsed = future.result()
+            logger.info(f"Finished {unit} `{key}` in `{elapsed:.2f}s`.")
+            if pbar is not None:
+                pbar.update()
+    finally:
+        if pbar is not None:
+            pbar.close()
+        if executor is None:
+            pool.shutdown(cancel_futures=True)
+
+    return {key: res[key] for key in tasks}
+
+
 def _get_n_cores(n_cores: Optional[int], n_jobs: Optional[int]) -> int:
     """
     Make number of cores a positive integer.
@@ -730,3 +840,82 @@ def _get_n_cores(n_cores: Optional[int], n_jobs: Optional[int]) -> int:
         return multiprocessing.cpu_count() + 1 + n_cores
 
     return n_cores
+
+
+def _iter_row_blocks(adatas: Sequence[AnnData], layer: Optional[str], block_size: int) -> Iterator[ArrayLike]:
+    """Iterate over blocks of rows of the vertically concatenated ``adatas``, without concatenating them."""
+    for adata in adatas:
+        for start in range(0, adata.n_obs, block_size):
+            # only loads the block when `adata` is backed
+            block = adata[start : start + block_size]
+            x = block.X if layer is None else block.layers[layer]
+            yield x.tocsr() if sp.issparse(x) else np.asarray(x, dtype=float)
+
+
+def _randomized_pca(
+    adatas: Sequence[AnnData],
+    *,
+    layer: Optional[str] = None,
+    n_comps: int = 30,
+    block_size: int = 4096,
+    n_oversamples: int = 10,
+    n_iter: int = 4,
+    random_state: Optional[int] = 0,
+) -> ArrayLike:
+    """Compute the :term:`PCA` of the vertically concatenated ``adatas`` using a randomized SVD.
+
+    The data is streamed in blocks of ``block_size`` rows, implicitly centered and never concatenated, so the memory
+    is :math:`O(block\_size \cdot n_{vars} + n_{obs} \cdot (n\_comps + n\_oversamples))`.
+
+    Parameters
+    ----------
+    adatas
+        Annotated data objects, can be backed.
+    layer
+        Layer in :attr:`~anndata.AnnData.layers` to use. If :obj:`None`, use :attr:`~anndata.AnnData.X`.
+    n_comps
+        Number of principal components.
+    block_size
+        Number of rows to process at once.
+    n_oversamples
+        Number of additional random vectors used to approximate the range of the data.
+    n_iter
+        Number of power iterations.
+    random_state
+        Random seed.
+
+    Returns
+    -------
+    The principal components, array of shape ``[n_obs, n_comps]``.
+    """
+    n_obs, n_vars = sum(adata.n_obs for adata in adatas), adatas[0].n_vars
+    blocks = functools.partial(_iter_row_blocks, adatas, layer, block_size)
+
+    mean = np.zeros((n_vars,))
+    for x in blocks():
+        mean += np.asarray(x.sum(axis=0)).ravel()
+    mean /= n_obs
+
+    def matmul(omega: ArrayLike) -> ArrayLike:  # (X - mean) @ omega
+        offset = mean @ omega
+        return np.vstack([x @ omega - offset for x in blocks()])
+
+    def rmatmul(q: ArrayLike) -> ArrayLike:  # (X - mean).T @ q
+        res, start = -np.outer(mean, q.sum(axis=0)), 0
+        for x in blocks():
+            res += x.T @ q[start : start + x.shape[0]]
+            start += x.shape[0]
+        return res
+
+    rng = np.random.RandomState(random_state)
+    n_samples = min(n_comps + n_oversamples, n_obs, n_vars)
+    q, _ = np.linalg.qr(matmul(rng.standard_normal((n_vars, n_samples))))
+    for _ in range(n_iter):
+        z, _ = np.linalg.qr(rmatmul(q))
+        q, _ = np.linalg.qr(matmul(z))
+
+    u, s, _ = np.linalg.svd(rmatmul(q).T, full_matrices=False)
+    u = q @ u[:, :n_comps]
+    # deterministic signs, same as :func:`sklearn.utils.extmath.svd_flip`
+    signs = np.sign(u[np.argmax(np.abs(u), axis=0), np.arange(u.shape[1])])
+    return u * (s[:n_comps] * signs)
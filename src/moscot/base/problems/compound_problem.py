@@ -1,5 +1,11 @@
 import abc
+import concurrent.futures
+import dataclasses
+import functools
+import hashlib
+import operator
 import types
+import weakref
 from typing import (
     TYPE_CHECKING,
     Any,
@@ -18,16 +24,26 @@ from typing import (
     Union,
 )
 
+import numpy as np
+import pandas as pd
 import scipy.sparse as sp
+from scipy.sparse.linalg import LinearOperator
 
 from anndata import AnnData
 
+from moscot import backends
+from moscot._cache import LRUCache
 from moscot._logging import logger
-from moscot._types import ArrayLike, Policy_t, ProblemStage_t
+from moscot._types import ArrayLike, Device_t, Policy_t, ProblemStage_t
 from moscot.base.output import BaseSolverOutput
-from moscot.base.problems._utils import attributedispatch, require_prepare
+from moscot.base.problems._utils import (
+    attributedispatch,
+    require_prepare,
+    run_subproblems,
+)
 from moscot.base.problems.manager import ProblemManager
 from moscot.base.problems.problem import BaseProblem, OTProblem
+from moscot.base.solver import OTSolver
 from moscot.utils.subset_policy import (
     DummyPolicy,
     ExplicitPolicy,
@@ -64,6 +80,7 @@ class BaseCompoundProblem(BaseProblem, abc.ABC, Generic[K, B]):
         super().__init__(**kwargs)
         self._adata = adata
         self._problem_manager: Optional[ProblemManager[K, B]] = None
+        self._transport_cache: Optional[LRUCache[Any]] = None
 
     @abc.abstractmethod
     def _create_problem(self, src: K, tgt: K, src_mask: ArrayLike, tgt_mask: ArrayLike, **kwargs: Any) -> B:
@@ -76,9 +93,9 @@ class BaseCompoundProblem(BaseProblem, abc.ABC, Generic[K, B]):
         tgt
             Target key identifying the subproblem.
         src_mask
-            Source mask used to subset :attr:`adata`.
+            Source mask or sorted indices used to subset :attr:`adata`.
         tgt_mask
-            Target mask used to subset :attr:`adata`.
+            Target mask or sorted indices used to subset :attr:`adata`.
         kwargs
             Additional keyword arguments.
 
@@ -122,12 +139,13 @@ class BaseCompoundProblem(BaseProblem, abc.ABC, Generic[K, B]):
         problem: B,
         *,
         callback: Optional[Union[Literal["local-pca", "spatial-norm", "graph-construction"], Callback_t]] = None,
+        cache: Optional[LRUCache[Any]] = None,
         **kwargs: Any,
     ) -> Optional[TaggedArray]:
         if callback is None:
             return None
         if callback == "local-pca":
-            callback = problem._local_pca_callback
+            return self._local_pca_handler(term, problem, cache=cache, **kwargs)
         if callback == "spatial-norm":
             callback = problem._spatial_norm_callback
         if callback == "graph-construction":
@@ -137,6 +155,48 @@ class BaseCompoundProblem(BaseProblem, abc.ABC, Generic[K, B]):
             raise TypeError("Callback is not a function.")
         return callback(term, problem.adata_src, problem.adata_tgt, **kwargs)
 
+    def _local_pca_handler(
+        self,
+        term: Literal["xy", "x", "y"],
+        problem: B,
+        *,
+        cache: Optional[LRUCache[Any]] = None,
+        global_pca: bool = False,
+        **kwargs: Any,
+    ) -> TaggedArray:
+        if cache is None:
+            cache = LRUCache(maxsize=None)
+        params = _freeze(kwargs)
+        try:
+            hash(params)
+        except TypeError:
+            # unhashable PCA arguments, don't share the embeddings
+            params = object()
+
+        if not global_pca:
+            # `x` and `y` are both embedded using the source data
+            adatas = (problem.adata_src, problem.adata_tgt) if term == "xy" else (problem.adata_src,)
+            key = ("local", term == "xy", tuple(_embedding_key(adata) for adata in adatas), params)
+            data = cache.get(key)
+            if data is None:
+                data = problem._local_pca_callback(term, problem.adata_src, problem.adata_tgt, **kwargs)
+                cache.put(key, data)
+            # the cost is set in-place on the tagged array, only share the data
+            return dataclasses.replace(data)
+
+        key = ("global", id(self.adata), params)
+        embedding = cache.get(key)
+        if embedding is None:
+            embedding = problem._local_pca_callback("x", self.adata, **kwargs).data_src
+            cache.put(key, embedding)
+        src_ixs = self.adata.obs_names.get_indexer(problem.adata_src.obs_names)
+        tgt_ixs = self.adata.obs_names.get_indexer(problem.adata_tgt.obs_names) if term == "xy" else src_ixs
+        if np.any(src_ixs < 0) or np.any(tgt_ixs < 0):
+            raise ValueError("Global PCA requires all subproblems to be subsets of `adata`, use `global_pca=False`.")
+        if term == "xy":
+            return TaggedArray(embedding[src_ixs], embedding[tgt_ixs], tag=Tag.POINT_CLOUD)
+        return TaggedArray(embedding[src_ixs], tag=Tag.POINT_CLOUD)
+
     # TODO(michalk8): refactor me
     def _create_problems(
         self,
@@ -149,50 +209,89 @@ class BaseCompoundProblem(BaseProblem, abc.ABC, Generic[K, B]):
         xy_callback_kwargs: Mapping[str, Any] = types.MappingProxyType({}),
         x_callback_kwargs: Mapping[str, Any] = types.MappingProxyType({}),
         y_callback_kwargs: Mapping[str, Any] = types.MappingProxyType({}),
+        n_jobs: Optional[int] = None,
+        executor: Optional[concurrent.futures.Executor] = None,
         **kwargs: Any,
     ) -> Dict[Tuple[K, K], B]:
-        from moscot.base.problems.birth_death import BirthDeathProblem
-
         if TYPE_CHECKING:
             assert isinstance(self._policy, SubsetPolicy)
 
-        problems: Dict[Tuple[K, K], B] = {}
-        for (src, tgt), (src_mask, tgt_mask) in self._policy.create_masks().items():
+        tasks: Dict[Tuple[K, K], Tuple[K, K, ArrayLike, ArrayLike]] = {}
+        # shared by all subproblems, e.g., to compute the embeddings of each subset only once
+        cache: LRUCache[Any] = LRUCache(maxsize=None)
+        for (src, tgt), (src_mask, tgt_mask) in self._policy.create_masks(return_indices=True).items():
             if isinstance(self._policy, FormatterMixin):
                 src_name = self._policy._format(src, is_source=True)
                 tgt_name = self._policy._format(tgt, is_source=False)
             else:
                 src_name = src
                 tgt_name = tgt
+            tasks[src_name, tgt_name] = (src, tgt, src_mask, tgt_mask)
 
-            problem = self._create_problem(src, tgt, src_mask=src_mask, tgt_mask=tgt_mask)
+        create_problem = functools.partial(
+            self._create_and_prepare_problem,
+            xy=xy,
+            x=x,
+            y=y,
+            xy_callback=xy_callback,
+            x_callback=x_callback,
+            y_callback=y_callback,
+            xy_callback_kwargs=xy_callback_kwargs,
+            x_callback_kwargs=x_callback_kwargs,
+            y_callback_kwargs=y_callback_kwargs,
+            cache=cache,
+            **kwargs,
+        )
+        if n_jobs is None and executor is None:
+            return {key: create_problem(*args) for key, args in tasks.items()}
+        return run_subproblems(create_problem, tasks, n_jobs=n_jobs, executor=executor)  # type: ignore[return-value]
 
-            xy_data = self._callback_handler(
-                term="xy", key_1=src, key_2=tgt, problem=problem, callback=xy_callback, **xy_callback_kwargs
-            )
+    def _create_and_prepare_problem(
+        self,
+        src: K,
+        tgt: K,
+        src_mask: ArrayLike,
+        tgt_mask: ArrayLike,
+        xy: Mapping[str, Any] = types.MappingProxyType({}),
+        x: Mapping[str, Any] = types.MappingProxyType({}),
+        y: Mapping[str, Any] = types.MappingProxyType({}),
+        xy_callback: Optional[Union[Literal["local-pca"], Callback_t]] = None,
+        x_callback: Optional[Union[Literal["local-pca"], Callback_t]] = None,
+        y_callback: Optional[Union[Literal["local-pca"], Callback_t]] = None,
+        xy_callback_kwargs: Mapping[str, Any] = types.MappingProxyType({}),
+        x_callback_kwargs: Mapping[str, Any] = types.MappingProxyType({}),
+        y_callback_kwargs: Mapping[str, Any] = types.MappingProxyType({}),
+        cache: Optional[LRUCache[Any]] = None,
+        **kwargs: Any,
+    ) -> B:
+        from moscot.base.problems.birth_death import BirthDeathProblem
 
-            x_data = self._callback_handler(
-                term="x", key_1=src, key_2=tgt, problem=problem, callback=x_callback, **x_callback_kwargs
-            )
+        problem = self._create_problem(src, tgt, src_mask=src_mask, tgt_mask=tgt_mask)
 
-            y_data = self._callback_handler(
-                term="y", key_1=src, key_2=tgt, problem=problem, callback=y_callback, **y_callback_kwargs
-            )
-            if xy_data:
-                xy = dict(xy)
-                xy["tagged_array"] = xy_data
-            if x_data:
-                x = dict(x)
-                x["tagged_array"] = x_data
-            if y_data:
-                y = dict(y)
-                y["tagged_array"] = y_data
-            if isinstance(problem, BirthDeathProblem):
-                kwargs["proliferation_key"] = self.proliferation_key  # type: ignore[attr-defined]
-                kwargs["apoptosis_key"] = self.apoptosis_key  # type: ignore[attr-defined]
-            problems[src_name, tgt_name] = problem.prepare(xy=xy, x=x, y=y, **kwargs)
-
-        return problems
+        xy_data = self._callback_handler(
+            term="xy", key_1=src, key_2=tgt, problem=problem, callback=xy_callback, cache=cache, **xy_callback_kwargs
+        )
+
+        x_data = self._callback_handler(
+            term="x", key_1=src, key_2=tgt, problem=problem, callback=x_callback, cache=cache, **x_callback_kwargs
+        )
+
+        y_data = self._callback_handler(
+            term="y", key_1=src, key_2=tgt, problem=problem, callback=y_callback, cache=cache, **y_callback_kwargs
+        )
+        if xy_data:
+            xy = dict(xy)
+            xy["tagged_array"] = xy_data
+        if x_data:
+            x = dict(x)
+            x["tagged_array"] = x_data
+        if y_data:
+            y = dict(y)
+            y["tagged_array"] = y_data
+        if isinstance(problem, BirthDeathProblem):
+            kwargs["proliferation_key"] = self.proliferation_key  # type: ignore[attr-defined]
+            kwargs["apoptosis_key"] = self.apoptosis_key  # type: ignore[attr-defined]
+        return problem.prepare(xy=xy, x=x, y=y, **kwargs)
 
     def prepare(
         self,
@@ -206,6 +305,8 @@ class BaseCompoundProblem(BaseProblem, abc.ABC, Generic[K, B]):
         xy_callback_kwargs: Mapping[str, Any] = types.MappingProxyType({}),
         x_callback_kwargs: Mapping[str, Any] = types.MappingProxyType({}),
         y_callback_kwargs: Mapping[str, Any] = types.MappingProxyType({}),
+        n_jobs: Optional[int] = None,
+        executor: Optional[concurrent.futures.Executor] = None,
         **kwargs: Any,
     ) -> "BaseCompoundProblem[K, B]":
         """Prepare the individual :term:`OT` subproblems.
@@ -231,11 +332,19 @@ class BaseCompoundProblem(BaseProblem, abc.ABC, Generic[K, B]):
         y_callback
             Callback function used to prepare the data in the target :term:`quadratic term`.
         xy_callback_kwargs
-            Keyword arguments for the ``xy_callback``.
+            Keyword arguments for the ``xy_callback``. For ``'local-pca'``, the embedding of each subset of
+            :attr:`adata` is computed only once and shared across the subproblems. If ``global_pca = True``,
+            the :term:`PCA` is computed once using all of :attr:`adata` and sliced for each subproblem.
         x_callback_kwargs
             Keyword arguments for the ``x_callback``.
         y_callback_kwargs
             Keyword arguments for the ``y_callback``.
+        n_jobs
+            Number of threads used to prepare the subproblems in parallel. If :obj:`None` and ``executor = None``,
+            prepare them sequentially.
+        executor
+            Executor used to prepare the subproblems in parallel, e.g., a
+            :class:`~concurrent.futures.ProcessPoolExecutor`. If :obj:`None`, use a thread pool.
         kwargs
             Keyword arguments for the subproblems' :meth:`~moscot.base.problems.OTProblem.prepare` method.
 
@@ -270,9 +379,12 @@ class BaseCompoundProblem(BaseProblem, abc.ABC, Generic[K, B]):
             xy_callback_kwargs=xy_callback_kwargs,
             x_callback_kwargs=x_callback_kwargs,
             y_callback_kwargs=y_callback_kwargs,
+            n_jobs=n_jobs,
+            executor=executor,
             **kwargs,
         )
         self._problem_manager.add_problems(problems)
+        self._clear_transport_cache()
 
         # we assume that all subproblems are of the same kind
         for p in self.problems.values():
@@ -284,6 +396,9 @@ class BaseCompoundProblem(BaseProblem, abc.ABC, Generic[K, B]):
     def solve(
         self,
         stage: Union[ProblemStage_t, Tuple[ProblemStage_t, ...]] = ("prepared", "solved"),
+        batched: bool = False,
+        n_jobs: Optional[int] = None,
+        executor: Optional[concurrent.futures.Executor] = None,
         **kwargs: Any,
     ) -> "BaseCompoundProblem[K, B]":
         """Solve the individual :term:`OT` subproblems.
@@ -298,6 +413,18 @@ class BaseCompoundProblem(BaseProblem, abc.ABC, Generic[K, B]):
         ----------
         stage
             Stage by which to filter the :attr:`problems` to be solved.
+        batched
+            Whether to solve subproblems of the same shape at once, using a vectorized solver.
+            This is most useful when there are many small subproblems, e.g., in combination with
+            ``pad_to_bucket``. Low-rank solvers and graph geometries are always solved sequentially.
+        n_jobs
+            Number of threads used to solve the subproblems in parallel. If :obj:`None` and ``executor = None``,
+            solve them sequentially. The subproblems are distributed in a round-robin fashion
+            across the available devices, e.g., the CPU devices created by
+            ``XLA_FLAGS=--xla_force_host_platform_device_count=...``.
+        executor
+            Executor used to solve the subproblems in parallel, e.g., a
+            :class:`~concurrent.futures.ProcessPoolExecutor`. If :obj:`None`, use a thread pool.
         kwargs
             Keyword arguments for the subproblems' :meth:`~moscot.base.problems.OTProblem.solve` method.
 
@@ -318,13 +445,59 @@ class BaseCompoundProblem(BaseProblem, abc.ABC, Generic[K, B]):
             kwargs.pop("min_iterations")
         if "max_iterations" in kwargs and kwargs["max_iterations"] is None:
             kwargs.pop("max_iterations")
-        for problem in problems.values():
-            logger.info(f"Solving problem {problem}.")
-            _ = problem.solve(**kwargs)
+        if batched:
+            self._solve_batched(problems, **kwargs)
+        elif n_jobs is not None or executor is not None:
+            self._solve_parallel(problems, n_jobs=n_jobs, executor=executor, **kwargs)
+        else:
+            for problem in problems.values():
+                logger.info(f"Solving problem {problem}.")
+                _ = problem.solve(**kwargs)
 
+        self._clear_transport_cache()
         self._stage = "solved"
         return self
 
+    def _solve_parallel(
+        self,
+        problems: Mapping[Tuple[K, K], B],
+        n_jobs: Optional[int] = None,
+        executor: Optional[concurrent.futures.Executor] = None,
+        **kwargs: Any,
+    ) -> None:
+        if TYPE_CHECKING:
+            assert isinstance(self._problem_manager, ProblemManager)
+
+        solver_class = backends.get_solver(self.problem_kind, backend=kwargs.get("backend", "ott"), return_class=True)
+        solved = run_subproblems(
+            operator.methodcaller("solve", **kwargs),
+            {key: (problem,) for key, problem in problems.items()},
+            n_jobs=n_jobs,
+            executor=executor,
+            placement=solver_class._placement,
+        )
+        # process-based executors return copies of the subproblems
+        solved = {key: problem for key, problem in solved.items() if problem is not problems[key]}
+        self._problem_manager.add_problems(solved, overwrite=True)  # type: ignore[arg-type]
+
+    @staticmethod
+    def _solve_batched(
+        problems: Mapping[Tuple[K, K], B],
+        backend: Literal["ott"] = "ott",
+        device: Optional[Device_t] = None,
+        **kwargs: Any,
+    ) -> None:
+        solvers, call_kwargs = [], []
+        for problem in problems.values():
+            solver, kws = problem._create_solver(backend=backend, **kwargs)
+            solvers.append(solver)
+            call_kwargs.append(kws)
+
+        solutions = OTSolver._batch_call(solvers, call_kwargs, device=device)
+        for problem, solver, kws, solution in zip(problems.values(), solvers, call_kwargs, solutions):
+            problem._solver = solver
+            problem.set_solution(problem._ensure_converged(solution, device=device, **kws), overwrite=True)
+
     @attributedispatch(attr="_policy")
     def _apply(self, *_args: Any, **_kwargs: Any) -> ApplyOutput_t[K]:
         raise NotImplementedError(type(self._policy))
@@ -373,24 +546,189 @@ class BaseCompoundProblem(BaseProblem, abc.ABC, Generic[K, B]):
         )
         if TYPE_CHECKING:
             assert isinstance(self._policy, OrderedPolicy)
-        (src, tgt), *rest = self._policy.plan(
-            forward=forward,
-            start=source,
-            end=target,
-            explicit_steps=explicit_steps,
-        )
+        steps = [
+            (_src, _tgt)
+            for _src, _tgt in self._policy.plan(
+                forward=forward,
+                start=source,
+                end=target,
+                explicit_steps=explicit_steps,
+            )
+        ]
+        if self._transport_cache is not None:
+            out = self._apply_cached(
+                steps,
+                data=data,
+                forward=forward,
+                scale_by_marginals=scale_by_marginals,
+                return_all=return_all,
+                **kwargs,
+            )
+            if out is not None:
+                return out
+
+        res = self._apply_steps(steps, data=data, forward=forward, scale_by_marginals=scale_by_marginals, **kwargs)
+        _src, _tgt = steps[-1]
+        return res if return_all else res[_tgt if forward else _src]
+
+    def _apply_steps(
+        self,
+        steps: Sequence[Tuple[K, K]],
+        data: Optional[Union[str, ArrayLike]] = None,
+        *,
+        forward: bool,
+        scale_by_marginals: bool,
+        **kwargs: Any,
+    ) -> Dict[K, ArrayLike]:
+        (src, tgt), *_ = steps
         problem = self.problems[src, tgt]
-        adata = problem.adata_src if forward else problem.adata_tgt
-        current_mass = problem._get_mass(adata, data=data, **kwargs)
+        subset = problem._src_subset if forward else problem._tgt_subset
+        current_mass = problem._get_mass(subset, data=data, **kwargs)
         res = {src if forward else tgt: current_mass}
-        for _src, _tgt in [(src, tgt)] + rest:
+        for _src, _tgt in steps:
             problem = self.problems[_src, _tgt]
             fun = problem.push if forward else problem.pull
             res[_tgt if forward else _src] = current_mass = fun(
                 current_mass, scale_by_marginals=scale_by_marginals, **kwargs
             )
+        return res
+
+    def _apply_cached(
+        self,
+        steps: Sequence[Tuple[K, K]],
+        data: Optional[Union[str, ArrayLike]] = None,
+        *,
+        forward: bool,
+        scale_by_marginals: bool,
+        return_all: bool,
+        **kwargs: Any,
+    ) -> Optional[ApplyOutput_t[K]]:
+        solutions = tuple(self.problems[step].solution for step in steps)
+        if any(sol is None for sol in solutions):
+            return None
+
+        steps = tuple(steps)
+        if data is None or isinstance(data, str):
+            # the masses only depend on `adata.obs`, cache all intermediate ones
+            key = ("mass", steps, forward, scale_by_marginals, data, _freeze(kwargs))
+            try:
+                hash(key)
+            except TypeError:
+                return None
+            res = self._from_transport_cache(
+                key,
+                solutions,
+                functools.partial(
+                    self._apply_steps,
+                    steps,
+                    data=data,
+                    forward=forward,
+                    scale_by_marginals=scale_by_marginals,
+                    **kwargs,
+                ),
+            )
+            _src, _tgt = steps[-1]
+            return dict(res) if return_all else res[_tgt if forward else _src]
+        if return_all:
+            return None
 
-        return res if return_all else current_mass
+        key = ("op", steps, forward, scale_by_marginals)
+        composite = self._from_transport_cache(
+            key,
+            solutions,
+            functools.partial(
+                self._composite_operator, solutions, forward=forward, scale_by_marginals=scale_by_marginals
+            ),
+        )
+        if composite is None:
+            return None
+
+        op, inner = composite
+        problem = self.problems[steps[0]]
+        subset = problem._src_subset if forward else problem._tgt_subset
+        mass = problem._get_mass(subset, data=data, **kwargs)
+        res = op.rmatmat(mass) if forward else op.matmat(mass)
+        if inner is not None and kwargs.get("normalize", True):
+            # every step re-normalizes its input, which amounts to dividing by the mass before the last step
+            res = res / np.sum(inner.rmatmat(mass) if forward else inner.matmat(mass), axis=0, keepdims=True)
+        return res
+
+    @staticmethod
+    def _composite_operator(
+        solutions: Sequence[BaseSolverOutput], *, forward: bool, scale_by_marginals: bool
+    ) -> Optional[Tuple[LinearOperator, Optional[LinearOperator]]]:
+        # pushes are applied via `(S_1 ... S_k)^T`, pulls via `S_k ... S_1`
+        first, *rest = solutions if forward else solutions[::-1]
+        op = first.chain(rest, scale_by_marginals=scale_by_marginals)
+        # only the composites precomputed by `chain` expose their size, lazy products don't benefit from caching
+        if not hasattr(op, "nbytes"):
+            return None
+        if len(solutions) == 1:
+            return op, None
+        # composite of all but the last step
+        if forward:
+            inner = first.chain(rest[:-1], scale_by_marginals=scale_by_marginals)
+        else:
+            inner = rest[0].chain(rest[1:], scale_by_marginals=scale_by_marginals)
+        return op, inner
+
+    def _from_transport_cache(
+        self, key: Hashable, solutions: Sequence[BaseSolverOutput], compute: Callable[[], Any]
+    ) -> Any:
+        if TYPE_CHECKING:
+            assert isinstance(self._transport_cache, LRUCache)
+        entry = self._transport_cache.get(key)
+        # the entries are only valid for the solutions they were computed from
+        if entry is not None and all(ref() is sol for ref, sol in zip(entry[0], solutions)):
+            return entry[1]
+
+        value = compute()
+        if value is not None:
+            self._transport_cache.put(key, (tuple(weakref.ref(sol) for sol in solutions), value))
+        return value
+
+    def enable_transport_cache(self, max_bytes: int = 1 << 30) -> "BaseCompoundProblem[K, B]":
+        """Cache the results of :meth:`push` and :meth:`pull` along multiple :attr:`problems`.
+
+        Only used by the :class:`~moscot.utils.subset_policy.ExplicitPolicy` and
+        :class:`~moscot.utils.subset_policy.OrderedPolicy`. If ``data`` is a key in :attr:`adata.obs <adata>`
+        or :obj:`None`, all intermediate masses are cached. Otherwise, the composite transport operators are cached
+        if the :attr:`solutions` can be precomputed by :meth:`~moscot.base.output.BaseSolverOutput.chain`,
+        e.g., :term:`low-rank` or :class:`~moscot.base.output.TopKSolverOutput` solutions.
+
+        The cache is invalidated when the :attr:`problems` are prepared, solved, added or removed,
+        or when a subproblem's :attr:`~moscot.base.problems.OTProblem.solution` changes.
+        Modifications of :attr:`adata` are not tracked.
+
+        Parameters
+        ----------
+        max_bytes
+            Memory budget of the cache in bytes. The least recently used entries are evicted first.
+
+        Returns
+        -------
+        Self and updates the following fields:
+
+        - :attr:`transport_cache` - the cache.
+        """
+        self._transport_cache = LRUCache(maxsize=None, max_bytes=max_bytes, sizeof=_nbytes)
+        return self
+
+    def disable_transport_cache(self) -> "BaseCompoundProblem[K, B]":
+        """Disable the cache enabled by :meth:`enable_transport_cache`.
+
+        Returns
+        -------
+        Self and updates the following fields:
+
+        - :attr:`transport_cache` - set to :obj:`None`.
+        """
+        self._transport_cache = None
+        return self
+
+    def _clear_transport_cache(self) -> None:
+        if self._transport_cache is not None:
+            self._transport_cache.clear()
 
     # TODO(michalk8): better description of `source/target` (also in other places).
     def push(self, *args: Any, **kwargs: Any) -> ApplyOutput_t[K]:
@@ -456,6 +794,7 @@ class BaseCompoundProblem(BaseProblem, abc.ABC, Generic[K, B]):
         if TYPE_CHECKING:
             assert isinstance(self._problem_manager, ProblemManager)
         self._problem_manager.add_problem(key, problem, overwrite=overwrite, **kwargs)
+        self._clear_transport_cache()
         return self
 
     @require_prepare
@@ -479,6 +818,7 @@ class BaseCompoundProblem(BaseProblem, abc.ABC, Generic[K, B]):
         if TYPE_CHECKING:
             assert isinstance(self._problem_manager, ProblemManager)
         self._problem_manager.remove_problem(key)
+        self._clear_transport_cache()
         return self
 
     @property
@@ -493,6 +833,11 @@ class BaseCompoundProblem(BaseProblem, abc.ABC, Generic[K, B]):
         """Annotated data object."""
         return self._adata
 
+    @property
+    def transport_cache(self) -> Optional[LRUCache[Any]]:
+        """Cache of :meth:`push` and :meth:`pull`, see :meth:`enable_transport_cache`."""
+        return self._transport_cache
+
     @property
     def _policy(self) -> Optional[SubsetPolicy[K]]:
         if self._problem_manager is None:
@@ -563,12 +908,13 @@ class CompoundProblem(BaseCompoundProblem[K, B], abc.ABC):
         problem: B,
         *,
         callback: Optional[Union[Literal["local-pca", "cost-matrix"], Callback_t]] = None,
+        cache: Optional[LRUCache[Any]] = None,
         **kwargs: Any,
     ) -> Optional[TaggedArray]:
         if callback == "cost-matrix":
             return self._cost_matrix_callback(term=term, key_1=key_1, key_2=key_2, **kwargs)
         return super()._callback_handler(
-            term=term, key_1=key_1, key_2=key_2, problem=problem, callback=callback, **kwargs
+            term=term, key_1=key_1, key_2=key_2, problem=problem, callback=callback, cache=cache, **kwargs
         )
 
     def _cost_matrix_callback(
@@ -582,24 +928,47 @@ class CompoundProblem(BaseCompoundProblem[K, B], abc.ABC):
         except KeyError:
             raise KeyError(f"Unable to fetch data from `adata.obsp[{key!r}]`.") from None
 
-        mask = self._policy.create_mask(key_1, allow_empty=False)
+        ixs = self._policy.create_indices(key_1, allow_empty=False)
 
         if term == "xy":
             if key_2 is None:
                 raise ValueError("If `term` is `xy`, `key_2` cannot be `None`.")
-            mask_2 = self._policy.create_mask(key_2, allow_empty=False)
+            ixs_2 = self._policy.create_indices(key_2, allow_empty=False)
 
-            linear_cost_matrix = data[mask, :][:, mask_2]
+            linear_cost_matrix = data[ixs, :][:, ixs_2]
             if sp.issparse(linear_cost_matrix):
                 logger.warning("Linear cost matrix being densified.")
                 linear_cost_matrix = linear_cost_matrix.A
             return TaggedArray(linear_cost_matrix, tag=Tag.COST_MATRIX)
 
         if term in ("x", "y"):
-            quad_cost_matrix = data[mask, :][:, mask]
+            quad_cost_matrix = data[ixs, :][:, ixs]
             if sp.issparse(quad_cost_matrix):
                 logger.warning("Quadratic cost matrix being densified.")
                 quad_cost_matrix = quad_cost_matrix.A
             return TaggedArray(quad_cost_matrix, tag=Tag.COST_MATRIX)
 
         raise ValueError(f"Expected `term` to be one of `x`, `y`, or `xy`, found `{term!r}`.")
+
+
+def _freeze(obj: Any) -> Any:
+    if isinstance(obj, Mapping):
+        return tuple(sorted((k, _freeze(v)) for k, v in obj.items()))
+    if isinstance(obj, (list, tuple)):
+        return tuple(_freeze(v) for v in obj)
+    return obj
+
+
+def _nbytes(obj: Any) -> int:
+    if isinstance(obj, Mapping):
+        return sum(_nbytes(v) for v in obj.values())
+    if isinstance(obj, (list, tuple)):
+        return sum(_nbytes(v) for v in obj)
+    return int(getattr(obj, "nbytes", 0))
+
+
+def _embedding_key(adata: AnnData) -> Tuple[int, str]:
+    # views share the parent object, which is alive while the subproblems are being prepared
+    parent = adata._adata_ref if adata.is_view else adata
+    digest = hashlib.sha1(pd.util.hash_pandas_object(adata.obs_names, index=False).to_numpy()).hexdigest()
+    return id(parent), digest
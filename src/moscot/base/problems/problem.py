@@ -27,12 +27,14 @@ from anndata import AnnData
 
 from moscot import backends
 from moscot._logging import logger
-from moscot._types import ArrayLike, CostFn_t, Device_t, ProblemKind_t
+from moscot._types import ArrayLike, CostFn_t, Device_t, Precision_t, ProblemKind_t
 from moscot.base.output import BaseSolverOutput, MatrixSolverOutput
+from moscot.base.problems._subset import AnnDataSubset
 from moscot.base.problems._utils import (
     TimeScalesHeatKernel,
     _assert_columns_and_index_match,
     _assert_series_match,
+    _randomized_pca,
     require_solution,
     wrap_prepare,
     wrap_solve,
@@ -134,7 +136,7 @@ class BaseProblem(abc.ABC):
 
     @staticmethod
     def _get_mass(
-        adata: AnnData,
+        adata: Union[AnnData, AnnDataSubset],
         data: Optional[Union[str, ArrayLike]] = None,
         subset: Optional[Union[str, List[str], Tuple[int, int]]] = None,
         normalize: bool = True,
@@ -209,9 +211,9 @@ class OTProblem(BaseProblem):
     adata_tgt
         Target annotated data object. If :obj:`None`, use ``adata``.
     src_obs_mask
-        Source observation mask that defines :attr:`adata_src`.
+        Source observation mask or indices that define :attr:`adata_src`.
     tgt_obs_mask
-        Target observation mask that defines :attr:`adata_tgt`.
+        Target observation mask or indices that define :attr:`adata_tgt`.
     src_var_mask
         Source variable mask that defines :attr:`adata_src`.
     tgt_var_mask
@@ -246,6 +248,9 @@ class OTProblem(BaseProblem):
         self._tgt_var_mask = tgt_var_mask
         self._src_key = src_key
         self._tgt_key = tgt_key
+        # index-based subsets which avoid creating `AnnData` views when only accessing the observations
+        self._src_subset = AnnDataSubset(self._adata_src, src_obs_mask, src_var_mask)
+        self._tgt_subset = AnnDataSubset(self._adata_tgt, tgt_obs_mask, tgt_var_mask)
 
         self._solver: Optional[OTSolver[BaseSolverOutput]] = None
         self._solution: Optional[BaseSolverOutput] = None
@@ -370,8 +375,8 @@ class OTProblem(BaseProblem):
         else:
             raise ValueError("Unable to prepare the data. Either only supply `xy=...`, or `x=..., y=...`, or all.")
         # fmt: on
-        self._a = self._create_marginals(self.adata_src, data=a, source=True, **kwargs)
-        self._b = self._create_marginals(self.adata_tgt, data=b, source=False, **kwargs)
+        self._a = self._create_marginals(self._src_subset, data=a, source=True, **kwargs)
+        self._b = self._create_marginals(self._tgt_subset, data=b, source=False, **kwargs)
         return self
 
     @wrap_solve
@@ -379,6 +384,8 @@ class OTProblem(BaseProblem):
         self,
         backend: Literal["ott"] = "ott",
         device: Optional[Device_t] = None,
+        warm_start: bool = False,
+        precision: Optional[Precision_t] = None,
         **kwargs: Any,
     ) -> "OTProblem":
         """Solve the :term:`OT` problem.
@@ -390,6 +397,16 @@ class OTProblem(BaseProblem):
         device
             Transfer the solution to a different device, see :meth:`~moscot.base.output.BaseSolverOutput.to`.
             If :obj:`None`, keep the output on the original device.
+        warm_start
+            Whether to initialize the solver from the current :attr:`solution`, if present. The :term:`Sinkhorn`
+            solver is initialized from the dual potentials, the :term:`GW <Gromov-Wasserstein>` solver from the
+            :term:`transport matrix` and the low-rank solvers from the low-rank factors. Useful when re-solving
+            the problem with slightly different parameters, e.g., ``epsilon`` or ``tau_a``.
+        precision
+            Floating point precision of the point clouds, cost/kernel matrices, graphs and marginals.
+            If :obj:`None`, use the precision of the data. Using ``'float32'`` for ``float64`` data halves
+            the memory they occupy. If the solver does not converge, the problem is solved again
+            using the precision of the data.
         kwargs
             Keyword arguments for :class:`~moscot.base.solver.BaseSolver` or its
             :meth:`__call__ <moscot.base.solver.BaseSolver.__call__>` method.
@@ -401,6 +418,27 @@ class OTProblem(BaseProblem):
         - :attr:`solver` - the :term:`OT` solver.
         - :attr:`solution` - the :term:`OT` solution.
         """
+        self._solver, call_kwargs = self._create_solver(
+            backend=backend, warm_start=warm_start, precision=precision, **kwargs
+        )
+        solution = self._solver(device=device, **call_kwargs)  # type: ignore[misc]
+        self._solution = self._ensure_converged(solution, device=device, **call_kwargs)
+        return self
+
+    def _ensure_converged(
+        self, solution: BaseSolverOutput, device: Optional[Device_t] = None, **call_kwargs: Any
+    ) -> BaseSolverOutput:
+        """Solve the problem again in full precision if the reduced ``precision`` did not converge."""
+        precision = call_kwargs.get("precision")
+        if precision is None or solution.converged:
+            return solution
+        logger.warning(f"Solver did not converge with `precision={precision!r}`, solving again in full precision")
+        return self._solver(device=device, **{**call_kwargs, "precision": None})  # type: ignore[misc]
+
+    def _create_solver(
+        self, backend: Literal["ott"] = "ott", warm_start: bool = False, **kwargs: Any
+    ) -> Tuple[OTSolver[BaseSolverOutput], Dict[str, Any]]:
+        """Instantiate the solver and collect the keyword arguments for its :meth:`__call__`."""
         solver_class = backends.get_solver(self.problem_kind, backend=backend, return_class=True)
         init_kwargs, call_kwargs = solver_class._partition_kwargs(**kwargs)
         # if linear problem, then alpha is 0.0 by default
@@ -420,19 +458,19 @@ class OTProblem(BaseProblem):
             if alpha == 1.0 and self.xy is not None:
                 raise ValueError("Unable to solve a quadratic problem with `alpha = 1` and `xy` supplied.")
 
-        self._solver = solver_class(**init_kwargs)
-
-        self._solution = self._solver(  # type: ignore[misc]
-            xy=self._xy,
-            x=self._x,
-            y=self._y,
-            a=self.a,
-            b=self.b,
-            device=device,
-            time_scales_heat_kernel=self._time_scales_heat_kernel,
+        solver = solver_class(**init_kwargs)
+        call_kwargs = {
+            "xy": self._xy,
+            "x": self._x,
+            "y": self._y,
+            "a": self.a,
+            "b": self.b,
+            "time_scales_heat_kernel": self._time_scales_heat_kernel,
             **call_kwargs,
-        )
-        return self
+        }
+        if warm_start and self.solution is not None:
+            call_kwargs["init"] = self.solution
+        return solver, call_kwargs
 
     @require_solution
     def push(
@@ -475,7 +513,7 @@ class OTProblem(BaseProblem):
         """
         if TYPE_CHECKING:
             assert isinstance(self.solution, BaseSolverOutput)
-        data = self._get_mass(self.adata_src, data=data, subset=subset, normalize=normalize, split_mass=split_mass)
+        data = self._get_mass(self._src_subset, data=data, subset=subset, normalize=normalize, split_mass=split_mass)
         return self.solution.push(data, scale_by_marginals=scale_by_marginals)
 
     @require_solution
@@ -519,7 +557,7 @@ class OTProblem(BaseProblem):
         """
         if TYPE_CHECKING:
             assert isinstance(self.solution, BaseSolverOutput)
-        data = self._get_mass(self.adata_tgt, data=data, subset=subset, normalize=normalize, split_mass=split_mass)
+        data = self._get_mass(self._tgt_subset, data=data, subset=subset, normalize=normalize, split_mass=split_mass)
         return self.solution.pull(data, scale_by_marginals=scale_by_marginals)
 
     def set_solution(
@@ -570,6 +608,7 @@ class OTProblem(BaseProblem):
         layer: Optional[str] = None,
         n_comps: int = 30,
         scale: bool = False,
+        block_size: Optional[int] = None,
         **kwargs: Any,
     ) -> TaggedArray:
         def concat(x: ArrayLike, y: ArrayLike) -> ArrayLike:
@@ -579,6 +618,24 @@ class OTProblem(BaseProblem):
                 return sp.vstack([sp.csr_matrix(x), y])
             return np.vstack([x, y])
 
+        if block_size is not None and adata.n_vars > n_comps:
+            # stream the data, e.g., when `adata` is backed, instead of concatenating it in memory
+            if term == "xy" and adata_y is None:
+                raise ValueError("When `term` is `xy` `adata_y` cannot be `None`.")
+            if term not in ("x", "y", "xy"):
+                raise ValueError(f"Expected `term` to be one of `x`, `y`, or `xy`, found `{term!r}`.")
+            adatas = [adata, adata_y] if term == "xy" else [adata]
+            msg = "adata.X" if layer is None else f"adata.layers[{layer!r}]"
+            logger.info(f"Computing randomized pca with `n_comps={n_comps}` for `{term}` using `{msg}`")
+            data = _randomized_pca(
+                adatas, layer=layer, n_comps=n_comps, block_size=block_size, **kwargs  # type: ignore[arg-type]
+            )
+            if scale:
+                data = StandardScaler().fit_transform(data)
+            if term == "xy":
+                return TaggedArray(data[: adata.n_obs], data[adata.n_obs :], tag=Tag.POINT_CLOUD)
+            return TaggedArray(data, tag=Tag.POINT_CLOUD)
+
         if layer is None:
             x, y, msg = adata.X, adata_y.X if adata_y is not None else None, "adata.X"
         else:
@@ -664,7 +721,7 @@ class OTProblem(BaseProblem):
 
     def _create_marginals(
         self,
-        adata: AnnData,
+        adata: Union[AnnData, AnnDataSubset],
         *,
         source: bool,
         data: Optional[Union[bool, str, ArrayLike]] = None,
@@ -672,6 +729,7 @@ class OTProblem(BaseProblem):
         **kwargs: Any,
     ) -> ArrayLike:
         if data is True:
+            adata = adata.to_adata() if isinstance(adata, AnnDataSubset) else adata
             marginals = self.estimate_marginals(adata, source=source, **marginal_kwargs, **kwargs)
         elif data is False or data is None:
             marginals = np.ones((adata.n_obs,), dtype=float) / adata.n_obs
@@ -974,7 +1032,7 @@ class OTProblem(BaseProblem):
     @property
     def shape(self) -> Tuple[int, int]:
         """Shape of the :term:`OT` problem."""
-        return self.adata_src.n_obs, self.adata_tgt.n_obs
+        return self._src_subset.n_obs, self._tgt_subset.n_obs
 
     @property
     def solution(self) -> Optional[BaseSolverOutput]:
@@ -1,13 +1,19 @@
 import abc
+import collections
+import contextlib
 import types
 from typing import (
     Any,
+    ContextManager,
     Dict,
     Generic,
+    Hashable,
+    List,
     Literal,
     Mapping,
     NamedTuple,
     Optional,
+    Sequence,
     Set,
     Tuple,
     TypeVar,
@@ -137,6 +143,52 @@ class BaseSolver(Generic[O], abc.ABC):
         data = self._prepare(**kwargs)
         return self._solve(data)
 
+    def _batch_key(self, data: Any) -> Optional[Hashable]:
+        """Get the key identifying which prepared problems can be solved together by :meth:`_solve_batch`.
+
+        Parameters
+        ----------
+        data
+            Object returned by :meth:`_prepare`.
+
+        Returns
+        -------
+        The key or :obj:`None` if the problem cannot be batched.
+        """
+        return None
+
+    @classmethod
+    def _solve_batch(cls, solvers: Sequence["BaseSolver[O]"], data: Sequence[Any]) -> List[O]:
+        """Solve multiple problems with the same :meth:`_batch_key` at once.
+
+        Parameters
+        ----------
+        solvers
+            Solvers which prepared the ``data``.
+        data
+            Objects returned by the solvers' :meth:`_prepare`.
+
+        Returns
+        -------
+        The outputs, in the same order as the ``data``.
+        """
+        return [solver._solve(d) for solver, d in zip(solvers, data)]
+
+    @classmethod
+    def _placement(cls, ix: int) -> ContextManager[Any]:
+        """Get the context in which to run the ``ix``-th of multiple problems solved in parallel.
+
+        Parameters
+        ----------
+        ix
+            Index of the problem.
+
+        Returns
+        -------
+        The context manager.
+        """
+        return contextlib.nullcontext()
+
     @classmethod
     @abc.abstractmethod
     def _call_kwargs(cls) -> Tuple[Set[str], Set[str]]:
@@ -197,9 +249,60 @@ class OTSolver(TagConverter, BaseSolver[O], abc.ABC):
         -------
         The optimal transport solution.
         """
+        data = self._prepare_call(xy=xy, x=x, y=y, tags=tags, **kwargs)
+        return self._finalize(self._solve(data), device=device)
+
+    @classmethod
+    def _batch_call(
+        cls,
+        solvers: Sequence["OTSolver[O]"],
+        kwargs: Sequence[Mapping[str, Any]],
+        device: Optional[Device_t] = None,
+    ) -> List[O]:
+        """Solve multiple optimal transport problems, batching together those with the same :meth:`_batch_key`.
+
+        Parameters
+        ----------
+        solvers
+            Solvers, one for each problem.
+        kwargs
+            Keyword arguments for each solver's :meth:`__call__`.
+        device
+            Device to transfer the outputs to, see :meth:`~moscot.base.output.BaseSolverOutput.to`.
+
+        Returns
+        -------
+        The optimal transport solutions, in the same order as the ``solvers``.
+        """
+        data = [solver._prepare_call(**kws) for solver, kws in zip(solvers, kwargs)]
+        groups: Dict[Hashable, List[int]] = collections.defaultdict(list)
+        for i, (solver, d) in enumerate(zip(solvers, data)):
+            key = solver._batch_key(d)
+            groups[("unbatched", i) if key is None else key].append(i)
+
+        res: List[Optional[O]] = [None] * len(solvers)
+        for ixs in groups.values():
+            if len(ixs) > 1:
+                logger.info(f"Solving `{len(ixs)}` problems in a batch")
+            solver_class = type(solvers[ixs[0]])
+            outputs = solver_class._solve_batch([solvers[i] for i in ixs], [data[i] for i in ixs])
+            for i, out in zip(ixs, outputs):
+                res[i] = solvers[i]._finalize(out, device=device)
+        return res  # type: ignore[return-value]
+
+    def _prepare_call(
+        self,
+        xy: Optional[Union[TaggedArray, ArrayLike, Tuple[ArrayLike, ArrayLike]]] = None,
+        x: Optional[Union[TaggedArray, ArrayLike]] = None,
+        y: Optional[Union[TaggedArray, ArrayLike]] = None,
+        tags: Mapping[Literal["x", "y", "xy"], Tag] = types.MappingProxyType({}),
+        **kwargs: Any,
+    ) -> Any:
         data = self._get_array_data(xy=xy, x=x, y=y, tags=tags)
-        kwargs = {**kwargs, **self._untag(data)}
-        res = super().__call__(**kwargs)
+        return self._prepare(**{**kwargs, **self._untag(data)})
+
+    @staticmethod
+    def _finalize(res: O, device: Optional[Device_t] = None) -> O:
         if not res.converged:
             logger.warning("Solver did not converge")
         return res.to(device=device)  # type: ignore[return-value]
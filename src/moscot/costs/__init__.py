@@ -1,4 +1,13 @@
+from moscot.costs._cache import CostCache, cost_cache
 from moscot.costs._costs import BarcodeDistance, LeafDistance
 from moscot.costs._utils import get_available_costs, get_cost, register_cost
 
-__all__ = ["LeafDistance", "BarcodeDistance", "get_cost", "register_cost", "get_available_costs"]
+__all__ = [
+    "LeafDistance",
+    "BarcodeDistance",
+    "get_cost",
+    "register_cost",
+    "get_available_costs",
+    "CostCache",
+    "cost_cache",
+]
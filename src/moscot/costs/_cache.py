@@ -0,0 +1,146 @@
+import hashlib
+import operator
+import os
+import pickle
+import tempfile
+from typing import Any, Optional
+
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+
+from anndata import AnnData
+
+from moscot._cache import LRUCache
+from moscot._logging import logger
+from moscot._types import ArrayLike, PathLike  # type: ignore[attr-defined]
+
+__all__ = ["CostCache", "cost_cache"]
+
+
+class CostCache:
+    """Cache of the cost matrices computed by the :mod:`moscot` costs.
+
+    The cost matrices are addressed by the content they are computed from, i.e., the name of the cost,
+    the observations, the data in :class:`~anndata.AnnData` and the keyword arguments. They are kept in memory
+    and, if :attr:`directory` is specified, also stored as ``.npy`` files which are memory-mapped when loaded,
+    e.g., to be reused by later sessions.
+
+    Parameters
+    ----------
+    max_bytes
+        Memory budget of the in-memory cache in bytes. The least recently used cost matrices are evicted first.
+    directory
+        Directory where to store the cost matrices. If :obj:`None`, only use the in-memory cache.
+    """
+
+    def __init__(self, max_bytes: int = 1 << 30, directory: Optional[PathLike] = None):
+        sizeof = operator.attrgetter("nbytes")
+        self._memory: LRUCache[ArrayLike] = LRUCache(maxsize=None, max_bytes=max_bytes, sizeof=sizeof)
+        self.directory = directory
+        self.enabled = True
+
+    def key(self, adata: AnnData, **kwargs: Any) -> Optional[str]:
+        """Compute the key of a cost matrix.
+
+        Parameters
+        ----------
+        adata
+            Annotated data object.
+        kwargs
+            Specification of the cost, e.g., the name, ``attr``, ``key`` and the keyword arguments of the cost.
+            The data in :attr:`adata.{attr}[{key}] <anndata.AnnData>` is also hashed.
+
+        Returns
+        -------
+        The key or :obj:`None`, if the cache is disabled or the specification cannot be hashed.
+        """
+        if not self.enabled:
+            return None
+
+        digest = hashlib.sha256()
+        try:
+            digest.update(pickle.dumps(sorted(kwargs.items(), key=operator.itemgetter(0))))
+            _update(digest, adata.obs_names)
+            attr, key = kwargs.get("attr"), kwargs.get("key")
+            if attr is not None:
+                data = getattr(adata, attr)
+                _update(digest, data if key is None else data[key])
+        except Exception as e:  # noqa: BLE001
+            logger.debug(f"Unable to hash the cost, reason: `{e}`.")
+            return None
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[ArrayLike]:
+        """Get the cost matrix stored under ``key``, or :obj:`None` if not present."""
+        arr = self._memory.get(key)
+        if arr is not None or self.directory is None:
+            return arr
+
+        path = self._path(key)
+        if not os.path.isfile(path):
+            return None
+        logger.info(f"Loading cost matrix from `{path}`")
+        arr = np.load(path, mmap_mode="r")
+        self._memory.put(key, arr)
+        return arr
+
+    def put(self, key: str, arr: ArrayLike) -> None:
+        """Store the cost matrix ``arr`` under ``key``."""
+        arr = np.asarray(arr)
+        arr.setflags(write=False)  # shared between the subproblems
+        self._memory.put(key, arr)
+        if self.directory is None:
+            return
+
+        os.makedirs(self.directory, exist_ok=True)
+        # write to a temporary file first, so that concurrent readers never see a partial file
+        fd, tmp = tempfile.mkstemp(suffix=".npy", dir=self.directory)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                np.save(f, arr)
+            os.replace(tmp, self._path(key))
+        except BaseException:
+            os.remove(tmp)
+            raise
+
+    def clear(self, disk: bool = False) -> None:
+        """Remove all cost matrices from memory and, if ``disk = True``, from the :attr:`directory`."""
+        self._memory.clear()
+        if disk and self.directory is not None and os.path.isdir(self.directory):
+            for fname in os.listdir(self.directory):
+                if fname.startswith(_PREFIX) and fname.endswith(".npy"):
+                    os.remove(os.path.join(self.directory, fname))
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{_PREFIX}{key}.npy")  # type: ignore[arg-type]
+
+    @property
+    def memory(self) -> LRUCache[ArrayLike]:
+        """In-memory cache."""
+        return self._memory
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}[memory={self.memory!r}, directory={self.directory!r}]"
+
+
+_PREFIX = "cost-"
+
+
+def _update(digest: "hashlib._Hash", obj: Any) -> None:
+    if isinstance(obj, (pd.Index, pd.Series, pd.DataFrame)):
+        digest.update(pd.util.hash_pandas_object(obj).to_numpy().tobytes())
+    elif sp.issparse(obj):
+        obj = obj.tocsr()
+        for arr in (obj.data, obj.indices, obj.indptr):
+            _update(digest, arr)
+    elif isinstance(obj, np.ndarray):
+        digest.update(pickle.dumps((obj.shape, obj.dtype.str)))
+        digest.update(np.ascontiguousarray(obj).tobytes())
+    else:
+        digest.update(pickle.dumps(obj))
+
+
+#: Process-wide cache of the cost matrices computed by :meth:`~moscot.utils.tagged_array.TaggedArray.from_adata`.
+#: Set its ``directory`` to persist the cost matrices across sessions, or ``enabled = False`` to disable it.
+cost_cache = CostCache()
@@ -1,4 +1,6 @@
-from typing import Any, Callable, Dict, List, Mapping, Optional, Union
+import concurrent.futures
+import os
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence, Tuple, Union
 
 import networkx as nx
 import numpy as np
@@ -6,7 +8,7 @@ import numpy as np
 from anndata import AnnData
 
 from moscot._logging import logger
-from moscot._types import ArrayLike
+from moscot._types import ArrayLike, DTypeLike
 from moscot.base.cost import BaseCost
 from moscot.costs._utils import register_cost
 
@@ -21,6 +23,9 @@ class BarcodeDistance(BaseCost):
         - See :doc:`../notebooks/examples/problems/700_barcode_distance` on how to use this cost
           in the :class:`~moscot.problems.time.LineageProblem`.
 
+    The distances are computed for tiles of ``batch_size`` cells at once, optionally using ``n_jobs`` threads,
+    and stored with the given ``dtype``. These options can be passed when calling the cost.
+
     Parameters
     ----------
     adata
@@ -41,18 +46,38 @@ class BarcodeDistance(BaseCost):
     def _compute(
         self,
         *_: Any,
+        batch_size: int = 256,
+        dtype: DTypeLike = np.float64,
+        n_jobs: Optional[int] = None,
         **__: Any,
     ) -> ArrayLike:
         logger.info("Computing barcode distance")
         n_cells = self.barcodes.shape[0]
+        barcodes = np.ascontiguousarray(self.barcodes.T)  # iterate over the sites
+        distances = np.zeros((n_cells, n_cells), dtype=dtype)
+
+        def fill(start: int) -> None:
+            # tiles only cover the upper triangle and don't overlap, the lower one is mirrored
+            stop = min(start + batch_size, n_cells)
+            n_diffs, n_shared = _scaled_hamming_counts(barcodes[:, start:stop], barcodes[:, start:])
+            # the distance of a cell to itself is always 0
+            ixs = np.arange(stop - start)
+            n_shared[ixs, ixs] = np.maximum(n_shared[ixs, ixs], 1)
+            if not np.all(n_shared):
+                raise ValueError("No shared indices.")
+            dists = n_diffs / n_shared
+            distances[start:stop, start:] = dists
+            distances[start:, start:stop] = dists.T
 
-        # TODO(michalk8): use numba
-        distances = np.zeros((n_cells, n_cells))
-        for i in range(n_cells):
-            distances[i, i + 1 :] = [
-                _scaled_hamming_dist(self.barcodes[i, :], self.barcodes[j, :]) for j in range(i + 1, n_cells)
-            ]
-        return distances + distances.T
+        starts = range(0, n_cells, batch_size)
+        if n_jobs is None or n_jobs == 1:
+            for start in starts:
+                fill(start)
+        else:
+            n_workers = (os.cpu_count() or 1) + 1 + n_jobs if n_jobs < 0 else n_jobs
+            with concurrent.futures.ThreadPoolExecutor(max_workers=max(n_workers, 1)) as executor:
+                _ = list(executor.map(fill, starts))
+        return distances
 
     @property
     def barcodes(self) -> ArrayLike:
@@ -71,6 +96,12 @@ class LeafDistance(BaseCost):
         - See :doc:`../notebooks/examples/problems/600_leaf_distance` on how to use this cost
           in the :class:`~moscot.problems.time.LineageProblem`.
 
+    If the :attr:`tree` is a tree, the distances are computed using the depths of the leaves and of their
+    `lowest common ancestors <https://en.wikipedia.org/wiki/Lowest_common_ancestor>`_. Otherwise, or when passing
+    keyword arguments for :func:`~networkx.algorithms.shortest_paths.weighted.multi_source_dijkstra`,
+    the shortest paths from each leaf are computed. When calling the cost, ``rows`` and ``cols`` can be passed
+    to only compute the distances between these leaves.
+
     Parameters
     ----------
     adata
@@ -100,17 +131,30 @@ class LeafDistance(BaseCost):
 
     def _compute(
         self,
+        rows: Optional[Sequence[Any]] = None,
+        cols: Optional[Sequence[Any]] = None,
         **kwargs: Any,
     ) -> ArrayLike:
         logger.info("Computing tree distance")
         undirected_tree = self.tree.to_undirected()
-        leaves = self._get_leaves()
-        distances = np.zeros((len(leaves), len(leaves)), dtype=float)
+        if rows is None or cols is None:
+            leaves = self._get_leaves()
+            rows = leaves if rows is None else rows
+            cols = leaves if cols is None else cols
 
-        for i, leaf in enumerate(leaves):
-            # TODO(@MUCDK): more efficient, problem: `target`in `multi_source_dijkstra` cannot be chosen as a subset
+        if (
+            not kwargs
+            and isinstance(self._weight, str)
+            and not undirected_tree.is_multigraph()
+            and len(undirected_tree)
+            and nx.is_tree(undirected_tree)
+        ):
+            return _tree_distances(undirected_tree, rows, cols, weight=self._weight)
+
+        distances = np.zeros((len(rows), len(cols)), dtype=float)
+        for i, leaf in enumerate(rows):
             dist, _ = nx.multi_source_dijkstra(undirected_tree, [leaf], weight=self._weight, **kwargs)
-            distances[i, :] = [dist.get(leaf) for leaf in leaves]
+            distances[i, :] = [dist.get(leaf) for leaf in cols]
 
         return distances
 
@@ -142,3 +186,71 @@ def _scaled_hamming_dist(x: ArrayLike, y: ArrayLike) -> float:
     double_scars = differences & (b1 != 0) & (b2 != 0)
 
     return (np.sum(differences) + np.sum(double_scars)) / len(b1)
+
+
+def _scaled_hamming_counts(x: ArrayLike, y: ArrayLike) -> Tuple[ArrayLike, ArrayLike]:
+    # vectorized version of `_scaled_hamming_dist` between all cells, `x` and `y` are of shape `[n_sites, n_cells]`
+    # returns the number of differences (double scars count twice) and the number of shared sites
+    n_diffs = np.zeros((x.shape[1], y.shape[1]), dtype=np.int32)
+    n_shared = np.zeros_like(n_diffs)
+    for b1, b2 in zip(x[:, :, None], y[:, None, :]):
+        shared = (b1 >= 0) & (b2 >= 0)
+        differences = shared & (b1 != b2)
+        n_shared += shared
+        n_diffs += differences
+        n_diffs += differences & (b1 != 0) & (b2 != 0)
+    return n_diffs, n_shared
+
+
+_SENTINEL = object()
+
+
+def _tree_distances(
+    tree: nx.Graph, rows: Sequence[Any], cols: Sequence[Any], *, weight: str, batch_size: int = 1024
+) -> ArrayLike:
+    # distances between the nodes of an undirected tree, using the depths of the nodes and of their
+    # lowest common ancestors, which are found as minima over the Euler tour using a sparse table
+    index = {node: i for i, node in enumerate(tree)}
+    depth, level = np.zeros((len(index),)), np.zeros((len(index),), dtype=np.int64)
+    first = np.zeros((len(index),), dtype=np.int64)
+
+    root = next(iter(tree))
+    euler, stack = [index[root]], [(root, None, iter(tree[root]))]
+    while stack:
+        node, parent, children = stack[-1]
+        child = next(children, _SENTINEL)
+        if child is _SENTINEL:
+            stack.pop()
+            if stack:
+                euler.append(index[stack[-1][0]])
+            continue
+        if child == parent:
+            continue
+        i, j = index[node], index[child]
+        depth[j] = depth[i] + tree[node][child].get(weight, 1)
+        level[j] = level[i] + 1
+        first[j] = len(euler)
+        euler.append(j)
+        stack.append((child, node, iter(tree[child])))
+
+    # `table[k, i]` is the node with the smallest level in `euler[i : i + 2 ** k]`
+    tables = [np.asarray(euler)]
+    while 2 ** len(tables) <= len(euler):
+        prev, half = tables[-1], 2 ** (len(tables) - 1)
+        lhs, rhs = prev[:-half], prev[half:]
+        tables.append(np.where(level[lhs] <= level[rhs], lhs, rhs))
+    table = np.stack([np.pad(t, (0, len(euler) - len(t))) for t in tables])
+    log2 = np.frexp(np.arange(1, len(euler) + 1))[1] - 1  # exact `floor(log2(n))`
+
+    src, tgt = np.array([index[r] for r in rows], dtype=np.int64), np.array([index[c] for c in cols], dtype=np.int64)
+    distances = np.empty((len(src), len(tgt)), dtype=float)
+    for start in range(0, len(src), batch_size):
+        u, v = src[start : start + batch_size, None], tgt[None, :]
+        lo, hi = np.minimum(first[u], first[v]), np.maximum(first[u], first[v])
+        k = log2[hi - lo]
+        lhs, rhs = table[k, lo], table[k, hi - 2**k + 1]
+        lca = np.where(level[lhs] <= level[rhs], lhs, rhs)
+        # each difference is non-negative, even with rounding
+        distances[start : start + batch_size] = (depth[u] - depth[lca]) + (depth[v] - depth[lca])
+
+    return distances
@@ -1,5 +1,7 @@
 import types
-from typing import Any, Literal, Mapping, Optional, Tuple, Type, Union
+from typing import Any, Literal, Mapping, Optional, Sequence, Tuple, Type, Union
+
+from ott.geometry import epsilon_scheduler
 
 from anndata import AnnData
 
@@ -163,6 +165,7 @@ class TemporalProblem(  # type: ignore[misc]
         min_iterations: Optional[int] = None,
         max_iterations: Optional[int] = None,
         device: Optional[Literal["cpu", "gpu", "tpu"]] = None,
+        epsilon_schedule: Optional[Union[Sequence[float], epsilon_scheduler.Epsilon]] = None,
         **kwargs: Any,
     ) -> "TemporalProblem":
         r"""Solve the temporal problem.
@@ -217,6 +220,13 @@ class TemporalProblem(  # type: ignore[misc]
         device
             Transfer the solution to a different device, see :meth:`~moscot.base.output.BaseSolverOutput.to`.
             If :obj:`None`, keep the output on the original device.
+        epsilon_schedule
+            Anneal the :term:`entropic regularization` by solving with a larger ``epsilon`` first and warm-starting
+            each next stage from the previous stage's potentials. Either the decreasing factors by which ``epsilon``
+            is multiplied in the stages preceding the final one, e.g., ``(100, 10)``, or an
+            :class:`~ott.geometry.epsilon_scheduler.Epsilon` whose ``init`` and ``decay`` define a geometric decay
+            towards ``epsilon``. The statistics of each stage are stored in the solution's ``stages``.
+            Only available for the full-rank solver.
         kwargs
             Keyword arguments for :meth:`~moscot.base.problems.CompoundProblem.solve`.
 
@@ -244,6 +254,7 @@ class TemporalProblem(  # type: ignore[misc]
             min_iterations=min_iterations,
             max_iterations=max_iterations,
             device=device,
+            epsilon_schedule=epsilon_schedule,
             **kwargs,
         )
 
@@ -18,6 +18,7 @@ from typing import (
 
 import numpy as np
 import pandas as pd
+import scipy.sparse as sp
 from pandas.api.types import infer_dtype, is_categorical_dtype, is_numeric_dtype
 
 from anndata import AnnData
@@ -641,7 +642,7 @@ class TemporalMixin(AnalysisMixin[K, B]):
                     f"found `tag={self.problems[src, tgt].xy.tag}`."  # type: ignore[union-attr]
                 )
             if src == source:
-                source_data = self.problems[src, tgt].xy.data_src  # type: ignore[union-attr]
+                source_data = _densify(self.problems[src, tgt].xy.data_src)  # type: ignore[union-attr]
                 if only_start:
                     return source_data, self.problems[src, tgt].adata_src
                 # TODO(michalk8): posterior marginals
@@ -652,14 +653,14 @@ class TemporalMixin(AnalysisMixin[K, B]):
             raise ValueError(f"No data found for `{source}` time point.")
         for src, tgt in self.problems:
             if src == intermediate:
-                intermediate_data = self.problems[src, tgt].xy.data_src  # type: ignore[union-attr]
+                intermediate_data = _densify(self.problems[src, tgt].xy.data_src)  # type: ignore[union-attr]
                 intermediate_adata = self.problems[src, tgt].adata_src
                 break
         else:
             raise ValueError(f"No data found for `{intermediate}` time point.")
         for src, tgt in self.problems:
             if tgt == target:
-                target_data = self.problems[src, tgt].xy.data_tgt  # type: ignore[union-attr]
+                target_data = _densify(self.problems[src, tgt].xy.data_tgt)  # type: ignore[union-attr]
                 break
         else:
             raise ValueError(f"No data found for `{target}` time point.")
@@ -1039,3 +1040,8 @@ class TemporalMixin(AnalysisMixin[K, B]):
                 f"found `{infer_dtype(col)}`."
             )
         self._temporal_key = key
+
+
+def _densify(arr: ArrayLike) -> ArrayLike:
+    # point clouds can be sparse, e.g., when using `adata.X`
+    return arr.toarray() if sp.issparse(arr) else arr
@@ -81,6 +81,8 @@ class SubsetPolicy(Generic[K], abc.ABC):
         self._graph: Set[Tuple[K, K]] = set()
         self._cat = tuple(self._data.cat.categories)
         self._subset_key: Optional[str] = key
+        self._order, self._offsets = _group_indices(self._data, n_categories=len(self._cat))
+        self._cat_index = {c: i for i, c in enumerate(self._cat)}
 
         if verify_integrity and len(self._cat) < 2:
             raise ValueError(
@@ -162,6 +164,33 @@ class SubsetPolicy(Generic[K], abc.ABC):
     ) -> Sequence[Tuple[K, K]]:
         return [step for step in plan if step in filter]
 
+    def create_indices(self, value: Union[K, Sequence[K]], *, allow_empty: bool = False) -> ArrayLike:
+        """Create indices used to subset the data.
+
+        Parameters
+        ----------
+        value
+            Values in the data which determine the indices.
+        allow_empty
+            Whether to allow empty indices.
+
+        Returns
+        -------
+        Sorted integer indices of the observations with the ``value``.
+        """
+        if isinstance(value, str) or not isinstance(value, Iterable):
+            value = [value]
+        codes = sorted({self._cat_index[v] for v in value if v in self._cat_index})
+        groups = [self._order[self._offsets[code] : self._offsets[code + 1]] for code in codes]
+        if not groups:
+            ixs = np.empty((0,), dtype=self._order.dtype)
+        else:
+            # each group is already sorted
+            ixs = groups[0] if len(groups) == 1 else np.sort(np.concatenate(groups))
+        if not allow_empty and not len(ixs):
+            raise ValueError("Unable to construct an empty mask, use `allow_empty=True` to override.")
+        return ixs
+
     def create_mask(self, value: Union[K, Sequence[K]], *, allow_empty: bool = False) -> ArrayLike:
         """Create a mask used to subset the data.
 
@@ -176,35 +205,41 @@ class SubsetPolicy(Generic[K], abc.ABC):
         -------
         Boolean mask of the same shape as the data.
         """
-        if isinstance(value, str) or not isinstance(value, Iterable):
-            mask = self._data == value
-        else:
-            mask = self._data.isin(value)
-        if not allow_empty and not np.sum(mask):
-            raise ValueError("Unable to construct an empty mask, use `allow_empty=True` to override.")
-        return np.asarray(mask)
+        return self._to_mask(self.create_indices(value, allow_empty=allow_empty))
 
-    def create_masks(self, discard_empty: bool = True) -> Dict[Tuple[K, K], Tuple[ArrayLike, ArrayLike]]:
+    def create_masks(
+        self, discard_empty: bool = True, *, return_indices: bool = False
+    ) -> Dict[Tuple[K, K], Tuple[ArrayLike, ArrayLike]]:
         """Create masks based on the policy graph.
 
         Parameters
         ----------
         discard_empty
             Whether to remove empty masks.
+        return_indices
+            Whether to return the sorted indices of the observations, see :meth:`create_indices`,
+            instead of boolean masks.
 
         Returns
         -------
         Masks for each edge in the policy graph.
         """
+        # each node is usually shared by multiple edges
+        nodes: Dict[K, Optional[ArrayLike]] = {}
+        for node in itertools.chain.from_iterable(self._graph):
+            if node in nodes:
+                continue
+            ixs = self.create_indices(node, allow_empty=True)
+            if discard_empty and not len(ixs):
+                nodes[node] = None
+            else:
+                nodes[node] = ixs if return_indices else self._to_mask(ixs)
+
         res = {}
         for a, b in self._graph:
-            try:
-                mask_a = self.create_mask(a, allow_empty=not discard_empty)
-                mask_b = self.create_mask(b, allow_empty=not discard_empty)
+            mask_a, mask_b = nodes[a], nodes[b]
+            if mask_a is not None and mask_b is not None:
                 res[a, b] = mask_a, mask_b
-            except ValueError as e:
-                if "Unable to construct an empty mask" not in str(e):
-                    raise
 
         if not res:
             # can only happen when `discard_empty=True`
@@ -212,6 +247,11 @@ class SubsetPolicy(Generic[K], abc.ABC):
 
         return res
 
+    def _to_mask(self, ixs: ArrayLike) -> ArrayLike:
+        mask = np.zeros((len(self._data),), dtype=bool)
+        mask[ixs] = True
+        return mask
+
     def add_node(self, node: Tuple[K, K], only_existing: bool = False) -> "SubsetPolicy[K]":
         """Add a node to the policy graph.
 
@@ -391,9 +431,11 @@ class ExternalStarPolicy(FormatterMixin, StarPolicy[K]):
             return self
         return super().add_node(node, only_existing=only_existing)  # type: ignore[return-value]
 
-    def create_masks(self, discard_empty: bool = True) -> Dict[Tuple[K, K], Tuple[ArrayLike, ArrayLike]]:
+    def create_masks(
+        self, discard_empty: bool = True, *, return_indices: bool = False
+    ) -> Dict[Tuple[K, K], Tuple[ArrayLike, ArrayLike]]:
         del discard_empty
-        return super().create_masks(discard_empty=False)
+        return super().create_masks(discard_empty=False, return_indices=return_indices)
 
 
 class SequentialPolicy(OrderedPolicy[K]):
@@ -538,3 +580,14 @@ def create_policy(
         return ExplicitPolicy(adata, **kwargs)
 
     raise NotImplementedError(f"Policy `{kind}` is not yet implemented.")
+
+
+def _group_indices(data: pd.Series, *, n_categories: int) -> Tuple[ArrayLike, ArrayLike]:
+    # factorize the categorical data once, the (sorted) indices of the `i`-th category
+    # are `order[offsets[i] : offsets[i + 1]]`, missing values are at the beginning of `order`
+    codes = np.asarray(data.cat.codes)
+    order = np.argsort(codes, kind="stable")
+    counts = np.bincount(codes[codes >= 0], minlength=n_categories)
+    offsets = np.concatenate([[0], np.cumsum(counts)]) + np.sum(codes < 0)
+    order.setflags(write=False)  # the groups are returned as views
+    return order, offsets
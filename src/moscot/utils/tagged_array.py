@@ -9,7 +9,7 @@ from anndata import AnnData
 
 from moscot._logging import logger
 from moscot._types import ArrayLike, CostFn_t
-from moscot.costs import get_cost
+from moscot.costs import cost_cache, get_cost
 
 __all__ = ["Tag", "TaggedArray"]
 
@@ -104,7 +104,8 @@ class TaggedArray:
         """Create tagged array from :class:`~anndata.AnnData`.
 
         .. warning::
-            Sparse arrays will be densified except when ``tag = 'graph'``.
+            Sparse arrays will be densified except when ``tag = 'graph'`` or ``tag = 'point_cloud'``.
+            Sparse point clouds are only densified by the ``backend`` if the ``cost`` requires it.
 
         Parameters
         ----------
@@ -125,7 +126,8 @@ class TaggedArray:
             - if ``tag = 'graph'`` the ``cost`` has to be ``'geodesic'``.
             - if ``tag = 'cost'`` or ``tag = 'kernel'``, and ``cost = 'custom'``,
               the extracted array is already assumed to be a cost/kernel matrix.
-              Otherwise, :class:`~moscot.base.cost.BaseCost` is used to compute the cost matrix.
+              Otherwise, :class:`~moscot.base.cost.BaseCost` is used to compute the cost matrix,
+              which is stored in the :data:`~moscot.costs.cost_cache`.
         backend
             Which backend to use, see :func:`~moscot.backends.utils.get_available_backends`.
         kwargs
@@ -150,11 +152,16 @@ class TaggedArray:
                 return cls(data_src=data, tag=Tag.COST_MATRIX, cost=None)
 
             cost_fn = get_cost(cost, backend="moscot", adata=adata, attr=attr, key=key, dist_key=dist_key)
-            cost_matrix = cost_fn(**kwargs)
+            cache_key = cost_cache.key(adata, cost=cost, attr=attr, key=key, dist_key=dist_key, **kwargs)
+            cost_matrix = None if cache_key is None else cost_cache.get(cache_key)
+            if cost_matrix is None:
+                cost_matrix = cost_fn(**kwargs)
+                if cache_key is not None:
+                    cost_cache.put(cache_key, cost_matrix)
             return cls(data_src=cost_matrix, tag=Tag.COST_MATRIX, cost=None)
 
-        # tag is either a point cloud or a kernel
-        data = cls._extract_data(adata, attr=attr, key=key, densify=True)
+        # tag is either a point cloud or a kernel, sparse point clouds are handled by the backend
+        data = cls._extract_data(adata, attr=attr, key=key, densify=tag != Tag.POINT_CLOUD)
         cost_fn = get_cost(cost, backend=backend, **kwargs)
         return cls(data_src=data, tag=tag, cost=cost_fn)
 
@@ -5,7 +5,9 @@ import pytest
 import jax
 import jax.numpy as jnp
 import numpy as np
+import scipy.sparse as sp
 from ott.geometry import costs
+from ott.geometry.epsilon_scheduler import Epsilon
 from ott.geometry.geometry import Geometry
 from ott.geometry.low_rank import LRCGeometry
 from ott.geometry.pointcloud import PointCloud
@@ -19,9 +21,9 @@ from ott.solvers.quadratic.gromov_wasserstein import GromovWasserstein
 from ott.solvers.quadratic.gromov_wasserstein_lr import LRGromovWasserstein
 
 from moscot._types import ArrayLike, Device_t
-from moscot.backends.ott import GWSolver, SinkhornSolver
-from moscot.backends.ott._utils import alpha_to_fused_penalty
-from moscot.base.output import BaseSolverOutput
+from moscot.backends.ott import GWSolver, SinkhornSolver, compilation_cache
+from moscot.backends.ott._utils import alpha_to_fused_penalty, bucket_size
+from moscot.base.output import BaseSolverOutput, TopKSolverOutput
 from moscot.base.solver import O, OTSolver
 from moscot.utils.tagged_array import Tag, TaggedArray
 from tests._utils import ATOL, RTOL, Geom_t
@@ -92,6 +94,168 @@ class TestSinkhorn:
         np.testing.assert_allclose(solver._problem.geom.cost_matrix, problem.geom.cost_matrix, rtol=RTOL, atol=ATOL)
         np.testing.assert_allclose(gt.matrix, pred.transport_matrix, rtol=RTOL, atol=ATOL)
 
+    @pytest.mark.fast()
+    def test_compilation_cache(self, x: Geom_t, y: Geom_t):
+        compilation_cache.clear()
+        a, b = jnp.ones(len(x)) / len(x), jnp.ones(len(y)) / len(y)
+
+        gt = SinkhornSolver(jit=False)(a=a, b=b, xy=(x, y), epsilon=1e-1)
+        assert compilation_cache.info == (0, 0, 0)
+
+        _ = SinkhornSolver()(a=a, b=b, xy=(x, y), epsilon=1e-1)
+        pred = SinkhornSolver()(a=a, b=b, xy=(x, y), epsilon=1e-2)
+        assert compilation_cache.info == (1, 1, 1)
+        expected = SinkhornSolver(jit=False)(a=a, b=b, xy=(x, y), epsilon=1e-2)
+        np.testing.assert_allclose(pred.transport_matrix, expected.transport_matrix, rtol=RTOL, atol=ATOL)
+        assert not np.allclose(gt.transport_matrix, pred.transport_matrix)
+
+        _ = SinkhornSolver(max_iterations=10)(a=a, b=b, xy=(x, y), epsilon=1e-1)
+        _ = SinkhornSolver()(a=a[:-1] * len(x) / (len(x) - 1), b=b, xy=(x[:-1], y), epsilon=1e-1)
+        assert compilation_cache.info == (1, 3, 3)
+
+    @pytest.mark.parametrize("pad_to_bucket", ["pow2", "geometric"])
+    def test_pad_to_bucket(self, x: Geom_t, y: Geom_t, pad_to_bucket: str):
+        x, y = x[:-3], y[:-1]
+        a, b = jnp.ones(len(x)) / len(x), jnp.ones(len(y)) / len(y)
+        gt = SinkhornSolver()(a=a, b=b, xy=(x, y), epsilon=1e-1, scale_cost="mean")
+
+        solver = SinkhornSolver()
+        pred = solver(a=a, b=b, xy=(x, y), epsilon=1e-1, scale_cost="mean", pad_to_bucket=pad_to_bucket)
+
+        n, m = solver.xy.shape
+        assert n == bucket_size(len(x), pad_to_bucket) > len(x)
+        assert m == bucket_size(len(y), pad_to_bucket) > len(y)
+        assert pred.shape == gt.shape == (len(x), len(y))
+        np.testing.assert_allclose(pred.transport_matrix, gt.transport_matrix, rtol=RTOL, atol=ATOL)
+        np.testing.assert_allclose(pred.push(a), gt.push(a), rtol=RTOL, atol=ATOL)
+        np.testing.assert_allclose(pred.pull(b), gt.pull(b), rtol=RTOL, atol=ATOL)
+        assert [len(p) for p in pred.potentials] == [len(x), len(y)]
+
+    @pytest.mark.parametrize("batch_size", [None, 7])
+    def test_sparse_point_cloud(self, x: Geom_t, y: Geom_t, batch_size: Optional[int]):
+        a, b = jnp.ones(len(x)) / len(x), jnp.ones(len(y)) / len(y)
+        gt = SinkhornSolver()(a=a, b=b, xy=(x, y), epsilon=1e-1, scale_cost="mean")
+
+        solver = SinkhornSolver()
+        pred = solver(
+            a=a, b=b, xy=(sp.csr_matrix(x), sp.csr_matrix(y)), epsilon=1e-1, scale_cost="mean", batch_size=batch_size
+        )
+
+        assert isinstance(solver.xy, Geometry)
+        assert not isinstance(solver.xy, PointCloud)
+        np.testing.assert_allclose(pred.transport_matrix, gt.transport_matrix, rtol=RTOL, atol=ATOL)
+
+    @pytest.mark.parametrize("epsilon_schedule", [(100.0, 10.0), Epsilon(init=100.0, decay=0.1)])
+    def test_epsilon_schedule(self, x: Geom_t, y: Geom_t, epsilon_schedule: Union[Tuple[float, ...], Epsilon]):
+        a, b = jnp.ones(len(x)) / len(x), jnp.ones(len(y)) / len(y)
+        gt = SinkhornSolver(threshold=1e-4)(a=a, b=b, xy=(x, y), epsilon=1e-2, scale_cost="mean")
+        assert gt.stages is None
+
+        pred = SinkhornSolver(threshold=1e-4)(
+            a=a, b=b, xy=(x, y), epsilon=1e-2, scale_cost="mean", epsilon_schedule=epsilon_schedule
+        )
+
+        assert pred.converged
+        assert len(pred.stages) == 3
+        np.testing.assert_allclose([stage.epsilon for stage in pred.stages], [1.0, 1e-1, 1e-2], rtol=RTOL)
+        assert all(stage.n_iters > 0 and stage.time > 0 for stage in pred.stages)
+        np.testing.assert_allclose(pred.transport_matrix, gt.transport_matrix, rtol=RTOL, atol=ATOL)
+
+    def test_epsilon_schedule_invalid(self, x: Geom_t, y: Geom_t):
+        a, b = jnp.ones(len(x)) / len(x), jnp.ones(len(y)) / len(y)
+        with pytest.raises(ValueError, match="larger than `1`"):
+            SinkhornSolver()(a=a, b=b, xy=(x, y), epsilon=1e-2, epsilon_schedule=(10.0, 0.5))
+        with pytest.raises(NotImplementedError, match="full-rank"):
+            SinkhornSolver(rank=2)(a=a, b=b, xy=(x, y), epsilon=1e-2, epsilon_schedule=(10.0,))
+
+
+    @pytest.mark.parametrize("pad_to_bucket", [False, "pow2"])
+    @pytest.mark.parametrize("batch_size", [3, 1024])
+    @pytest.mark.parametrize("swap", [False, True])
+    def test_sparsify_from_potentials(
+        self, x: Geom_t, y: Geom_t, pad_to_bucket: Union[bool, str], batch_size: int, swap: bool
+    ):
+        x, y = (y[:-1], x[:-3]) if swap else (x[:-3], y[:-1])
+        a, b = jnp.ones(len(x)) / len(x), jnp.ones(len(y)) / len(y)
+        out = SinkhornSolver()(a=a, b=b, xy=(x, y), epsilon=1e-1, scale_cost="mean", pad_to_bucket=pad_to_bucket)
+        tmap = np.asarray(out.transport_matrix)
+        vals = np.sort(tmap, axis=None)
+        thr = float(vals[len(vals) // 2] + vals[len(vals) // 2 + 1]) / 2.0  # avoid ties with the threshold
+
+        res = out.sparsify("threshold", thr, batch_size=batch_size).transport_matrix
+
+        assert isinstance(res, sp.csr_matrix)
+        assert res.shape == tmap.shape == (len(x), len(y))
+        np.testing.assert_allclose(res.toarray(), np.where(tmap >= thr, tmap, 0.0), rtol=RTOL, atol=ATOL)
+
+    def test_top_k(self, x: Geom_t, y: Geom_t):
+        a, b = jnp.ones(len(x)) / len(x), jnp.ones(len(y)) / len(y)
+        out = SinkhornSolver()(a=a, b=b, xy=(x, y), epsilon=1e-1, scale_cost="mean")
+        tmap = np.asarray(out.transport_matrix)
+
+        res = out.top_k(3, batch_size=7)
+
+        assert isinstance(res, TopKSolverOutput)
+        np.testing.assert_array_equal(np.sort(res.indices, axis=1), np.sort(np.argsort(tmap, axis=1)[:, -3:], axis=1))
+        np.testing.assert_allclose(res.weights.sum(1), np.sort(tmap, axis=1)[:, -3:].sum(1), rtol=RTOL, atol=ATOL)
+
+    @pytest.mark.parametrize("rank", [-1, 3])
+    @pytest.mark.parametrize("forward", [True, False])
+    def test_argmax(self, x: Geom_t, y: Geom_t, rank: int, forward: bool):
+        a, b = jnp.ones(len(x)) / len(x), jnp.ones(len(y)) / len(y)
+        out = SinkhornSolver(rank=rank)(a=a, b=b, xy=(x, y), epsilon=1e-1)
+        tmap = np.asarray(out.transport_matrix)
+
+        res = out.argmax(forward=forward, batch_size=7)
+
+        assert res.shape == (tmap.shape[0] if forward else tmap.shape[1],)
+        np.testing.assert_array_equal(res, tmap.argmax(axis=1 if forward else 0))
+
+    @pytest.mark.parametrize("forward", [True, False])
+    def test_entropy(self, x: Geom_t, y: Geom_t, forward: bool):
+        from scipy import stats
+
+        a, b = jnp.ones(len(x)) / len(x), jnp.ones(len(y)) / len(y)
+        out = SinkhornSolver()(a=a, b=b, xy=(x, y), epsilon=1e-1)
+        tmap = np.asarray(out.transport_matrix, dtype=float)
+
+        entropy, perplexity, support = out.entropy(forward=forward, batch_size=7, return_statistics=True)
+
+        expected = stats.entropy(tmap, axis=1 if forward else 0)
+        np.testing.assert_allclose(entropy, expected, rtol=1e-5, atol=1e-5)
+        np.testing.assert_allclose(perplexity, np.exp(expected), rtol=1e-5, atol=1e-5)
+        assert np.all((support >= 1) & (support <= (len(y) if forward else len(x))))
+
+
+    @pytest.mark.parametrize("scale_by_marginals", [False, True])
+    def test_low_rank_chain(self, x: Geom_t, y: Geom_t, scale_by_marginals: bool):
+        a, b = jnp.ones(len(x)) / len(x), jnp.ones(len(y)) / len(y)
+        fst = SinkhornSolver(rank=3)(a=a, b=b, xy=(x, y))
+        snd = SinkhornSolver(rank=2)(a=b, b=a, xy=(y, x))
+        tmaps = [np.asarray(out.transport_matrix) for out in (fst, snd)]
+        if scale_by_marginals:
+            gt = (tmaps[0] / (np.asarray(fst.b) + 1e-12)[None, :]) @ (tmaps[1] / (np.asarray(snd.b) + 1e-12)[None, :])
+        else:
+            gt = tmaps[0] @ tmaps[1]
+
+        op = fst.chain([snd], scale_by_marginals=scale_by_marginals)
+        z = np.random.RandomState(0).rand(len(x), 2)
+
+        assert op.shape == (len(x), len(x))
+        np.testing.assert_allclose(op @ z, gt @ z, rtol=RTOL, atol=ATOL)
+        if not scale_by_marginals:
+            np.testing.assert_allclose(op.T @ z, gt.T @ z, rtol=RTOL, atol=ATOL)
+
+    @pytest.mark.parametrize("batch_size", [4, 1024])
+    def test_low_rank_sparsify(self, x: Geom_t, y: Geom_t, batch_size: int):
+        a, b = jnp.ones(len(x)) / len(x), jnp.ones(len(y)) / len(y)
+        out = SinkhornSolver(rank=3)(a=a, b=b, xy=(x, y))
+        tmap = np.asarray(out.transport_matrix)
+
+        res = out.sparsify("threshold", 0.0, batch_size=batch_size).transport_matrix
+
+        np.testing.assert_allclose(res.toarray(), tmap, rtol=RTOL, atol=ATOL)
+
 
 class TestGW:
     @pytest.mark.parametrize("jit", [False, True])
@@ -3,9 +3,17 @@ import pytest
 import jax.experimental.sparse as jesp
 import numpy as np
 import scipy.sparse as sp
+from ott.geometry import costs
+from ott.geometry.geodesic import Geodesic
 from ott.geometry.geometry import Geometry
+from ott.geometry.pointcloud import PointCloud
 
-from moscot.backends.ott._utils import _instantiate_geodesic_cost
+from moscot.backends.ott._utils import (
+    _instantiate_geodesic_cost,
+    bucket_size,
+    sparse_cost_matrix,
+    supports_sparse_point_cloud,
+)
 
 
 class TestBackendUtils:
@@ -21,3 +29,42 @@ class TestBackendUtils:
         with pytest.raises(ValueError, match="Expected `x` to have"):
             _instantiate_geodesic_cost(g, problem_shape, 1.0, True)
         geom = _instantiate_geodesic_cost(g, (5, 5), 1.0, True)
+
+    @staticmethod
+    @pytest.mark.parametrize(("problem_shape", "is_linear_term"), [((12, 18), True), ((30, 30), False)])
+    @pytest.mark.parametrize("batch_size", [None, 7])
+    def test_geodesic_cost_tiled(problem_shape: tuple, is_linear_term: bool, batch_size: int):
+        g = sp.random(30, 30, density=0.2, random_state=0, dtype=np.float64)
+        expected = Geodesic.from_graph(g.toarray(), t=0.5, directed=True).cost_matrix
+        if is_linear_term:
+            expected = expected[: problem_shape[0], problem_shape[0] :]
+
+        geom = _instantiate_geodesic_cost(
+            jesp.BCOO.from_scipy_sparse(g), problem_shape, 0.5, is_linear_term, batch_size=batch_size
+        )
+
+        assert geom.shape == expected.shape
+        np.testing.assert_allclose(geom.cost_matrix, expected, rtol=1e-5, atol=1e-5)
+
+    @staticmethod
+    @pytest.mark.parametrize(
+        ("mode", "expected"), [("pow2", [1, 2, 4, 4, 32, 32, 64]), ("geometric", [16, 16, 16, 16, 20, 32, 40])]
+    )
+    def test_bucket_size(mode: str, expected: list):
+        assert [bucket_size(n, mode) for n in [1, 2, 3, 4, 17, 29, 33]] == expected
+        with pytest.raises(ValueError, match="Expected `pad_to_bucket`"):
+            bucket_size(10, "foo")
+
+    @staticmethod
+    @pytest.mark.parametrize("cost_fn", [costs.SqEuclidean(), costs.Euclidean(), costs.Cosine()])
+    @pytest.mark.parametrize("quadratic", [False, True])
+    def test_sparse_cost_matrix(cost_fn: costs.CostFn, quadratic: bool):
+        x = sp.random(50, 300, density=0.05, random_state=0, format="csr")
+        y = None if quadratic else sp.random(40, 300, density=0.05, random_state=1, format="csr")
+        expected = PointCloud(x.toarray(), None if y is None else y.toarray(), cost_fn=cost_fn).cost_matrix
+
+        cost_matrix = sparse_cost_matrix(x, y, cost_fn, batch_size=7)
+
+        assert supports_sparse_point_cloud(cost_fn, scale_cost=1.0)
+        assert not supports_sparse_point_cloud(cost_fn, scale_cost="max_norm")
+        np.testing.assert_allclose(cost_matrix, expected, rtol=1e-5, atol=1e-5)
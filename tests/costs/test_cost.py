@@ -77,6 +77,22 @@ class TestBarcodeDistance:
         # Check if the computed distances match the expected distances
         np.testing.assert_almost_equal(computed_distances, expected_distances, decimal=4)
 
+    @staticmethod
+    @pytest.mark.parametrize(("batch_size", "n_jobs", "dtype"), [(1, None, np.float64), (7, 2, np.float32)])
+    def test_barcode_distance_tiled(batch_size: int, n_jobs: int, dtype: type):
+        barcodes = TestBarcodeDistance.RNG.randint(-1, 4, size=(50, 8))
+        barcodes[:, 0] = 1  # ensure that all cells share a site
+        adata = ad.AnnData(TestBarcodeDistance.RNG.rand(50, 3), obsm={"barcodes": barcodes})
+        cost_fn: BarcodeDistance = get_cost(
+            "barcode_distance", backend="moscot", adata=adata, key="barcodes", attr="obsm"
+        )
+        expected = np.array([[_scaled_hamming_dist(x, y) for y in barcodes] for x in barcodes])
+
+        computed_distances = cost_fn(batch_size=batch_size, n_jobs=n_jobs, dtype=dtype)
+
+        assert computed_distances.dtype == dtype
+        np.testing.assert_array_equal(computed_distances, expected.astype(dtype))
+
 
 class TestLeafDistance:
     @staticmethod
@@ -116,3 +132,29 @@ class TestLeafDistance:
         adata0.uns["tree"] = {0: 1}
         with pytest.raises(TypeError, match="networkx.Graph"):
             get_cost("leaf_distance", backend="moscot", adata=adata0, key="tree", attr="uns", dist_key=0)
+
+    @staticmethod
+    @pytest.mark.parametrize("subset", [False, True])
+    def test_leaf_distance_tree(subset: bool):
+        import networkx as nx
+
+        rng = np.random.RandomState(0)
+        tree = nx.DiGraph()
+        for node in range(1, 100):
+            tree.add_edge(str(rng.randint(node)), str(node), weight=rng.rand())
+        leaves = [node for node in tree if tree.degree(node) == 1]
+        adata = ad.AnnData(X=np.ones((len(leaves), 2)), obs=pd.DataFrame(index=leaves))
+        adata.uns["tree"] = {0: tree}
+        rows, cols = (leaves[::3], leaves[1::2]) if subset else (leaves, leaves)
+        undirected_tree = tree.to_undirected()
+        expected = np.array(
+            [[nx.shortest_path_length(undirected_tree, r, c, weight="weight") for c in cols] for r in rows]
+        )
+        cost_fn = get_cost("leaf_distance", backend="moscot", adata=adata, key="tree", attr="uns", dist_key=0)
+
+        distances = cost_fn(rows=rows, cols=cols) if subset else cost_fn()
+        # passing arguments to the Dijkstra's algorithm uses the shortest paths
+        dijkstra_distances = cost_fn(rows=rows, cols=cols, cutoff=None)
+
+        np.testing.assert_allclose(distances, expected, rtol=1e-12, atol=1e-12)
+        np.testing.assert_allclose(dijkstra_distances, expected, rtol=1e-12, atol=1e-12)
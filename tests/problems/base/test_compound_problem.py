@@ -67,6 +67,65 @@ class TestCompoundProblem:
             assert isinstance(problem[key], OTProblem)
             assert problem[key].solution is problem.solutions[key]
 
+    @pytest.mark.parametrize("policy", ["sequential", "triu"])
+    def test_solve_batched(self, adata_time: AnnData, policy: Literal["sequential", "triu"]):
+        problem = Problem(adata_time).prepare(xy={"x_attr": "X", "y_attr": "X"}, key="time", policy=policy)
+        expected = {key: sol.transport_matrix for key, sol in problem.solve(epsilon=1e-1).solutions.items()}
+
+        problem = problem.solve(epsilon=1e-1, batched=True)
+
+        assert problem.stage == "solved"
+        assert set(problem.solutions.keys()) == set(expected.keys())
+        for key, sol in problem.solutions.items():
+            assert problem[key].solution is sol
+            assert problem[key].solver is not None
+            np.testing.assert_allclose(sol.transport_matrix, expected[key], rtol=RTOL, atol=ATOL)
+
+    @pytest.mark.parametrize("n_jobs", [2, -1])
+    def test_prepare_solve_parallel(self, adata_time: AnnData, n_jobs: int):
+        problem = Problem(adata_time).prepare(xy={"x_attr": "X", "y_attr": "X"}, key="time", policy="triu")
+        expected = {key: sol.transport_matrix for key, sol in problem.solve(epsilon=1e-1).solutions.items()}
+
+        problem = Problem(adata_time).prepare(
+            xy={"x_attr": "X", "y_attr": "X"}, key="time", policy="triu", n_jobs=n_jobs
+        )
+        assert list(problem.problems.keys()) == list(expected.keys())
+        problem = problem.solve(epsilon=1e-1, n_jobs=n_jobs)
+
+        assert problem.stage == "solved"
+        for key, sol in problem.solutions.items():
+            assert problem[key].stage == "solved"
+            np.testing.assert_allclose(sol.transport_matrix, expected[key], rtol=RTOL, atol=ATOL)
+
+    @pytest.mark.parametrize("forward", [True, False])
+    @pytest.mark.parametrize("rank", [-1, 5])
+    def test_transport_cache(self, adata_time: AnnData, forward: bool, rank: int):
+        problem = Problem(adata_time).prepare(xy={"x_attr": "X", "y_attr": "X"}, key="time", policy="sequential")
+        problem = problem.solve(epsilon=1e-1, rank=rank)
+        apply = problem.push if forward else problem.pull
+        data = np.random.RandomState(0).rand(96, 2)
+        expected_mass = apply(0, 2, data="celltype", subset="A", return_all=True)
+        expected = apply(0, 2, data=data, scale_by_marginals=True)
+
+        problem = problem.enable_transport_cache()
+        for _ in range(2):
+            mass = apply(0, 2, data="celltype", subset="A", return_all=True)
+            res = apply(0, 2, data=data, scale_by_marginals=True)
+
+            assert mass.keys() == expected_mass.keys()
+            for key in mass:
+                np.testing.assert_allclose(mass[key], expected_mass[key], rtol=RTOL, atol=ATOL)
+            np.testing.assert_allclose(res, expected, rtol=RTOL, atol=ATOL)
+        # the composite operators are only cached for low-rank solutions
+        assert problem.transport_cache.info == ((2, 2, 2) if rank > 0 else (1, 3, 1))
+        assert problem.transport_cache.nbytes > 0
+
+        problem[0, 1].solve(epsilon=1.0, rank=rank)
+        mass = apply(0, 2, data="celltype", subset="A", return_all=True)
+        assert not np.allclose(mass[2 if forward else 0], expected_mass[2 if forward else 0])
+        problem = problem.disable_transport_cache()
+        np.testing.assert_allclose(mass[2 if forward else 0], apply(0, 2, data="celltype", subset="A"))
+
     @pytest.mark.parametrize("scale", [True, False])
     @pytest.mark.fast()
     def test_default_callback(self, adata_time: AnnData, mocker: MockerFixture, scale: bool):
@@ -88,6 +147,44 @@ class TestCompoundProblem:
         assert isinstance(problem.problems, dict)
         spy.assert_called_with("xy", subproblem.adata_src, subproblem.adata_tgt, **xy_callback_kwargs)
 
+    @pytest.mark.fast()
+    def test_local_pca_callback_cache(self, adata_time: AnnData, mocker: MockerFixture):
+        spy = mocker.spy(OTProblem, "_local_pca_callback")
+
+        problem = Problem(adata_time).prepare(
+            key="time",
+            policy="sequential",
+            x_callback="local-pca",
+            y_callback="local-pca",
+            x_callback_kwargs={"n_comps": 5},
+            y_callback_kwargs={"n_comps": 5},
+        )
+
+        # `x` and `y` are embedded using the same data
+        assert spy.call_count == len(problem)
+        for subproblem in problem.problems.values():
+            assert subproblem.x is not subproblem.y
+            assert subproblem.x.data_src is subproblem.y.data_src
+
+    @pytest.mark.fast()
+    def test_local_pca_callback_global(self, adata_time: AnnData, mocker: MockerFixture):
+        spy = mocker.spy(OTProblem, "_local_pca_callback")
+        expected = OTProblem._local_pca_callback("x", adata_time, n_comps=5).data_src
+
+        problem = Problem(adata_time).prepare(
+            key="time",
+            policy="sequential",
+            xy_callback="local-pca",
+            xy_callback_kwargs={"n_comps": 5, "global_pca": True},
+        )
+
+        assert spy.call_count == 2
+        for subproblem in problem.problems.values():
+            src_ixs = adata_time.obs_names.get_indexer(subproblem.adata_src.obs_names)
+            tgt_ixs = adata_time.obs_names.get_indexer(subproblem.adata_tgt.obs_names)
+            np.testing.assert_allclose(subproblem.xy.data_src, expected[src_ixs], rtol=RTOL, atol=ATOL)
+            np.testing.assert_allclose(subproblem.xy.data_tgt, expected[tgt_ixs], rtol=RTOL, atol=ATOL)
+
     @pytest.mark.fast()
     def test_custom_callback_lin(self, adata_time: AnnData, mocker: MockerFixture):
         expected_keys = [(0, 1), (1, 2)]
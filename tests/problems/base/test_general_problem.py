@@ -1,3 +1,4 @@
+import pathlib
 from typing import Literal, Optional, Tuple
 
 import pytest
@@ -176,8 +177,100 @@ class TestOTProblem:
 
         assert prob.solution is solution2
 
+    @pytest.mark.parametrize("backed", [False, True])
+    def test_local_pca_callback_streaming(self, adata_time: AnnData, tmp_path: pathlib.Path, backed: bool):
+        adata_time = adata_time[:, :20].copy()
+        if backed:
+            adata_time.write_h5ad(tmp_path / "adata.h5ad")
+            adata_time = sc.read_h5ad(tmp_path / "adata.h5ad", backed="r")
+        adata_src = adata_time[adata_time.obs["time"] == 0]
+        adata_tgt = adata_time[adata_time.obs["time"] == 1]
+        data = np.vstack([adata_src.X.toarray(), adata_tgt.X.toarray()])
+        u, s, _ = np.linalg.svd(data - data.mean(axis=0), full_matrices=False)
+        expected = u[:, :5] * s[:5]
+
+        # the randomized SVD is exact when oversampling the full rank
+        tagged = OTProblem._local_pca_callback(
+            "xy", adata_src, adata_tgt, n_comps=5, block_size=7, n_oversamples=data.shape[1]
+        )
+
+        assert tagged.tag == Tag.POINT_CLOUD
+        assert tagged.data_src.shape == (adata_src.n_obs, 5)
+        assert tagged.data_tgt.shape == (adata_tgt.n_obs, 5)
+        res = np.vstack([tagged.data_src, tagged.data_tgt])
+        np.testing.assert_allclose(np.abs(res), np.abs(expected), rtol=RTOL, atol=ATOL)
+
+    def test_warm_start_linear(self, adata_x: AnnData, adata_y: AnnData):
+        prob = OTProblem(adata_x, adata_y).prepare(
+            xy={"x_attr": "obsm", "x_key": "X_pca", "y_attr": "obsm", "y_key": "X_pca"}, x={}, y={}
+        )
+        sol = prob.solve(epsilon=1e-2).solution
+        n_iters = (np.asarray(sol._output.errors) != -1).sum()
+
+        warm_sol = prob.solve(epsilon=1e-2, warm_start=True).solution
+        warm_n_iters = (np.asarray(warm_sol._output.errors) != -1).sum()
+
+        assert warm_sol.converged
+        assert warm_n_iters < n_iters
+        np.testing.assert_allclose(warm_sol.transport_matrix, sol.transport_matrix, rtol=RTOL, atol=ATOL)
+
+    def test_warm_start_quadratic(self, adata_x: AnnData, adata_y: AnnData):
+        prob = OTProblem(adata_x, adata_y).prepare(
+            xy={}, x={"attr": "obsm", "key": "X_pca"}, y={"attr": "obsm", "key": "X_pca"}
+        )
+        sol = prob.solve(epsilon=1e-1).solution
+        warm_sol = prob.solve(epsilon=1e-1, warm_start=True).solution
+
+        assert warm_sol.converged
+        np.testing.assert_allclose(warm_sol.transport_matrix, sol.transport_matrix, rtol=RTOL, atol=ATOL)
+
+    def test_precision(self, adata_x: AnnData, adata_y: AnnData):
+        prob = OTProblem(adata_x, adata_y).prepare(
+            xy={"x_attr": "obsm", "x_key": "X_pca", "y_attr": "obsm", "y_key": "X_pca"}, x={}, y={}
+        )
+        sol = prob.solve(epsilon=1e-1).solution
+        pred = prob.solve(epsilon=1e-1, precision="float32").solution
+
+        assert prob.solver.xy.x.dtype == jnp.float32
+        assert pred.converged
+        assert pred.transport_matrix.dtype == np.float32
+        np.testing.assert_allclose(pred.transport_matrix, sol.transport_matrix, rtol=1e-2, atol=1e-4)
+
+    def test_precision_fallback(self, adata_x: AnnData, adata_y: AnnData):
+        prob = OTProblem(adata_x, adata_y).prepare(
+            xy={"x_attr": "obsm", "x_key": "X_pca", "y_attr": "obsm", "y_key": "X_pca"}, x={}, y={}
+        )
+        # unable to converge in a single iteration, also in full precision
+        sol = prob.solve(epsilon=1e-2, precision="float32", max_iterations=1).solution
+
+        assert not sol.converged
+        assert prob.solver.xy.x.dtype == adata_x.obsm["X_pca"].dtype
+
+    @pytest.mark.fast()
+    @pytest.mark.parametrize("contiguous", [False, True])
+    def test_obs_subset(self, adata_x: AnnData, contiguous: bool):
+        rng = np.random.RandomState(42)
+        ixs = np.arange(5, 25) if contiguous else np.sort(rng.choice(adata_x.n_obs, size=20, replace=False))
+        adata_x.obs["mass"] = rng.uniform(1, 2, size=adata_x.n_obs)
+        prob = OTProblem(adata_x, src_obs_mask=ixs, tgt_obs_mask=np.isin(np.arange(adata_x.n_obs), ixs))
+        prob = prob.prepare(
+            xy={"x_attr": "obsm", "x_key": "X_pca", "y_attr": "obsm", "y_key": "X_pca"}, x={}, y={}, a="mass"
+        )
+        expected = adata_x[ixs]
+        subset = prob._src_subset
+
+        assert prob.shape == (20, 20)
+        assert subset.n_obs == len(subset) == expected.n_obs
+        assert isinstance(subset._index, slice) == contiguous
+        np.testing.assert_array_equal(subset.obs_names, expected.obs_names)
+        np.testing.assert_array_equal(subset.obs["mass"], expected.obs["mass"])
+        np.testing.assert_array_equal(subset.obsm["X_pca"], expected.obsm["X_pca"])
+        np.testing.assert_array_equal(subset.X, expected.X)
+        np.testing.assert_allclose(prob.a, expected.obs["mass"])
+        assert subset.to_adata().obs_names.equals(prob.adata_tgt.obs_names)
+
     @pytest.mark.parametrize("ts", [(1.0, 10.0)])
-    def test_set_graph_xy(self, adata_x: AnnData, adata_y: AnnData, ts: Tuple[Optional[float], float]):
+    def test_set_graph_xy(self,adata_x: AnnData, adata_y: AnnData, ts: Tuple[Optional[float], float]):
         new_obs_names = [name + "_src" for name in adata_x.obs_names]
         adata_x.obs_names = new_obs_names
 
@@ -4,6 +4,7 @@ import pytest
 
 import numpy as np
 import pandas as pd
+import scipy.sparse as sp
 from scipy.sparse.linalg import LinearOperator
 
 from anndata import AnnData
@@ -82,7 +83,8 @@ class TestBaseAnalysisMixin:
         # TODO(@MUCDK) add regression test after discussing with @giovp what this function should be
         # doing / it is more generic
 
-    def test_cell_transition_aggregation_cell_forward(self, gt_temporal_adata: AnnData):
+    @pytest.mark.parametrize("batch_size", [None, 7])
+    def test_cell_transition_aggregation_cell_forward(self, gt_temporal_adata: AnnData, batch_size: Optional[int]):
         # the method used in this test does the same but has to instantiate the transport matrix
         config = gt_temporal_adata.uns
         config["key"]
@@ -102,6 +104,7 @@ class TestBaseAnalysisMixin:
             target_groups="cell_type",
             forward=True,
             aggregation_mode="cell",
+            batch_size=batch_size,
         )
 
         adata_early = gt_temporal_adata[gt_temporal_adata.obs["day"] == 10]
@@ -165,6 +168,45 @@ class TestBaseAnalysisMixin:
             ctr_ordered.values.astype(float), df_res_ordered.values.astype(float), rtol=RTOL, atol=ATOL
         )
 
+    @pytest.mark.parametrize("forward", [True, False])
+    def test_cell_transition_aggregation_annotation(self, gt_temporal_adata: AnnData, forward: bool):
+        problem = CompoundProblemWithMixin(gt_temporal_adata)
+        problem = problem.prepare(key="day", subset=[(10, 10.5)], policy="explicit", xy_callback="local-pca")
+        problem[10, 10.5]._solution = MockSolverOutput(gt_temporal_adata.uns["tmap_10_105"])
+
+        ctr = problem._cell_transition(
+            key="day",
+            source=10,
+            target=10.5,
+            source_groups="cell_type",
+            target_groups="cell_type",
+            forward=forward,
+            aggregation_mode="annotation",
+        )
+
+        adata_early = gt_temporal_adata[gt_temporal_adata.obs["day"] == 10]
+        adata_late = gt_temporal_adata[gt_temporal_adata.obs["day"] == 10.5]
+        transition_matrix_indexed = pd.DataFrame(
+            index=adata_early.obs.index, columns=adata_late.obs.index, data=gt_temporal_adata.uns["tmap_10_105"]
+        )
+        cell_types = adata_early.obs["cell_type"].cat.categories
+        df_res = pd.DataFrame(index=cell_types, columns=cell_types, dtype=float)
+        for ct_early in cell_types:
+            for ct_late in cell_types:
+                rows = adata_early.obs_names[adata_early.obs["cell_type"] == ct_early]
+                cols = adata_late.obs_names[adata_late.obs["cell_type"] == ct_late]
+                mass = transition_matrix_indexed.loc[rows, cols].sum(axis=1 if forward else 0)
+                # each cell of the pushed (pulled) annotation has the same mass
+                df_res.loc[ct_early, ct_late] = (mass / len(mass)).sum()
+        df_res = df_res.div(df_res.sum(axis=1), axis=0) if forward else df_res.div(df_res.sum(axis=0), axis=1)
+
+        np.testing.assert_allclose(
+            ctr.loc[df_res.index, df_res.columns].values.astype(float),
+            df_res.values.astype(float),
+            rtol=RTOL,
+            atol=ATOL,
+        )
+
     @pytest.mark.parametrize("corr_method", ["pearson", "spearman"])
     @pytest.mark.parametrize("significance_method", ["fisher", "perm_test"])
     def test_compute_feature_correlation(
@@ -199,6 +241,34 @@ class TestBaseAnalysisMixin:
         assert np.all(res[f"{key_added}_qval"] >= 0)
         assert np.all(res[f"{key_added}_qval"] <= 1.0)
 
+    @pytest.mark.parametrize("corr_method", ["pearson", "spearman"])
+    @pytest.mark.parametrize("sparse", [False, True])
+    def test_compute_feature_correlation_batched(
+        self, adata_time: AnnData, corr_method: Literal["pearson", "spearman"], sparse: bool
+    ):
+        key_added = "test"
+        rng = np.random.RandomState(42)
+        adata_time = adata_time[adata_time.obs["time"].isin((0, 1))].copy()
+        adata_time.X = sp.csr_matrix(adata_time.X) if sparse else adata_time.X.toarray()
+        n0 = adata_time[adata_time.obs["time"] == 0].n_obs
+        n1 = adata_time[adata_time.obs["time"] == 1].n_obs
+        tmap = rng.uniform(1e-6, 1, size=(n0, n1))
+        tmap /= tmap.sum().sum()
+        problem = CompoundProblemWithMixin(adata_time)
+        problem = problem.prepare(key="time", xy_callback="local-pca", policy="sequential")
+        problem[0, 1]._solution = MockSolverOutput(tmap)
+        adata_time.obs[key_added] = np.hstack((np.zeros(n0), problem.pull(source=0, target=1).squeeze()))
+        features = list(adata_time.var_names[::-2])
+
+        expected = problem.compute_feature_correlation(
+            obs_key=key_added, corr_method=corr_method, features=features, batch_size=None
+        )
+        res = problem.compute_feature_correlation(
+            obs_key=key_added, corr_method=corr_method, features=features, batch_size=3
+        )
+
+        pd.testing.assert_frame_equal(res, expected)
+
     @pytest.mark.parametrize("corr_method", ["pearson", "spearman"])
     @pytest.mark.parametrize("features", [10, None])
     @pytest.mark.parametrize("method", ["fisher", "perm_test"])
@@ -336,6 +406,33 @@ class TestBaseAnalysisMixin:
             np.array(moscot_out, dtype=float), np.array(gt_out, dtype=float), rtol=RTOL, atol=ATOL
         )
 
+    @pytest.mark.parametrize("forward", [True, False])
+    def test_compute_entropy_statistics(self, adata_time: AnnData, forward: bool):
+        rng = np.random.RandomState(42)
+        adata_time = adata_time[adata_time.obs["time"].isin((0, 1))].copy()
+        n0 = adata_time[adata_time.obs["time"] == 0].n_obs
+        n1 = adata_time[adata_time.obs["time"] == 1].n_obs
+
+        tmap = rng.uniform(1e-6, 1, size=(n0, n1))
+        tmap /= tmap.sum().sum()
+        problem = CompoundProblemWithMixin(adata_time)
+        problem = problem.prepare(key="time", xy_callback="local-pca", policy="sequential")
+        problem[0, 1]._solution = MockSolverOutput(tmap)
+
+        out = problem.compute_entropy(source=0, target=1, forward=forward, batch_size=3, statistics=True, base=2)
+
+        assert out is None
+        mask = adata_time.obs["time"] == (0 if forward else 1)
+        obs = adata_time.obs.loc[mask]
+        p = (tmap if forward else tmap.T) + 1e-10
+        p /= p.sum(axis=1, keepdims=True)
+        np.testing.assert_allclose(obs["conditional_entropy"], -(p * np.log2(p)).sum(1), rtol=RTOL, atol=ATOL)
+        np.testing.assert_allclose(
+            obs["conditional_entropy_perplexity"], 2 ** obs["conditional_entropy"], rtol=RTOL, atol=ATOL
+        )
+        np.testing.assert_allclose(obs["conditional_entropy_support"], 1.0 / (p**2).sum(1), rtol=RTOL, atol=ATOL)
+        assert adata_time.obs.loc[~mask, "conditional_entropy_support"].isna().all()
+
     def test_seed_reproducible(self, adata_time: AnnData):
         key_added = "test"
         rng = np.random.RandomState(42)
@@ -1,2 +1,51 @@
+import pytest
+
+import numpy as np
+import pandas as pd
+
+from moscot.utils.subset_policy import ExternalStarPolicy, TriangularPolicy
+
+
 class TestSubsetPolicy:
-    pass
+    @pytest.fixture()
+    def data(self) -> pd.Series:
+        rng = np.random.RandomState(0)
+        return pd.Series(rng.choice([0, 1, 2, 3, np.nan], size=100)).astype("category")
+
+    @pytest.mark.parametrize("value", [0, 2.0, [1, 3], [0, 5], 5])
+    def test_create_mask(self, data: pd.Series, value):
+        expected = np.asarray(data.isin(value) if isinstance(value, list) else data == value)
+        policy = TriangularPolicy(data)
+
+        mask = policy.create_mask(value, allow_empty=True)
+        ixs = policy.create_indices(value, allow_empty=True)
+
+        np.testing.assert_array_equal(mask, expected)
+        np.testing.assert_array_equal(ixs, np.flatnonzero(expected))
+        if not expected.any():
+            with pytest.raises(ValueError, match="Unable to construct an empty mask"):
+                policy.create_indices(value)
+
+    @pytest.mark.parametrize("return_indices", [False, True])
+    def test_create_masks(self, data: pd.Series, return_indices: bool):
+        policy = TriangularPolicy(data).create_graph()
+
+        masks = policy.create_masks(return_indices=return_indices)
+
+        assert set(masks) == {(a, b) for a in range(4) for b in range(4) if a < b}
+        for (a, b), (mask_a, mask_b) in masks.items():
+            expected_a, expected_b = np.asarray(data == a), np.asarray(data == b)
+            if return_indices:
+                expected_a, expected_b = np.flatnonzero(expected_a), np.flatnonzero(expected_b)
+            np.testing.assert_array_equal(mask_a, expected_a)
+            np.testing.assert_array_equal(mask_b, expected_b)
+
+    def test_create_masks_external_star(self, data: pd.Series):
+        policy = ExternalStarPolicy(data).create_graph()
+
+        masks = policy.create_masks(return_indices=True)
+
+        assert len(masks) == 4
+        for (src, _), (src_ixs, tgt_ixs) in masks.items():
+            np.testing.assert_array_equal(src_ixs, np.flatnonzero(data == src))
+            assert not len(tgt_ixs)
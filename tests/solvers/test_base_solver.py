@@ -1,3 +1,4 @@
+import pathlib
 from typing import Tuple
 
 import pytest
@@ -7,7 +8,7 @@ import jax.random
 import numpy as np
 import scipy.sparse as sp
 
-from moscot.base.output import MatrixSolverOutput
+from moscot.base.output import MatrixSolverOutput, TopKSolverOutput
 from tests._utils import ATOL, RTOL, MockSolverOutput
 
 
@@ -85,3 +86,44 @@ class TestBaseSolverOutput:
         assert isinstance(pull1, np.ndarray)
         if threshold < 100:
             np.testing.assert_array_less(0.5, np.corrcoef(pull1.squeeze(), pull2.squeeze())[0, 1])
+
+    @pytest.mark.parametrize("batch_size", [1, 4])
+    @pytest.mark.parametrize("shape", [(7, 2), (91, 103)])
+    def test_sparsify_spill_dir(self, tmp_path: pathlib.Path, batch_size: int, shape: Tuple[int, int]) -> None:
+        rng = np.random.RandomState(42)
+        tmap = np.abs(rng.rand(shape[0], shape[1]))
+        output = MockSolverOutput(tmap)
+
+        mso = output.sparsify(mode="threshold", value=0.5, batch_size=batch_size, spill_dir=tmp_path)
+
+        res = mso.transport_matrix
+        assert isinstance(res, sp.csr_matrix)
+        assert res.shape == shape
+        np.testing.assert_allclose(res.A, np.where(tmap >= 0.5, tmap, 0.0), rtol=RTOL, atol=ATOL)
+        assert list(tmp_path.glob("*.npy"))
+
+    @pytest.mark.parametrize("k", [1, 5, 200])
+    @pytest.mark.parametrize("shape", [(7, 2), (91, 103)])
+    def test_top_k(self, k: int, shape: Tuple[int, int]) -> None:
+        rng = np.random.RandomState(42)
+        tmap = np.abs(rng.rand(shape[0], shape[1]))
+        output = MockSolverOutput(tmap)
+
+        res = output.top_k(k, batch_size=4)
+
+        k = min(k, shape[1])
+        assert isinstance(res, TopKSolverOutput)
+        assert res.shape == shape
+        assert res.k == k
+        assert res.indices.shape == res.weights.shape == (shape[0], k)
+        assert res.indices.dtype == np.int32
+        assert res.weights.dtype == np.float32
+        expected = np.where(tmap >= np.sort(tmap, axis=1)[:, [-k]], tmap, 0.0)
+        np.testing.assert_allclose(res.transport_matrix.A, expected, rtol=RTOL, atol=ATOL)
+
+        x, y = rng.rand(shape[0], 3), rng.rand(shape[1])
+        np.testing.assert_allclose(res.push(x), expected.T @ x, rtol=RTOL, atol=ATOL)
+        np.testing.assert_allclose(res.pull(y), expected @ y, rtol=RTOL, atol=ATOL)
+        op = res.chain([MockSolverOutput(tmap.T)])
+        np.testing.assert_allclose(op @ np.ones(shape[0]), expected @ tmap.T @ np.ones(shape[0]), rtol=RTOL, atol=ATOL)
+
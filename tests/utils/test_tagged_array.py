@@ -1,9 +1,16 @@
+import pathlib
 from typing import Any, Mapping
 
 import pytest
+from pytest_mock import MockerFixture
 
+import numpy as np
+import scipy.sparse as sp
+
+import anndata as ad
 import scanpy as sc
 
+from moscot.costs import BarcodeDistance, CostCache
 from moscot.utils.tagged_array import Tag, TaggedArray
 
 
@@ -29,6 +36,11 @@ class TestTaggedArray:
         assert isinstance(tagged_array, TaggedArray)
         assert tagged_array.tag == Tag.POINT_CLOUD
 
+    def test_from_adata_sparse_point_cloud(self, adata_time):
+        adata_time.X = sp.csr_matrix(adata_time.X)
+        tagged_array = TaggedArray.from_adata(adata_time, dist_key="time", attr="X", tag=Tag.POINT_CLOUD)
+        assert sp.issparse(tagged_array.data_src)
+
     def test_from_adata_geodesic_cost(self, adata_time):
         adata_time = adata_time[adata_time.obs["time"].isin((0, 1))]
         sc.pp.neighbors(adata_time, key_added="0_1")
@@ -37,3 +49,35 @@ class TestTaggedArray:
         )
         assert isinstance(tagged_array, TaggedArray)
         assert tagged_array.tag == Tag.GRAPH
+
+    def test_from_adata_cost_cache(self, mocker: MockerFixture, tmp_path: pathlib.Path):
+        rng = np.random.RandomState(0)
+        adata = ad.AnnData(rng.rand(20, 3), obsm={"barcodes": rng.randint(0, 3, size=(20, 5))})
+        spy = mocker.spy(BarcodeDistance, "_compute")
+        kwargs = {"dist_key": "time", "attr": "obsm", "key": "barcodes", "tag": Tag.COST_MATRIX}
+
+        cache = CostCache(directory=tmp_path)
+        mocker.patch("moscot.utils.tagged_array.cost_cache", cache)
+        expected = TaggedArray.from_adata(adata, cost="barcode_distance", **kwargs).data_src
+        actual = TaggedArray.from_adata(adata, cost="barcode_distance", **kwargs).data_src
+        assert spy.call_count == 1
+        assert actual is expected
+        assert len(list(tmp_path.iterdir())) == 1
+
+        # loaded from the disk
+        mocker.patch("moscot.utils.tagged_array.cost_cache", CostCache(directory=tmp_path))
+        actual = TaggedArray.from_adata(adata, cost="barcode_distance", **kwargs).data_src
+        assert spy.call_count == 1
+        assert isinstance(actual, np.memmap)
+        np.testing.assert_array_equal(actual, expected)
+
+        # different barcodes or keyword arguments
+        adata.obsm["barcodes"][0] += 1
+        _ = TaggedArray.from_adata(adata, cost="barcode_distance", **kwargs)
+        assert spy.call_count == 2
+        _ = TaggedArray.from_adata(adata, cost="barcode_distance", batch_size=5, **kwargs)
+        assert spy.call_count == 3
+
+        cache.clear(disk=True)
+        assert len(cache.memory) == 0
+        assert not list(tmp_path.iterdir())